@@ -0,0 +1,117 @@
+"""Compare the python-pptx object model with streaming slide-XML extraction on a generated deck.
+
+    python cmd/bench_pptx_extraction.py --slides 300 --image-kb 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from src.agent.material_extractor import extract_text_from_pptx
+
+_LINE = (
+    "Fotosintesis adalah proses tumbuhan hijau mengubah energi cahaya menjadi "
+    "energi kimia dengan bantuan klorofil, air, dan karbon dioksida."
+)
+
+
+def _noise_png(kilobytes: int) -> bytes:
+    # Random pixels do not compress, so each picture adds about `kilobytes` to the deck.
+    side = max(1, int((kilobytes * 1024 / 3) ** 0.5))
+    buffer = BytesIO()
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def build_deck(slides: int, bullets: int, image_kb: int) -> bytes:
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]
+    for slide_no in range(1, slides + 1):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Bab {slide_no}"
+        body = slide.placeholders[1].text_frame
+        body.text = _LINE
+        for bullet_no in range(1, bullets):
+            body.add_paragraph().text = f"{bullet_no}. {_LINE}"
+        table = slide.shapes.add_table(3, 3, Inches(1), Inches(5), Inches(8), Inches(1)).table
+        for row in range(3):
+            for col in range(3):
+                cell = table.cell(row, col)
+                cell.text = f"sel {row}.{col}"
+                cell.text_frame.paragraphs[0].runs[0].font.size = Pt(10)
+        slide.notes_slide.notes_text_frame.text = f"Catatan guru untuk bab {slide_no}."
+        if image_kb > 0:
+            slide.shapes.add_picture(BytesIO(_noise_png(image_kb)), Inches(7), Inches(1))
+    buffer = BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+
+def object_model_text(payload: bytes) -> str:
+    """The previous extractor: `shape.text` of every top-level shape."""
+    chunks: list[str] = []
+    for slide in Presentation(BytesIO(payload)).slides:
+        for shape in slide.shapes:
+            text = getattr(shape, "text", "")
+            if text and text.strip():
+                chunks.append(text)
+    return " ".join("\n".join(chunks).split())
+
+
+def _peak_mb(run) -> float:
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _best_of(repeat: int, run) -> tuple[float, str]:
+    best = float("inf")
+    text = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = run()
+        best = min(best, time.perf_counter() - started)
+    return best, text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=300)
+    parser.add_argument("--bullets", type=int, default=8)
+    parser.add_argument("--image-kb", type=int, default=100, help="Picture size per slide; 0 for text-only decks.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = build_deck(args.slides, args.bullets, args.image_kb)
+    print(f"{args.slides} slides, {len(payload) / 1024 / 1024:.1f} MB")
+
+    model_seconds, model_text = _best_of(args.repeat, lambda: object_model_text(payload))
+    stream_seconds, stream_text = _best_of(args.repeat, lambda: extract_text_from_pptx(payload))
+    model_peak = _peak_mb(lambda: object_model_text(payload))
+    stream_peak = _peak_mb(lambda: extract_text_from_pptx(payload))
+    print(
+        f"python-pptx {model_seconds:7.2f}s  peak {model_peak:6.1f} MB  "
+        f"{len(model_text):>9} chars"
+    )
+    print(
+        f"streaming   {stream_seconds:7.2f}s  peak {stream_peak:6.1f} MB  "
+        f"{len(stream_text):>9} chars  speedup x{model_seconds / stream_seconds:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
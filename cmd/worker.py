@@ -0,0 +1,9 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.worker_main import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+from redis.asyncio import Redis as _Redis
+
+from src.agent.job_scheduler import FairJobScheduler
+from src.agent.types import JobKind
+from src.config import settings
+
+AdmissionReason = Literal["tenant_backlog", "queue_full", "backlog_too_long"]
+
+_BUCKET_SECONDS = 60
+
+
+@dataclass(slots=True)
+class AdmissionRejection:
+    reason: AdmissionReason
+    message: str
+    retry_after_seconds: int
+
+
+class AdmissionController:
+    """Refuses new jobs when the backlog could not be processed in time.
+
+    The backlog of a kind is the number of jobs still waiting in the tenant
+    sub-queues. Its drain time is estimated from the completions all workers
+    recorded over the last `ADMISSION_THROUGHPUT_WINDOW_SECONDS` (per-minute
+    counters in Redis), so it follows the real worker capacity. A limit set to
+    0 is disabled.
+    """
+
+    def __init__(self, redis: _Redis, scheduler: FairJobScheduler) -> None:
+        self._redis = redis
+        self._scheduler = scheduler
+
+    async def check(
+        self,
+        job_kind: JobKind,
+        tenants: Mapping[str, int],
+    ) -> AdmissionRejection | None:
+        """Check whether `tenants[user_id]` new jobs of `job_kind` may be queued."""
+        incoming = sum(tenants.values())
+        depth = await self._scheduler.depth(job_kind)
+        per_second = await self.throughput(job_kind)
+
+        max_tenant_depth = settings.admission_max_tenant_depth
+        if max_tenant_depth:
+            for tenant, count in tenants.items():
+                tenant_depth = await self._scheduler.tenant_depth(job_kind, tenant)
+                if tenant_depth + count > max_tenant_depth:
+                    return AdmissionRejection(
+                        reason="tenant_backlog",
+                        message=(
+                            f"Too many queued {job_kind} jobs for this user "
+                            f"({tenant_depth} waiting, limit {max_tenant_depth})."
+                        ),
+                        retry_after_seconds=_retry_after(
+                            tenant_depth + count - max_tenant_depth, per_second
+                        ),
+                    )
+
+        max_depth = settings.admission_max_queue_depth
+        if max_depth and depth + incoming > max_depth:
+            return AdmissionRejection(
+                reason="queue_full",
+                message=f"The {job_kind} queue is full; try again later.",
+                retry_after_seconds=_retry_after(depth + incoming - max_depth, per_second),
+            )
+
+        max_backlog = settings.admission_max_backlog_seconds
+        if max_backlog and per_second > 0:
+            backlog_seconds = (depth + incoming) / per_second
+            if backlog_seconds > max_backlog:
+                return AdmissionRejection(
+                    reason="backlog_too_long",
+                    message=(
+                        f"The {job_kind} queue holds about {math.ceil(backlog_seconds)}s "
+                        "of work; try again later."
+                    ),
+                    retry_after_seconds=_clamp_retry_after(backlog_seconds - max_backlog),
+                )
+        return None
+
+    async def record_completion(self, job_kind: JobKind) -> None:
+        key = self._bucket_key(job_kind, int(time.time()) // _BUCKET_SECONDS)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, settings.admission_throughput_window_seconds + _BUCKET_SECONDS)
+            await pipe.execute()
+
+    async def throughput(self, job_kind: JobKind) -> float:
+        """Completed jobs per second over the recent window, across all workers."""
+        window = settings.admission_throughput_window_seconds
+        current = int(time.time()) // _BUCKET_SECONDS
+        buckets = max(1, window // _BUCKET_SECONDS)
+        # The current minute is still filling up, so it is left out.
+        keys = [self._bucket_key(job_kind, current - offset) for offset in range(1, buckets + 1)]
+        counts = await self._redis.mget(keys)
+        completed = sum(int(count) for count in counts if count)
+        return completed / (buckets * _BUCKET_SECONDS)
+
+    @staticmethod
+    def _bucket_key(job_kind: JobKind, bucket: int) -> str:
+        return f"{settings.admission_key_prefix}{job_kind}:{bucket}"
+
+
+def _retry_after(excess_jobs: int, per_second: float) -> int:
+    if per_second <= 0:
+        return settings.admission_default_retry_after_seconds
+    return _clamp_retry_after(excess_jobs / per_second)
+
+
+def _clamp_retry_after(seconds: float) -> int:
+    return max(1, min(math.ceil(seconds), settings.admission_max_retry_after_seconds))
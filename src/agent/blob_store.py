@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+from redis.asyncio import Redis as _Redis
+
+from src.config import settings
+
+_INCOMING_DIR = "incoming"
+_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(slots=True)
+class StoredBlob:
+    sha256: str
+    size: int
+
+
+class LocalBlobStore:
+    """Content-addressed upload store on the local filesystem.
+
+    Blobs live at `<dir>/<sha[:2]>/<sha>`; the file mtime doubles as the expiry
+    clock, so re-uploading identical content just extends its lifetime.
+    """
+
+    def __init__(self, base_dir: str | None = None) -> None:
+        self._base_dir = Path(base_dir or settings.blob_store_dir)
+
+    async def initialize(self) -> None:
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+
+    async def shutdown(self) -> None:
+        return None
+
+    async def put(self, payload: bytes) -> StoredBlob:
+        digest = hashlib.sha256(payload).hexdigest()
+        await asyncio.to_thread(self._write_if_missing, digest, payload)
+        return StoredBlob(sha256=digest, size=len(payload))
+
+    async def put_stream(self, chunks: AsyncIterable[bytes]) -> StoredBlob:
+        """Store an upload chunk by chunk, hashing as it goes; memory use is one chunk."""
+        incoming = self._base_dir / _INCOMING_DIR
+        await asyncio.to_thread(incoming.mkdir, parents=True, exist_ok=True)
+        tmp_path = incoming / f"{uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        handle = await asyncio.to_thread(tmp_path.open, "wb")
+        try:
+            try:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await asyncio.to_thread(handle.write, chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+            sha256 = digest.hexdigest()
+            await asyncio.to_thread(self._move_if_missing, sha256, tmp_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return StoredBlob(sha256=sha256, size=size)
+
+    async def get(self, sha256: str) -> bytes | None:
+        path = self._blob_path(sha256)
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def touch(self, sha256: str) -> bool:
+        """Restart a blob's expiry clock; False when it is already gone."""
+        try:
+            await asyncio.to_thread(os.utime, self._blob_path(sha256))
+        except FileNotFoundError:
+            return False
+        return True
+
+    @asynccontextmanager
+    async def spool(self, sha256: str) -> AsyncIterator[Path | None]:
+        """Path of the blob for parsers; it is already a file, so nothing is copied."""
+        yield self._blob_path(sha256) if await self.touch(sha256) else None
+
+    def cleanup_expired_blobs(self) -> int:
+        if not self._base_dir.exists():
+            return 0
+
+        removed = 0
+        cutoff = time.time() - settings.job_ttl_seconds
+        # Also sweeps `.tmp` files left behind by uploads interrupted mid-write.
+        for path in self._base_dir.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _write_if_missing(self, sha256: str, payload: bytes) -> None:
+        path = self._blob_path(sha256)
+        if path.exists():
+            os.utime(path)
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    def _move_if_missing(self, sha256: str, tmp_path: Path) -> None:
+        path = self._blob_path(sha256)
+        if path.exists():
+            os.utime(path)
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self._base_dir / sha256[:2] / sha256
+
+
+class RedisBlobStore:
+    """Content-addressed upload store kept in plain Redis string keys."""
+
+    def __init__(self) -> None:
+        self._redis: _Redis | None = None
+
+    async def initialize(self) -> None:
+        if self._redis is not None:
+            return
+        # Binary-safe client: the job store's client decodes responses to str.
+        self._redis = _Redis.from_url(settings.redis_url)
+        await self._redis.ping()
+
+    async def shutdown(self) -> None:
+        if self._redis is None:
+            return
+        await self._redis.close()
+        self._redis = None
+
+    async def put(self, payload: bytes) -> StoredBlob:
+        await self.initialize()
+        assert self._redis is not None
+
+        digest = hashlib.sha256(payload).hexdigest()
+        key = self._blob_key(digest)
+        ttl = settings.job_ttl_seconds
+        # Identical content already stored: only extend its TTL, skip the upload.
+        if not await self._redis.expire(key, ttl):
+            if not await self._redis.set(key, payload, ex=ttl, nx=True):
+                await self._redis.expire(key, ttl)
+        return StoredBlob(sha256=digest, size=len(payload))
+
+    async def put_stream(self, chunks: AsyncIterable[bytes]) -> StoredBlob:
+        """Append chunks to a scratch key, then rename it to its content address."""
+        await self.initialize()
+        assert self._redis is not None
+
+        ttl = settings.job_ttl_seconds
+        tmp_key = f"{settings.blob_key_prefix}{_INCOMING_DIR}:{uuid4().hex}"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.append(tmp_key, chunk)
+                    pipe.expire(tmp_key, ttl)
+                    await pipe.execute()
+
+            sha256 = digest.hexdigest()
+            key = self._blob_key(sha256)
+            if size == 0:
+                await self._redis.set(key, b"", ex=ttl)
+            elif await self._redis.expire(key, ttl):
+                await self._redis.delete(tmp_key)
+            else:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.rename(tmp_key, key)
+                    pipe.expire(key, ttl)
+                    await pipe.execute()
+        except BaseException:
+            await self._redis.delete(tmp_key)
+            raise
+        return StoredBlob(sha256=sha256, size=size)
+
+    async def get(self, sha256: str) -> bytes | None:
+        await self.initialize()
+        assert self._redis is not None
+        return await self._redis.get(self._blob_key(sha256))
+
+    async def touch(self, sha256: str) -> bool:
+        await self.initialize()
+        assert self._redis is not None
+        return bool(await self._redis.expire(self._blob_key(sha256), settings.job_ttl_seconds))
+
+    @asynccontextmanager
+    async def spool(self, sha256: str) -> AsyncIterator[Path | None]:
+        """Copy the blob into a spool file slice by slice; removed on exit.
+
+        Memory use is one `GETRANGE` slice instead of the whole upload.
+        """
+        await self.initialize()
+        assert self._redis is not None
+
+        key = self._blob_key(sha256)
+        size = await self._redis.strlen(key)
+        if not size and not await self._redis.exists(key):
+            yield None
+            return
+
+        path = await asyncio.to_thread(new_spool_path)
+        try:
+            handle = await asyncio.to_thread(path.open, "wb")
+            try:
+                for start in range(0, size, _SPOOL_CHUNK_BYTES):
+                    chunk = await self._redis.getrange(
+                        key, start, start + _SPOOL_CHUNK_BYTES - 1
+                    )
+                    if not chunk:
+                        raise ValueError(
+                            "Uploaded file is no longer available in blob storage."
+                        )
+                    await asyncio.to_thread(handle.write, chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+            yield path
+        finally:
+            path.unlink(missing_ok=True)
+
+    def cleanup_expired_blobs(self) -> int:
+        # Redis expires blob keys on its own.
+        return 0
+
+    @staticmethod
+    def _blob_key(sha256: str) -> str:
+        return f"{settings.blob_key_prefix}{sha256}"
+
+
+BlobStore = LocalBlobStore | RedisBlobStore
+
+
+def new_spool_path() -> Path:
+    """Fresh file name under `SPOOL_DIR` for an upload handed to the parsers."""
+    spool_dir = Path(settings.spool_dir)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    return spool_dir / f"{uuid4().hex}.spool"
+
+
+def cleanup_stale_spool_files() -> int:
+    """Remove spool files left behind by workers that died mid-job."""
+    spool_dir = Path(settings.spool_dir)
+    if not spool_dir.exists():
+        return 0
+
+    removed = 0
+    cutoff = time.time() - settings.job_ttl_seconds
+    for path in spool_dir.glob("*.spool"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def build_blob_store() -> BlobStore:
+    backend = settings.blob_store_backend
+    if backend == "local":
+        return LocalBlobStore()
+    if backend == "redis":
+        return RedisBlobStore()
+    raise ValueError(f"Unsupported BLOB_STORE_BACKEND: {backend}")
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import gzip
+import importlib.util
+import logging
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
 from src.config import settings
 
 try:
@@ -10,31 +17,153 @@ except ImportError as exc:
 else:
     _HTTPX_IMPORT_ERROR = None
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Destination:
+    origin: str
+    client: "httpx.AsyncClient"
+    in_flight: asyncio.Semaphore
+    encoding: str
+
 
 class WebhookCallbackClient:
+    """Callback sender with one keep-alive pool and in-flight cap per destination.
+
+    Callbacks go to a handful of backend hosts, so each origin
+    (scheme, host, port) gets its own `httpx.AsyncClient`. Its connections stay
+    warm between bursts, and a slow receiver cannot starve the others.
+    """
+
     def __init__(self) -> None:
-        self._client = None
+        self._destinations: dict[str, _Destination] = {}
+        self._initialized = False
+        self._http2 = False
 
     async def initialize(self) -> None:
-        if self._client is not None:
+        if self._initialized:
             return
 
         if httpx is None:
             raise RuntimeError("httpx package is required for webhook callback.") from _HTTPX_IMPORT_ERROR
 
-        self._client = httpx.AsyncClient(
-            timeout=settings.webhook_callback_timeout_seconds,
-        )
+        self._http2 = settings.webhook_callback_http2 and _http2_available()
+        self._initialized = True
+        await self._warm_up(settings.webhook_callback_warmup_urls)
 
     async def shutdown(self) -> None:
-        if self._client is None:
-            return
-        await self._client.aclose()
-        self._client = None
+        destinations = list(self._destinations.values())
+        self._destinations.clear()
+        self._initialized = False
+        for destination in destinations:
+            await destination.client.aclose()
 
-    async def send_json(self, *, callback_url: str, payload: dict) -> None:
+    async def send_body(self, *, callback_url: str, body: bytes) -> None:
+        """POST an already-serialized JSON body, compressed as the destination allows."""
         await self.initialize()
-        assert self._client is not None
+        destination = self._destination(callback_url)
 
-        response = await self._client.post(callback_url, json=payload)
+        async with destination.in_flight:
+            response = await self._post(destination, callback_url, body)
+            if response.status_code == 415 and destination.encoding != "identity":
+                logger.warning(
+                    "%s rejected %s-encoded callbacks; sending them uncompressed.",
+                    destination.origin,
+                    destination.encoding,
+                )
+                destination.encoding = "identity"
+                response = await self._post(destination, callback_url, body)
         response.raise_for_status()
+
+    @staticmethod
+    async def _post(
+        destination: _Destination,
+        callback_url: str,
+        body: bytes,
+    ) -> "httpx.Response":
+        headers = {"Content-Type": "application/json"}
+        content = body
+        if (
+            destination.encoding != "identity"
+            and len(body) >= settings.webhook_callback_compress_min_bytes
+        ):
+            content = compress_body(body, destination.encoding)
+            headers["Content-Encoding"] = destination.encoding
+        return await destination.client.post(callback_url, content=content, headers=headers)
+
+    def _destination(self, url: str) -> _Destination:
+        origin = _origin(url)
+        destination = self._destinations.get(origin)
+        if destination is None:
+            destination = _Destination(
+                origin=origin,
+                client=self._build_client(),
+                in_flight=asyncio.Semaphore(settings.webhook_callback_max_in_flight_per_host),
+                encoding=_destination_encoding(origin),
+            )
+            self._destinations[origin] = destination
+        return destination
+
+    def _build_client(self) -> "httpx.AsyncClient":
+        assert httpx is not None
+        max_connections = settings.webhook_callback_max_connections_per_host
+        return httpx.AsyncClient(
+            timeout=settings.webhook_callback_timeout_seconds,
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=settings.webhook_callback_keepalive_seconds,
+            ),
+        )
+
+    async def _warm_up(self, urls: tuple[str, ...]) -> None:
+        # Opens (and TLS-handshakes) one pooled connection per configured host so
+        # the first callbacks after startup do not pay for it. Any response counts.
+        async def warm(url: str) -> None:
+            try:
+                await self._destination(url).client.head(url)
+            except Exception as exc:
+                logger.warning("Callback warm-up request to %s failed: %s", url, exc)
+
+        await asyncio.gather(*(warm(url) for url in urls))
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return body
+
+
+def _destination_encoding(origin: str) -> str:
+    encoding = settings.webhook_callback_encodings.get(
+        origin, settings.webhook_callback_content_encoding
+    )
+    if encoding == "zstd" and importlib.util.find_spec("zstandard") is None:
+        logger.warning(
+            "zstd callback encoding for %s needs the 'zstandard' package; using gzip. "
+            "Install with `pip install .[zstd]`.",
+            origin,
+        )
+        return "gzip"
+    return encoding
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _http2_available() -> bool:
+    if importlib.util.find_spec("h2") is not None:
+        return True
+    logger.warning(
+        "WEBHOOK_CALLBACK_HTTP2 is enabled but the 'h2' package is not installed; "
+        "falling back to HTTP/1.1. Install with `pip install .[http2]`."
+    )
+    return False
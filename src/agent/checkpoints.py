@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Literal, TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+from redis.asyncio import Redis as _Redis
+from redis.exceptions import RedisError
+
+from src.agent.types import (
+    LkpdContent,
+    MaterialGeneratedPayload,
+    MaterialInfo,
+    SourceRef,
+)
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CheckpointStage = Literal["extraction", "rag", "generation", "lkpd_pdf"]
+
+TCheckpoint = TypeVar("TCheckpoint", bound=BaseModel)
+
+
+# Each stage stores what later stages need plus the warnings gathered so far,
+# so resuming from the latest stage never has to load an earlier one.
+class ExtractionCheckpoint(BaseModel):
+    text: str
+    file_type: str
+    warnings: list[str] = Field(default_factory=list)
+
+
+class RagCheckpoint(BaseModel):
+    material: MaterialInfo
+    context: str
+    sources: list[SourceRef] = Field(default_factory=list)
+    warnings: list[str] = Field(default_factory=list)
+
+
+class MaterialGenerationCheckpoint(BaseModel):
+    material: MaterialInfo
+    payload: MaterialGeneratedPayload
+    sources: list[SourceRef] = Field(default_factory=list)
+    warnings: list[str] = Field(default_factory=list)
+
+
+class LkpdGenerationCheckpoint(BaseModel):
+    material: MaterialInfo
+    lkpd: LkpdContent
+    sources: list[SourceRef] = Field(default_factory=list)
+    warnings: list[str] = Field(default_factory=list)
+
+
+class LkpdPdfCheckpoint(BaseModel):
+    file_id: str
+    expires_at: datetime
+
+
+class JobCheckpoints:
+    """Completed pipeline stages of one job, kept for `JOB_CHECKPOINT_TTL_SECONDS`.
+
+    A re-run of the job (crash recovery, stream redelivery, dead-letter
+    reprocess) skips every stage whose output is already stored here.
+    """
+
+    def __init__(self, redis: _Redis, job_id: str) -> None:
+        self._redis = redis
+        self._job_id = job_id
+
+    async def load(
+        self,
+        stage: CheckpointStage,
+        model_type: type[TCheckpoint],
+    ) -> TCheckpoint | None:
+        try:
+            payload = await self._redis.hget(self._key(), stage)
+        except RedisError as exc:
+            logger.warning("Failed to load %s checkpoint of job %s: %s", stage, self._job_id, exc)
+            return None
+        if payload is None:
+            return None
+        try:
+            checkpoint = model_type.model_validate_json(payload)
+        except ValidationError:
+            # Written by an older release with a different shape; redo the stage.
+            logger.warning("Ignoring unreadable %s checkpoint of job %s", stage, self._job_id)
+            return None
+        logger.info("Resuming job %s after its %s stage", self._job_id, stage)
+        return checkpoint
+
+    async def save(self, stage: CheckpointStage, checkpoint: BaseModel) -> None:
+        # A lost checkpoint only costs a recomputation, so it never fails the job.
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self._key(), stage, checkpoint.model_dump_json())
+                pipe.expire(self._key(), settings.job_checkpoint_ttl_seconds)
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Failed to save %s checkpoint of job %s: %s", stage, self._job_id, exc)
+
+    async def clear(self) -> None:
+        await self._redis.delete(self._key())
+
+    def _key(self) -> str:
+        return f"{settings.job_checkpoint_prefix}{self._job_id}"
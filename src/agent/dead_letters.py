@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from redis.asyncio import Redis as _Redis
+
+from src.agent.types import JobStatus
+from src.config import settings
+
+DEAD_LETTER_STATUSES: tuple[JobStatus, ...] = ("failed_processing", "failed_delivery")
+
+
+class DeadLetterIndex:
+    """Sorted sets of failed job ids per status, scored by failure time.
+
+    The job hashes keep everything needed to recover (upload reference, request,
+    serialized callback body); this index only makes them findable by status and
+    time range. Entries older than the job TTL are trimmed as new ones arrive.
+    """
+
+    def __init__(self, redis: _Redis) -> None:
+        self._redis = redis
+
+    async def record(self, job_id: str, status: JobStatus) -> None:
+        now = datetime.now(UTC).timestamp()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for other in DEAD_LETTER_STATUSES:
+                if other != status:
+                    pipe.zrem(self._key(other), job_id)
+            pipe.zadd(self._key(status), {job_id: now})
+            pipe.zremrangebyscore(self._key(status), "-inf", now - settings.job_ttl_seconds)
+            await pipe.execute()
+
+    async def remove(self, job_id: str, status: JobStatus) -> bool:
+        """Drop a job from one status index; False if it was not there (e.g. already replayed)."""
+        return bool(await self._redis.zrem(self._key(status), job_id))
+
+    async def list(
+        self,
+        status: JobStatus,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[tuple[str, datetime]]:
+        """Return `(job_id, failed_at)` pairs, newest first."""
+        entries = await self._redis.zrevrangebyscore(
+            self._key(status),
+            until.timestamp() if until else "+inf",
+            since.timestamp() if since else "-inf",
+            start=offset,
+            num=limit,
+            withscores=True,
+        )
+        return [
+            (job_id, datetime.fromtimestamp(score, UTC)) for job_id, score in entries
+        ]
+
+    async def count(self, status: JobStatus) -> int:
+        return await self._redis.zcard(self._key(status))
+
+    @staticmethod
+    def _key(status: JobStatus) -> str:
+        return f"{settings.job_dlq_prefix}{status}"
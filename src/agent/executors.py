@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from src.config import settings
+
+T = TypeVar("T")
+
+_process_pool: ProcessPoolExecutor | None = None
+_thread_pool: ThreadPoolExecutor | None = None
+
+
+async def run_cpu_bound(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run CPU-heavy work (parsing, PDF rendering) off the event loop.
+
+    Uses the process pool when `CPU_EXECUTOR_WORKERS > 0`; `func` and its
+    arguments must then be picklable (module-level functions, plain data).
+    """
+    executor = _get_process_pool() or _get_thread_pool()
+    return await _run_in_executor(executor, func, *args, **kwargs)
+
+
+async def run_blocking(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run blocking I/O or GIL-releasing native work in the shared thread pool."""
+    return await _run_in_executor(_get_thread_pool(), func, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    global _process_pool, _thread_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=True, cancel_futures=True)
+        _thread_pool = None
+
+
+async def _run_in_executor(
+    executor: Executor,
+    func: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+def _get_process_pool() -> ProcessPoolExecutor | None:
+    global _process_pool
+    if settings.cpu_executor_workers <= 0:
+        return None
+    if _process_pool is None:
+        # "spawn" avoids forking a process that already runs gRPC/ONNX threads.
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.cpu_executor_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=max(1, settings.io_executor_workers),
+            thread_name_prefix="agent-io",
+        )
+    return _thread_pool
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from uuid import uuid4
+
+from src.config import settings
+
+# Bump when extractor output changes so stale entries stop matching.
+EXTRACTOR_VERSION = "2"
+
+ExtractionResult = tuple[str, str, list[str]]
+
+
+def extraction_cache_key(
+    payload: bytes | Path,
+    filename: str,
+    *,
+    file_sha256: str | None = None,
+) -> str:
+    """SHA-256 of the upload plus everything else that shapes the extracted text.
+
+    Pass `file_sha256` when the upload's digest is already known (queued jobs
+    carry it) to skip hashing the payload again.
+    """
+    if file_sha256:
+        digest = file_sha256
+    elif isinstance(payload, Path):
+        with payload.open("rb") as handle:
+            digest = hashlib.file_digest(handle, "sha256").hexdigest()
+    else:
+        digest = hashlib.sha256(payload).hexdigest()
+    options = "|".join(
+        [
+            EXTRACTOR_VERSION,
+            Path(filename).suffix.lower(),
+            str(settings.extraction_char_budget),
+        ]
+    )
+    return hashlib.sha256(f"{digest}|{options}".encode()).hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded on-disk LRU cache of extracted material text.
+
+    Entries live at `<dir>/<key[:2]>/<key>.json`. Writes go through a temp
+    file and `os.replace`, so processes sharing the directory never read a
+    partial entry; a hit bumps the file mtime, and every write evicts the
+    least recently used entries once the directory exceeds
+    `EXTRACTION_CACHE_MAX_MB`. Losing an eviction race only costs a miss.
+    """
+
+    def __init__(self, base_dir: str | None = None, max_bytes: int | None = None) -> None:
+        self._base_dir = Path(base_dir or settings.extraction_cache_dir)
+        self._max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else settings.extraction_cache_max_mb * 1024 * 1024
+        )
+
+    def get(self, key: str) -> ExtractionResult | None:
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_bytes())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry["text"], entry["file_type"], list(entry["warnings"])
+
+    def put(self, key: str, result: ExtractionResult) -> int:
+        """Store one entry; returns how many entries were evicted to make room."""
+        text, file_type, warnings = result
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_text(
+            json.dumps({"text": text, "file_type": file_type, "warnings": warnings}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+        return self.evict()
+
+    def evict(self) -> int:
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        # `.tmp` files of interrupted writes age out like any other entry.
+        for path in self._base_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def _entry_path(self, key: str) -> Path:
+        return self._base_dir / key[:2] / f"{key}.json"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from redis.asyncio import Redis as _Redis
+from redis.asyncio.client import PubSub
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RECONNECT_DELAY_SECONDS = 1.0
+
+
+class JobEventHub:
+    """Job update notifications over Redis pub/sub.
+
+    `update_job` publishes to `{JOB_EVENTS_CHANNEL_PREFIX}{job_id}`. Each API
+    process keeps one pattern subscription and fans messages out to local
+    watchers, so open long-polls and SSE streams do not hold a Redis
+    connection each. Notifications only say "something changed"; watchers
+    re-read the job hash, and wait with a timeout in case one is missed.
+    """
+
+    def __init__(self, redis: _Redis) -> None:
+        self._redis = redis
+        self._watchers: dict[str, set[asyncio.Event]] = {}
+        self._listener: asyncio.Task[None] | None = None
+        self._start_lock = asyncio.Lock()
+
+    async def publish(self, job_id: str, status: str | None = None) -> None:
+        await self._redis.publish(self._channel(job_id), status or "")
+
+    @asynccontextmanager
+    async def watch(self, job_id: str) -> AsyncIterator[asyncio.Event]:
+        """Yield an event that is set whenever `job_id` is updated."""
+        await self._ensure_listener()
+        changed = asyncio.Event()
+        self._watchers.setdefault(job_id, set()).add(changed)
+        try:
+            yield changed
+        finally:
+            watchers = self._watchers.get(job_id)
+            if watchers is not None:
+                watchers.discard(changed)
+                if not watchers:
+                    del self._watchers[job_id]
+
+    async def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None:
+            return
+        async with self._start_lock:
+            if self._listener is None:
+                # Subscribe before the first watcher reads job state, so an
+                # update racing with that read is not missed.
+                pubsub = await self._subscribe()
+                self._listener = asyncio.create_task(
+                    self._listen(pubsub), name="job-event-listener"
+                )
+
+    async def _subscribe(self) -> PubSub:
+        pubsub = self._redis.pubsub()
+        await pubsub.psubscribe(f"{settings.job_events_channel_prefix}*")
+        while True:
+            message = await pubsub.get_message(timeout=1.0)
+            if message is None or message["type"] == "psubscribe":
+                return pubsub
+
+    async def _listen(self, pubsub: PubSub) -> None:
+        prefix_length = len(settings.job_events_channel_prefix)
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    job_id = message["channel"][prefix_length:]
+                    for changed in self._watchers.get(job_id, ()):
+                        changed.set()
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as exc:
+                logger.warning("Job event subscription lost, reconnecting: %s", exc)
+
+            # Anything published while disconnected is lost; wake every watcher
+            # so it re-reads its job instead of waiting for its timeout.
+            for watchers in self._watchers.values():
+                for changed in watchers:
+                    changed.set()
+            await pubsub.aclose()
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+            try:
+                pubsub = await self._subscribe()
+            except Exception as exc:
+                logger.warning("Job event resubscribe failed: %s", exc)
+                pubsub = self._redis.pubsub()
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"{settings.job_events_channel_prefix}{job_id}"
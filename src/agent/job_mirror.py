@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import asyncpg
+
+from src.agent.types import JobStatus, QueuedJob
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_INSERT_SQL = """
+INSERT INTO "AIJob" (
+    "id", "materialId", "requestedById", "type", "status",
+    "externalJobId", "createdAt", "updatedAt", "attempts", "parameters"
+) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+ON CONFLICT ("id") DO NOTHING
+"""
+
+_UPDATE_SQL = """
+UPDATE "AIJob"
+SET "status" = COALESCE($2, "status"),
+    "attempts" = COALESCE($3, "attempts"),
+    "updatedAt" = $4
+WHERE "externalJobId" = $1
+"""
+
+_EXISTING_SQL = """
+SELECT "externalJobId" FROM "AIJob" WHERE "externalJobId" = ANY($1::text[])
+"""
+
+# Updates whose row is not there yet (its insert is still buffered in the API
+# process) are retried on later flushes, then dropped after this long.
+_ORPHAN_UPDATE_MAX_AGE_SECONDS = 300.0
+
+
+@dataclass(slots=True)
+class _PendingUpdate:
+    status: JobStatus | None
+    attempts: int | None
+    updated_at: datetime
+    first_seen: float
+
+    def merge(self, newer: _PendingUpdate) -> None:
+        if newer.status is not None:
+            self.status = newer.status
+        if newer.attempts is not None:
+            self.attempts = newer.attempts
+        self.updated_at = max(self.updated_at, newer.updated_at)
+
+
+class PostgresJobMirror:
+    """Write-behind copy of the job lifecycle into the `"AIJob"` table.
+
+    Redis stays the source of truth; callers only append to in-memory buffers.
+    A background task flushes them every `DB_MIRROR_FLUSH_MS` (or as soon as
+    `DB_MIRROR_BATCH_SIZE` rows are pending) with one `executemany` per
+    statement. Successive updates of the same job collapse into one row.
+    """
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self._pool = pool
+        self._inserts: list[tuple[object, ...]] = []
+        self._updates: dict[str, _PendingUpdate] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="aijob-mirror")
+
+    async def close(self) -> None:
+        # Stop the loop cooperatively: cancelling it mid-write would abandon the
+        # batch it had already taken out of the buffers.
+        task, self._task = self._task, None
+        if task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await task
+        await self.flush()
+        if self.pending:
+            logger.error("Dropping %s unwritten AIJob mirror row(s) on shutdown.", self.pending)
+
+    @property
+    def pending(self) -> int:
+        return len(self._inserts) + len(self._updates)
+
+    def record_inserts(self, jobs: list[QueuedJob]) -> None:
+        self._inserts.extend(postgres_row(job) for job in jobs)
+        self._after_record()
+
+    def record_update(
+        self,
+        job_id: str,
+        *,
+        status: JobStatus | None,
+        attempts: int | None,
+        updated_at: datetime,
+    ) -> None:
+        self._merge_update(
+            job_id,
+            _PendingUpdate(status, attempts, updated_at, time.monotonic()),
+        )
+        self._after_record()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            inserts, self._inserts = self._inserts, []
+            updates, self._updates = self._updates, {}
+            if not inserts and not updates:
+                return
+            try:
+                missing = await self._write(inserts, updates)
+            except Exception as exc:
+                logger.error("Failed to mirror jobs into Postgres: %s", exc)
+                self._restore(inserts, updates)
+                return
+
+            now = time.monotonic()
+            for job_id in missing:
+                update = updates[job_id]
+                if now - update.first_seen < _ORPHAN_UPDATE_MAX_AGE_SECONDS:
+                    self._merge_update(job_id, update, older=True)
+                else:
+                    logger.warning("Dropping AIJob update for unknown job %s", job_id)
+
+    async def _write(
+        self,
+        inserts: list[tuple[object, ...]],
+        updates: dict[str, _PendingUpdate],
+    ) -> set[str]:
+        """Write one batch; return ids of updates that matched no row."""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                if inserts:
+                    await conn.executemany(_INSERT_SQL, inserts)
+                if not updates:
+                    return set()
+                await conn.executemany(
+                    _UPDATE_SQL,
+                    [
+                        (job_id, update.status, update.attempts, update.updated_at)
+                        for job_id, update in updates.items()
+                    ],
+                )
+                rows = await conn.fetch(_EXISTING_SQL, list(updates))
+        return set(updates) - {row["externalJobId"] for row in rows}
+
+    async def _run(self) -> None:
+        interval = settings.db_mirror_flush_ms / 1000
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _after_record(self) -> None:
+        if self.pending >= settings.db_mirror_batch_size:
+            self._wakeup.set()
+
+    def _merge_update(
+        self,
+        job_id: str,
+        update: _PendingUpdate,
+        *,
+        older: bool = False,
+    ) -> None:
+        current = self._updates.get(job_id)
+        if current is None:
+            self._updates[job_id] = update
+        elif older:
+            update.merge(current)
+            self._updates[job_id] = update
+        else:
+            current.merge(update)
+
+    def _restore(
+        self,
+        inserts: list[tuple[object, ...]],
+        updates: dict[str, _PendingUpdate],
+    ) -> None:
+        # Failed batches go back in front of anything recorded meanwhile; the
+        # buffers are capped so a long outage cannot exhaust memory.
+        self._inserts = inserts + self._inserts
+        for job_id, update in updates.items():
+            self._merge_update(job_id, update, older=True)
+
+        overflow = self.pending - settings.db_mirror_max_pending
+        if overflow > 0:
+            dropped_inserts = min(overflow, len(self._inserts))
+            del self._inserts[:dropped_inserts]
+            for job_id in list(self._updates)[: overflow - dropped_inserts]:
+                del self._updates[job_id]
+            logger.error("AIJob mirror buffer full; dropped %s oldest row(s).", overflow)
+
+
+def postgres_row(job: QueuedJob) -> tuple[object, ...]:
+    job_type = "MCQ"
+    if job.job_kind == "lkpd":
+        job_type = "LKPD"
+    else:
+        gt = job.request_payload.get("generate_types", [])
+        if gt:
+            t = gt[0].lower()
+            if t == "mcq": job_type = "MCQ"
+            elif t == "essay": job_type = "ESSAY"
+            elif t == "summary": job_type = "SUMMARY"
+
+    # Parse UUIDs and convert to strings for asyncpg/Postgres varchar
+    jid = str(_parse_uuid(job.job_id))
+    mid = str(_parse_uuid(job.material_id))
+    rid = str(_parse_uuid(job.requested_by_id))
+
+    params_json = json.dumps(job.request_payload)
+    return (
+        jid, mid, rid, job_type, job.status,
+        job.job_id, job.created_at, job.updated_at, job.processing_attempts, params_json,
+    )
+
+
+def _parse_uuid(val: str | None) -> UUID | None:
+    if val is None: return None
+    try:
+        return UUID(val)
+    except (ValueError, TypeError):
+        return uuid4()
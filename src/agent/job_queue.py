@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from redis.asyncio import Redis as _Redis
+from redis.exceptions import ResponseError
+
+from src.agent.types import JobKind
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class QueueEntry:
+    stream_key: str
+    entry_id: str
+    job_id: str
+
+
+class JobStreamQueue:
+    """At-least-once job queue on Redis Streams consumer groups.
+
+    Popped entries stay pending until `ack` is called. Entries held by a consumer
+    that stops renewing them (crash, OOM, killed deploy) are taken over by other
+    consumers with XAUTOCLAIM once they have been idle for the visibility timeout.
+    Entries delivered more than `JOB_MAX_DELIVERIES` times are passed to
+    `on_exhausted(job_id, deliveries)` and then dropped; if the hook fails they
+    stay pending and are retried on the next reclaim.
+
+    Each reclaim pass claims up to `WORKER_CONCURRENCY` stale entries; the ones
+    not returned straight away are held (and renewed) by this consumer and
+    handed out before any new entry is read.
+    """
+
+    def __init__(
+        self,
+        redis: _Redis,
+        *,
+        consumer_name: str | None = None,
+        on_exhausted: Callable[[str, int], Awaitable[None]] | None = None,
+    ) -> None:
+        self._redis = redis
+        self._on_exhausted = on_exhausted
+        self._group = settings.job_consumer_group
+        self._consumer = consumer_name or settings.job_consumer_name or _default_consumer_name()
+        self._last_reclaim_at = 0.0
+        self._reclaimed: deque[QueueEntry] = deque()
+
+    @property
+    def consumer_name(self) -> str:
+        return self._consumer
+
+    @staticmethod
+    def stream_key(job_kind: JobKind) -> str:
+        if job_kind == "material":
+            return settings.job_queue_key
+        return settings.lkpd_job_queue_key
+
+    @property
+    def stream_keys(self) -> list[str]:
+        return [settings.job_queue_key, settings.lkpd_job_queue_key]
+
+    async def initialize(self) -> None:
+        for stream_key in self.stream_keys:
+            await self._migrate_legacy_list(stream_key)
+            try:
+                await self._redis.xgroup_create(
+                    stream_key, self._group, id="0", mkstream=True
+                )
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+    async def read(self, stream_keys: Sequence[str] | None = None) -> QueueEntry | None:
+        """Return the next entry for this consumer without blocking.
+
+        New entries are read from `stream_keys` (default: every stream) one
+        stream at a time, in the given order, so the caller decides which job
+        kind is served and nothing is leased that it did not ask for.
+        """
+        await self._reclaim_stale()
+        if self._reclaimed:
+            return self._reclaimed.popleft()
+
+        for stream_key in stream_keys or self.stream_keys:
+            response = await self._redis.xreadgroup(
+                self._group,
+                self._consumer,
+                {stream_key: ">"},
+                count=1,
+            )
+            for _, messages in response or []:
+                for entry_id, fields in messages:
+                    entry = _to_entry(stream_key, entry_id, fields)
+                    if entry is None:
+                        await self._ack_entry_id(stream_key, entry_id)
+                        continue
+                    return entry
+        return None
+
+    async def ack(self, entry: QueueEntry) -> None:
+        await self._ack_entry_id(entry.stream_key, entry.entry_id)
+
+    async def requeue(self, entry: QueueEntry) -> None:
+        """Hand an entry back to the queue immediately instead of waiting for reclaim."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(entry.stream_key, {"job_id": entry.job_id})
+            pipe.xack(entry.stream_key, self._group, entry.entry_id)
+            pipe.xdel(entry.stream_key, entry.entry_id)
+            await pipe.execute()
+
+    async def renew(self, entries: list[QueueEntry]) -> None:
+        """Reset the idle time of entries this consumer is still working on.
+
+        Reclaimed entries that have not been handed out yet are renewed too.
+        """
+        by_stream: dict[str, list[str]] = {}
+        for entry in [*entries, *self._reclaimed]:
+            by_stream.setdefault(entry.stream_key, []).append(entry.entry_id)
+
+        for stream_key, entry_ids in by_stream.items():
+            await self._redis.xclaim(
+                stream_key,
+                self._group,
+                self._consumer,
+                min_idle_time=0,
+                message_ids=entry_ids,
+                justid=True,
+            )
+
+    async def release(self) -> None:
+        """Requeue reclaimed entries that were never handed out (on shutdown)."""
+        while self._reclaimed:
+            await self.requeue(self._reclaimed.popleft())
+
+    async def stats(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"group": self._group, "streams": {}}
+        for stream_key in self.stream_keys:
+            length = await self._redis.xlen(stream_key)
+            try:
+                pending = await self._redis.xpending(stream_key, self._group)
+                consumers = await self._redis.xinfo_consumers(stream_key, self._group)
+            except ResponseError:
+                pending = {"pending": 0, "min": None, "max": None, "consumers": []}
+                consumers = []
+
+            out["streams"][stream_key] = {
+                "length": length,
+                "pending": pending.get("pending", 0),
+                "oldest_pending_id": pending.get("min"),
+                "consumers": [
+                    {
+                        "name": consumer.get("name"),
+                        "pending": consumer.get("pending", 0),
+                        "idle_ms": consumer.get("idle", 0),
+                    }
+                    for consumer in consumers
+                ],
+            }
+        return out
+
+    async def _reclaim_stale(self) -> None:
+        now = time.monotonic()
+        if now - self._last_reclaim_at < settings.job_reclaim_interval_seconds:
+            return
+        self._last_reclaim_at = now
+
+        min_idle_ms = settings.job_visibility_timeout_seconds * 1000
+        for stream_key in self.stream_keys:
+            # Claim no more than this worker can run; the rest is left for
+            # other consumers or the next pass.
+            capacity = settings.worker_concurrency - len(self._reclaimed)
+            if capacity <= 0:
+                return
+            response = await self._redis.xautoclaim(
+                stream_key,
+                self._group,
+                self._consumer,
+                min_idle_time=min_idle_ms,
+                start_id="0-0",
+                count=capacity,
+            )
+            messages = response[1] if len(response) > 1 else []
+            for entry_id, fields in messages:
+                entry = _to_entry(stream_key, entry_id, fields)
+                if entry is None:
+                    await self._ack_entry_id(stream_key, entry_id)
+                    continue
+                if await self._exceeded_max_deliveries(entry):
+                    continue
+                logger.warning(
+                    "Reclaimed stale job %s from %s (entry %s).",
+                    entry.job_id,
+                    stream_key,
+                    entry.entry_id,
+                )
+                self._reclaimed.append(entry)
+
+    async def _exceeded_max_deliveries(self, entry: QueueEntry) -> bool:
+        details = await self._redis.xpending_range(
+            entry.stream_key,
+            self._group,
+            min=entry.entry_id,
+            max=entry.entry_id,
+            count=1,
+        )
+        if not details:
+            return False
+
+        deliveries = int(details[0].get("times_delivered", 1))
+        if deliveries <= settings.job_max_deliveries:
+            return False
+
+        logger.error(
+            "Dropping job %s after %s deliveries without acknowledgement.",
+            entry.job_id,
+            deliveries,
+        )
+        if self._on_exhausted is not None:
+            await self._on_exhausted(entry.job_id, deliveries)
+        await self.ack(entry)
+        return True
+
+    async def _ack_entry_id(self, stream_key: str, entry_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xack(stream_key, self._group, entry_id)
+            pipe.xdel(stream_key, entry_id)
+            await pipe.execute()
+
+    async def _migrate_legacy_list(self, stream_key: str) -> None:
+        # Earlier releases used the same key as an LPUSH/BRPOP list.
+        if await self._redis.type(stream_key) != "list":
+            return
+
+        legacy_key = f"{stream_key}:legacy"
+        try:
+            await self._redis.rename(stream_key, legacy_key)
+        except ResponseError:
+            return  # another replica migrated it first
+
+        job_ids = await self._redis.lrange(legacy_key, 0, -1)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for job_id in reversed(job_ids):
+                pipe.xadd(stream_key, {"job_id": job_id})
+            pipe.delete(legacy_key)
+            await pipe.execute()
+        logger.info("Migrated %s queued job(s) from list %s to a stream.", len(job_ids), stream_key)
+
+
+def _to_entry(stream_key: str, entry_id: str, fields: dict[str, str] | None) -> QueueEntry | None:
+    job_id = (fields or {}).get("job_id")
+    if not job_id:
+        return None
+    return QueueEntry(stream_key=stream_key, entry_id=entry_id, job_id=job_id)
+
+
+def _default_consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
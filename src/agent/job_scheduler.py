@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+
+from redis.asyncio import Redis as _Redis
+from redis.asyncio.client import Pipeline
+
+from src.agent.types import JobKind
+from src.config import settings
+
+JOB_KINDS: tuple[JobKind, ...] = ("material", "lkpd")
+
+# KEYS: tenant sub-queue, active-tenant set, tenant ring, depth counter, wakeup list
+# ARGV: job_id, tenant, wakeup list max length
+_ENQUEUE_LUA = """
+redis.call('LPUSH', KEYS[1], ARGV[1])
+if redis.call('SADD', KEYS[2], ARGV[2]) == 1 then
+    redis.call('RPUSH', KEYS[3], ARGV[2])
+end
+redis.call('INCR', KEYS[4])
+redis.call('LPUSH', KEYS[5], '1')
+redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[3]) - 1)
+return 1
+"""
+
+# Serves one job of the tenant at the head of the ring, then rotates the tenant
+# to the back so tenants take turns regardless of how many jobs each one has
+# queued. The caller reads the head tenant first so that its sub-queue can be
+# declared in KEYS; if another worker moved the ring meanwhile, or the tenant
+# has nothing left, the script returns 0 and the caller looks again.
+# Every key a script touches is declared in KEYS. On Redis Cluster they must
+# also share a slot: put the same hash tag in JOB_SCHEDULER_PREFIX and the job
+# queue keys, e.g. `{jobs}job_sched:` and `{jobs}material_jobs:queue`.
+# KEYS: tenant ring, active-tenant set, job stream, depth counter, tenant sub-queue
+# ARGV: tenant
+_DISPATCH_LUA = """
+if redis.call('LINDEX', KEYS[1], 0) ~= ARGV[1] then
+    return 0
+end
+redis.call('LPOP', KEYS[1])
+local job_id = redis.call('RPOP', KEYS[5])
+if not job_id then
+    redis.call('SREM', KEYS[2], ARGV[1])
+    return 0
+end
+if redis.call('LLEN', KEYS[5]) > 0 then
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+else
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+redis.call('DECR', KEYS[4])
+redis.call('XADD', KEYS[3], '*', 'job_id', job_id)
+return job_id
+"""
+
+# Moves one due delayed job into its tenant sub-queue, with the same
+# bookkeeping as _ENQUEUE_LUA. It goes to the served end of the sub-queue
+# because it already waited its turn once. Returns 0 if another process
+# promoted it first.
+# KEYS: delayed set, tenant sub-queue, active-tenant set, tenant ring, depth counter, wakeup list
+# ARGV: delayed member, job_id, tenant, wakeup list max length
+_PROMOTE_DUE_LUA = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], ARGV[2])
+if redis.call('SADD', KEYS[3], ARGV[3]) == 1 then
+    redis.call('RPUSH', KEYS[4], ARGV[3])
+end
+redis.call('INCR', KEYS[5])
+redis.call('LPUSH', KEYS[6], '1')
+redis.call('LTRIM', KEYS[6], 0, tonumber(ARGV[4]) - 1)
+return 1
+"""
+
+
+class KindSelector:
+    """Smooth weighted round-robin over job kinds.
+
+    Only the kind that actually produced a job is charged, so an empty kind
+    does not lose its share while the other kind is busy.
+    """
+
+    def __init__(self, weights: dict[str, int]) -> None:
+        self._weights = {kind: max(0, weights.get(kind, 1)) for kind in JOB_KINDS}
+        self._credit = {kind: 0 for kind in JOB_KINDS}
+
+    def order(self) -> list[JobKind]:
+        candidates = [kind for kind in JOB_KINDS if self._weights[kind] > 0]
+        return sorted(
+            candidates,
+            key=lambda kind: self._credit[kind] + self._weights[kind],
+            reverse=True,
+        )
+
+    def charge(self, served: JobKind) -> None:
+        total = sum(self._weights.values())
+        for kind in JOB_KINDS:
+            self._credit[kind] += self._weights[kind]
+        self._credit[served] -= total
+
+
+class FairJobScheduler:
+    """Per-tenant sub-queues in front of the job streams.
+
+    Jobs wait in `<prefix><kind>:tenant:<user_id>` lists and are moved into the
+    consumer-group stream one at a time, only when a worker asks for work.
+    """
+
+    def __init__(self, redis: _Redis) -> None:
+        self._redis = redis
+        self._enqueue_script = redis.register_script(_ENQUEUE_LUA)
+        self._dispatch_script = redis.register_script(_DISPATCH_LUA)
+        self._promote_script = redis.register_script(_PROMOTE_DUE_LUA)
+        self._selector = KindSelector(settings.job_kind_weights)
+
+    async def enqueue(
+        self,
+        job_kind: JobKind,
+        tenant: str,
+        job_id: str,
+        *,
+        pipe: Pipeline | None = None,
+    ) -> None:
+        """Queue a job id; with `pipe`, the command joins that pipeline instead."""
+        await self._enqueue_script(
+            keys=[
+                self._tenant_queue_key(job_kind, tenant),
+                self._active_key(job_kind),
+                self._ring_key(job_kind),
+                self._depth_key(job_kind),
+                self._wakeup_key(),
+            ],
+            args=[job_id, tenant, settings.job_scheduler_wakeup_max],
+            client=pipe,
+        )
+
+    async def enqueue_later(
+        self,
+        job_kind: JobKind,
+        tenant: str,
+        job_id: str,
+        *,
+        due_at: float,
+    ) -> None:
+        """Queue a job id once `due_at` (epoch seconds) has passed; see `promote_due`."""
+        member = json.dumps([job_kind, tenant, job_id])
+        await self._redis.zadd(self._delayed_key(), {member: due_at})
+
+    async def promote_due(self, *, now: float, limit: int) -> int:
+        """Move up to `limit` due delayed jobs into their sub-queues; return how many."""
+        due = await self._redis.zrangebyscore(
+            self._delayed_key(), "-inf", now, start=0, num=limit
+        )
+        if not due:
+            return 0
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for member in due:
+                job_kind, tenant, job_id = json.loads(member)
+                await self._promote_script(
+                    keys=[
+                        self._delayed_key(),
+                        self._tenant_queue_key(job_kind, tenant),
+                        self._active_key(job_kind),
+                        self._ring_key(job_kind),
+                        self._depth_key(job_kind),
+                        self._wakeup_key(),
+                    ],
+                    args=[member, job_id, tenant, settings.job_scheduler_wakeup_max],
+                    client=pipe,
+                )
+            promoted = await pipe.execute()
+        return sum(int(result) for result in promoted)
+
+    def kind_order(self) -> list[JobKind]:
+        """Job kinds in the order the weighted round-robin would serve them now."""
+        return self._selector.order()
+
+    async def dispatch_next(self, stream_keys: dict[JobKind, str]) -> JobKind | None:
+        """Move the next fairly-chosen job into its stream; return its kind."""
+        for job_kind in self._selector.order():
+            ring_key = self._ring_key(job_kind)
+            while (tenant := await self._redis.lindex(ring_key, 0)) is not None:
+                job_id = await self._dispatch_script(
+                    keys=[
+                        ring_key,
+                        self._active_key(job_kind),
+                        stream_keys[job_kind],
+                        self._depth_key(job_kind),
+                        self._tenant_queue_key(job_kind, tenant),
+                    ],
+                    args=[tenant],
+                )
+                if job_id:
+                    self._selector.charge(job_kind)
+                    return job_kind
+        return None
+
+    async def wait_for_work(self, *, timeout_seconds: int) -> None:
+        await self._redis.blpop([self._wakeup_key()], timeout=max(1, timeout_seconds))
+
+    async def depth(self, job_kind: JobKind) -> int:
+        return max(0, int(await self._redis.get(self._depth_key(job_kind)) or 0))
+
+    async def tenant_depth(self, job_kind: JobKind, tenant: str) -> int:
+        return await self._redis.llen(self._tenant_queue_key(job_kind, tenant))
+
+    async def active_tenants(self, job_kind: JobKind) -> int:
+        return await self._redis.scard(self._active_key(job_kind))
+
+    async def next_job_ids(self, job_kind: JobKind) -> list[str]:
+        """The job each active tenant would be served next, i.e. its oldest one."""
+        tenants = await self._redis.smembers(self._active_key(job_kind))
+        if not tenants:
+            return []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tenant in tenants:
+                pipe.lindex(self._tenant_queue_key(job_kind, tenant), -1)
+            job_ids = await pipe.execute()
+        return [job_id for job_id in job_ids if job_id]
+
+    @staticmethod
+    def _tenant_queue_key(job_kind: JobKind, tenant: str) -> str:
+        return f"{settings.job_scheduler_prefix}{job_kind}:tenant:{tenant}"
+
+    @staticmethod
+    def _active_key(job_kind: JobKind) -> str:
+        return f"{settings.job_scheduler_prefix}{job_kind}:active"
+
+    @staticmethod
+    def _ring_key(job_kind: JobKind) -> str:
+        return f"{settings.job_scheduler_prefix}{job_kind}:ring"
+
+    @staticmethod
+    def _delayed_key() -> str:
+        return f"{settings.job_scheduler_prefix}delayed"
+
+    @staticmethod
+    def _depth_key(job_kind: JobKind) -> str:
+        return f"{settings.job_scheduler_prefix}{job_kind}:depth"
+
+    @staticmethod
+    def _wakeup_key() -> str:
+        return f"{settings.job_scheduler_prefix}wakeup"
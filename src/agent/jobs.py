@@ -1,28 +1,102 @@
+import asyncio
 import base64
 import json
 import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
-from uuid import UUID, uuid4
+from pathlib import Path
+from urllib.parse import urlsplit
+from uuid import uuid4
 
 import asyncpg
 from redis.asyncio import Redis as _Redis
-
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ResponseError
+
+from src.agent.admission import AdmissionController, AdmissionRejection
+from src.agent.blob_store import (
+    StoredBlob,
+    build_blob_store,
+    cleanup_stale_spool_files,
+    new_spool_path,
+)
+from src.agent.checkpoints import JobCheckpoints
+from src.agent.dead_letters import DEAD_LETTER_STATUSES, DeadLetterIndex
+from src.agent.job_events import JobEventHub
+from src.agent.job_mirror import PostgresJobMirror
+from src.agent.job_queue import JobStreamQueue, QueueEntry
+from src.agent.job_scheduler import JOB_KINDS, FairJobScheduler
+from src.agent.result_cache import GenerationResultCache
 from src.agent.types import (
+    CallbackErrorInfo,
     JobKind,
     JobStatus,
     LkpdAsyncSubmitRequest,
+    LkpdWebhookResultPayload,
     MaterialAsyncSubmitRequest,
+    MaterialGenerateResponse,
+    MaterialUploadRequest,
+    MaterialWebhookResultPayload,
     QueuedJob,
 )
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class JobSubmission:
+    job_kind: JobKind
+    request: MaterialAsyncSubmitRequest | LkpdAsyncSubmitRequest
+    blob: StoredBlob
+    filename: str
+    content_type: str | None
+    submitted_by: str | None = None
+
+
+# Claims due callback retries by pushing their score forward by a lease, so a
+# crashed delivery loop does not lose them. ARGV: now, lease_until, limit.
+_CLAIM_DUE_RETRIES_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3])
+for _, member in ipairs(due) do
+    redis.call('ZADD', KEYS[1], 'XX', ARGV[2], member)
+end
+return due
+"""
+
+# Patches individual job fields in place; a missing job is left missing.
+# ARGV: ttl_seconds, clear_last_error ("1"/"0"), then field/value pairs.
+_UPDATE_JOB_FIELDS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if ARGV[2] == '1' then
+    redis.call('HDEL', KEYS[1], 'last_error')
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
 
 class MaterialJobStore:
     def __init__(self) -> None:
         self._redis: _Redis | None = None
         self._db_pool: asyncpg.Pool| None = None
+        self._mirror: PostgresJobMirror | None = None
+        self._blob_store = build_blob_store()
+        self._update_fields_script = None
+        self._claim_retries_script = None
+        self._queue: JobStreamQueue | None = None
+        self._scheduler: FairJobScheduler | None = None
+        self._dead_letters: DeadLetterIndex | None = None
+        self._events: JobEventHub | None = None
+        self._result_cache: GenerationResultCache | None = None
+        self._admission: AdmissionController | None = None
+        self._leases: dict[str, QueueEntry] = {}
 
     async def initialize(self) -> None:
         if self._redis is None:
@@ -34,6 +108,20 @@ class MaterialJobStore:
                 decode_responses=True,
             )
             await self._redis.ping()
+            self._update_fields_script = self._redis.register_script(
+                _UPDATE_JOB_FIELDS_LUA
+            )
+            self._claim_retries_script = self._redis.register_script(
+                _CLAIM_DUE_RETRIES_LUA
+            )
+            self._queue = JobStreamQueue(self._redis, on_exhausted=self.fail_exhausted_job)
+            await self._queue.initialize()
+            self._scheduler = FairJobScheduler(self._redis)
+            self._dead_letters = DeadLetterIndex(self._redis)
+            self._events = JobEventHub(self._redis)
+            self._result_cache = GenerationResultCache(self._redis)
+            self._admission = AdmissionController(self._redis, self._scheduler)
+            await self._blob_store.initialize()
 
         if self._db_pool is None and settings.db_host:
             try:
@@ -46,14 +134,33 @@ class MaterialJobStore:
                     min_size=1,
                     max_size=10,
                 )
+                self._mirror = PostgresJobMirror(self._db_pool)
+                self._mirror.start()
                 logger.info("Postgres pool initialized for AIJob store")
             except Exception as exc:
                 logger.warning("Failed to initialize Postgres pool: %s", exc)
 
     async def shutdown(self) -> None:
+        if self._queue is not None:
+            try:
+                await self._queue.release()
+            except Exception as exc:
+                logger.warning("Failed to requeue reclaimed job entries: %s", exc)
+            self._queue = None
+            self._scheduler = None
+            self._dead_letters = None
+            self._result_cache = None
+            self._admission = None
+        if self._events is not None:
+            await self._events.close()
+            self._events = None
         if self._redis is not None:
             await self._redis.close()
             self._redis = None
+        await self._blob_store.shutdown()
+        if self._mirror is not None:
+            await self._mirror.close()
+            self._mirror = None
         if self._db_pool is not None:
             await self._db_pool.close()
             self._db_pool = None
@@ -63,170 +170,622 @@ class MaterialJobStore:
         *,
         job_kind: JobKind,
         request: MaterialAsyncSubmitRequest | LkpdAsyncSubmitRequest,
-        file_bytes: bytes,
+        blob: StoredBlob,
         filename: str,
         content_type: str | None,
+        submitted_by: str | None = None,
     ) -> str:
+        job_ids = await self.enqueue_jobs(
+            [
+                JobSubmission(
+                    job_kind=job_kind,
+                    request=request,
+                    blob=blob,
+                    filename=filename,
+                    content_type=content_type,
+                    submitted_by=submitted_by,
+                )
+            ]
+        )
+        return job_ids[0]
+
+    async def enqueue_jobs(self, submissions: list[JobSubmission]) -> list[str]:
+        """Queue several stored uploads with one Redis transaction and one Postgres batch."""
         await self.initialize()
         assert self._redis is not None
+        assert self._scheduler is not None
+        if not submissions:
+            return []
 
         now = datetime.now(UTC)
-        encoded_file = base64.b64encode(file_bytes).decode("ascii")
+        jobs = [self._build_job(item, now) for item in submissions]
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for job in jobs:
+                self._save_job_in(pipe, job)
+            for job in jobs:
+                await self._scheduler.enqueue(
+                    job.job_kind, job.user_id, job.job_id, pipe=pipe
+                )
+            await pipe.execute()
+
+        if self._mirror is not None:
+            self._mirror.record_inserts(jobs)
+        return [job.job_id for job in jobs]
 
+    @staticmethod
+    def _build_job(item: JobSubmission, now: datetime) -> QueuedJob:
+        request = item.request
         # IDs for AIJob tracking
-        if job_kind == "material":
+        if item.job_kind == "material":
             assert isinstance(request, MaterialAsyncSubmitRequest)
             request_payload = request.to_material_upload_request().model_dump(mode="json")
             job_id = request.job_id
             material_id = request.material_id
             requested_by_id = request.requested_by_id
-        elif job_kind == "lkpd":
+        elif item.job_kind == "lkpd":
             assert isinstance(request, LkpdAsyncSubmitRequest)
             request_payload = request.to_lkpd_upload_request().model_dump(mode="json")
             job_id = str(uuid4())
             material_id = str(uuid4())
             requested_by_id = request.user_id
         else:
-            raise ValueError(f"Unsupported job_kind: {job_kind}")
+            raise ValueError(f"Unsupported job_kind: {item.job_kind}")
 
-        job = QueuedJob(
+        return QueuedJob(
             job_id=job_id,
-            job_kind=job_kind,
+            job_kind=item.job_kind,
             status="accepted",
             user_id=request.user_id,
             material_id=material_id,
             requested_by_id=requested_by_id,
+            submitted_by=item.submitted_by,
             callback_url=request.callback_url,
             request_payload=request_payload,
-            filename=filename,
-            content_type=content_type,
-            file_b64=encoded_file,
+            filename=item.filename,
+            content_type=item.content_type,
+            file_sha256=item.blob.sha256,
+            file_size=item.blob.size,
             callback_attempts=0,
             created_at=now,
             updated_at=now,
         )
 
-        await self._save_job(job)
-        await self._insert_to_postgres(job)
-
-        # LPUSH + BRPOP gives FIFO semantics.
-        await self._redis.lpush(self._queue_key(job_kind), job_id)
-        return job_id
+    async def store_upload(self, chunks: AsyncIterable[bytes]) -> StoredBlob:
+        """Stream an upload into the blob store before its job is queued."""
+        return await self._blob_store.put_stream(chunks)
 
     async def pop_next_job(self, *, timeout_seconds: int = 1) -> QueuedJob | None:
+        """Lease the next job; it stays pending until `ack_job` or `requeue_job`."""
         await self.initialize()
-        assert self._redis is not None
+        assert self._queue is not None
+        assert self._scheduler is not None
+
+        stream_keys = {kind: self._queue.stream_key(kind) for kind in JOB_KINDS}
+        # Entries left in the streams (requeued jobs) were charged to their kind
+        # when first dispatched; take them in the order the selector would.
+        entry = await self._queue.read(
+            [stream_keys[kind] for kind in self._scheduler.kind_order()]
+        )
+        if entry is None:
+            # Nothing leased or left in the streams: pull the next job fairly
+            # from the per-tenant sub-queues, or wait for an enqueue signal.
+            job_kind = await self._scheduler.dispatch_next(stream_keys)
+            if job_kind is None:
+                await self._scheduler.wait_for_work(timeout_seconds=timeout_seconds)
+                return None
+            entry = await self._queue.read([stream_keys[job_kind]])
+        if entry is None:
+            return None
 
-        queue_keys = [settings.job_queue_key, settings.lkpd_job_queue_key]
-        popped = await self._redis.brpop(queue_keys, timeout=timeout_seconds)
-        if not popped:
+        job = await self.get_job(entry.job_id)
+        if job is None:
+            logger.warning("Dropping queue entry for expired job %s", entry.job_id)
+            await self._queue.ack(entry)
             return None
 
-        _, job_id = popped
-        return await self.get_job(job_id)
+        self._leases[job.job_id] = entry
+        return job
+
+    async def check_admission(
+        self,
+        job_kind: JobKind,
+        tenants: dict[str, int],
+    ) -> AdmissionRejection | None:
+        """Return why `tenants[user_id]` more jobs cannot be queued now, if so."""
+        await self.initialize()
+        assert self._admission is not None
+        return await self._admission.check(job_kind, tenants)
+
+    async def ack_job(self, job_id: str) -> None:
+        entry = self._leases.pop(job_id, None)
+        if entry is None or self._queue is None:
+            return
+        await self._queue.ack(entry)
+        if self._admission is not None:
+            for job_kind in JOB_KINDS:
+                if self._queue.stream_key(job_kind) == entry.stream_key:
+                    await self._admission.record_completion(job_kind)
+
+    async def requeue_job(self, job_id: str) -> None:
+        entry = self._leases.pop(job_id, None)
+        if entry is None or self._queue is None:
+            return
+        await self._queue.requeue(entry)
+
+    def abandon_job(self, job_id: str) -> None:
+        """Stop renewing a lease so the entry is reclaimed after the visibility timeout."""
+        self._leases.pop(job_id, None)
+
+    async def renew_leases(self) -> None:
+        if self._queue is None:
+            return
+        await self._queue.renew(list(self._leases.values()))
+
+    async def queue_stats(self) -> dict[str, object]:
+        await self.initialize()
+        assert self._queue is not None
+        assert self._scheduler is not None
+
+        stats = await self._queue.stats()
+        stats["scheduled"] = {
+            kind: {
+                "depth": await self._scheduler.depth(kind),
+                "active_tenants": await self._scheduler.active_tenants(kind),
+            }
+            for kind in JOB_KINDS
+        }
+        return stats
+
+    async def oldest_waiting_job_age(self, job_kind: JobKind) -> float:
+        """Seconds since the oldest job of `job_kind` that has not started was created."""
+        await self.initialize()
+        assert self._redis is not None
+        assert self._scheduler is not None
+
+        job_ids = await self._scheduler.next_job_ids(job_kind)
+        if not job_ids:
+            return 0.0
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hget(self._job_key(job_id), "created_at")
+            # Legacy string-encoded jobs answer WRONGTYPE; they are skipped.
+            values = await pipe.execute(raise_on_error=False)
+        created = [
+            datetime.fromisoformat(json.loads(value))
+            for value in values
+            if isinstance(value, str)
+        ]
+        if not created:
+            return 0.0
+        return max(0.0, (datetime.now(UTC) - min(created)).total_seconds())
 
     async def get_job(self, job_id: str) -> QueuedJob | None:
         await self.initialize()
         assert self._redis is not None
 
-        payload = await self._redis.get(self._job_key(job_id))
-        if not payload:
+        try:
+            fields = await self._redis.hgetall(self._job_key(job_id))
+        except ResponseError as exc:
+            if not _is_wrong_type_error(exc):
+                raise
+            return await self._get_legacy_job(job_id)
+
+        if not fields:
             return None
-        return QueuedJob.model_validate_json(payload)
+        return decode_job_fields(fields)
 
     async def update_job(
         self,
         job_id: str,
         *,
         status: JobStatus | None = None,
+        processing_attempts: int | None = None,
         callback_attempts: int | None = None,
         last_error: str | None = None,
         clear_last_error: bool = False,
-    ) -> QueuedJob | None:
-        job = await self.get_job(job_id)
-        if job is None:
-            return None
-
+        callback_body: str | None = None,
+        record_dead_letter: bool = True,
+    ) -> bool:
+        """Patch the given fields of a job.
+
+        Failed statuses also enter the dead-letter index unless `record_dead_letter`
+        is False.
+        """
+        changes: dict[str, object] = {}
         if status is not None:
-            job.status = status
+            changes["status"] = status
+        if processing_attempts is not None:
+            changes["processing_attempts"] = processing_attempts
         if callback_attempts is not None:
-            job.callback_attempts = callback_attempts
-        if clear_last_error:
-            job.last_error = None
-        elif last_error is not None:
-            job.last_error = last_error
+            changes["callback_attempts"] = callback_attempts
+        if not clear_last_error and last_error is not None:
+            changes["last_error"] = last_error
+        if callback_body is not None:
+            changes["callback_body"] = callback_body
+        updated = await self._patch_fields(job_id, changes, clear_last_error=clear_last_error)
+        if updated and self._mirror is not None and (
+            status is not None or processing_attempts is not None
+        ):
+            self._mirror.record_update(
+                job_id,
+                status=status,
+                attempts=processing_attempts,
+                updated_at=datetime.now(UTC),
+            )
+        if updated and record_dead_letter and status in DEAD_LETTER_STATUSES:
+            assert self._dead_letters is not None
+            await self._dead_letters.record(job_id, status)
+        if updated and self._events is not None:
+            await self._events.publish(job_id, status)
+        return updated
+
+    @asynccontextmanager
+    async def watch_job(self, job_id: str) -> AsyncIterator[asyncio.Event]:
+        """Yield an event set on every `update_job` of `job_id`, from any process."""
+        await self.initialize()
+        assert self._events is not None
+        async with self._events.watch(job_id) as changed:
+            yield changed
 
-        job.updated_at = datetime.now(UTC)
-        await self._save_job(job)
+    async def list_dead_letters(
+        self,
+        status: JobStatus,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        host: str | None = None,
+        job_kind: JobKind | None = None,
+        limit: int = 100,
+    ) -> list[tuple[QueuedJob, datetime]]:
+        """Failed jobs with `status`, newest first, filtered by time, callback host and kind."""
+        await self.initialize()
+        assert self._dead_letters is not None
+
+        matched: list[tuple[QueuedJob, datetime]] = []
+        # Removed only after the scan: dropping entries mid-scan would shift
+        # the later pages left and skip live dead letters.
+        expired: list[str] = []
+        offset = 0
+        page_size = max(limit, 100)
+        while len(matched) < limit:
+            entries = await self._dead_letters.list(
+                status, since=since, until=until, offset=offset, limit=page_size
+            )
+            if not entries:
+                break
+            offset += len(entries)
+            for job_id, failed_at in entries:
+                job = await self.get_job(job_id)
+                if job is None or job.status != status:
+                    # Expired, or already replayed by another request.
+                    if job is None:
+                        expired.append(job_id)
+                    continue
+                if job_kind is not None and job.job_kind != job_kind:
+                    continue
+                if host is not None and _callback_host(job) != host.lower():
+                    continue
+                matched.append((job, failed_at))
+                if len(matched) >= limit:
+                    break
+        for job_id in expired:
+            await self._dead_letters.remove(job_id, status)
+        return matched
+
+    async def dead_letter_counts(self) -> dict[str, int]:
+        await self.initialize()
+        assert self._dead_letters is not None
+        return {status: await self._dead_letters.count(status) for status in DEAD_LETTER_STATUSES}
 
-        return job
+    async def redeliver_dead_letter(self, job: QueuedJob) -> bool:
+        """Send the stored callback body again, with a fresh retry budget."""
+        if job.status != "failed_delivery" or not job.callback_url or not job.callback_body:
+            return False
+        await self.initialize()
+        assert self._dead_letters is not None
+
+        # Removing the index entry doubles as a claim against concurrent replays.
+        if not await self._dead_letters.remove(job.job_id, "failed_delivery"):
+            return False
+        outcome = json.loads(job.callback_body).get("status", "succeeded")
+        # The job leaves the DLQ while its callback is pending again; a
+        # `failed_processing` outcome must not re-list it for reprocessing.
+        # It comes back as `failed_delivery` if the replay fails too.
+        await self.update_job(
+            job.job_id,
+            status=outcome,
+            callback_attempts=0,
+            clear_last_error=True,
+            record_dead_letter=False,
+        )
+        return await self.schedule_callback_retry(
+            job.job_id,
+            body=job.callback_body,
+            delay_seconds=0,
+        )
 
-    @staticmethod
-    def decode_file_bytes(job: QueuedJob) -> bytes:
-        return base64.b64decode(job.file_b64.encode("ascii"))
+    async def reprocess_dead_letter(self, job: QueuedJob) -> bool:
+        """Queue a failed job again from its stored upload."""
+        if job.status not in DEAD_LETTER_STATUSES:
+            return False
+        if not job.file_b64 and not (
+            job.file_sha256 and await self._blob_store.touch(job.file_sha256)
+        ):
+            return False
+        await self.initialize()
+        assert self._dead_letters is not None
+        assert self._scheduler is not None
 
-    async def _save_job(self, job: QueuedJob) -> None:
+        if not await self._dead_letters.remove(job.job_id, job.status):
+            return False
+        if not await self.update_job(
+            job.job_id,
+            status="accepted",
+            callback_attempts=0,
+            clear_last_error=True,
+        ):
+            return False
+        await self._scheduler.enqueue(job.job_kind, job.user_id, job.job_id)
+        return True
+
+    async def fail_exhausted_job(self, job_id: str, deliveries: int) -> None:
+        """Fail a job whose queue entry was delivered too often without an ack.
+
+        Such jobs keep crashing or stalling their worker, so they are marked
+        `failed_processing` (which puts them in the dead-letter index) and
+        their failure webhook is queued like any other callback retry.
+        """
+        job = await self.get_job(job_id)
+        if job is None or job.status not in ("accepted", "processing"):
+            return
+
+        error = f"Job exceeded max deliveries ({deliveries}) without completing."
+        await self.update_job(job_id, status="failed_processing", last_error=error)
+        if not job.callback_url:
+            return
+
+        payload_type = (
+            MaterialWebhookResultPayload
+            if job.job_kind == "material"
+            else LkpdWebhookResultPayload
+        )
+        payload = payload_type(
+            job_id=job_id,
+            status="failed_processing",
+            user_id=job.user_id,
+            error=CallbackErrorInfo(code="max_deliveries_exceeded", message=error),
+            attempt=1,
+            finished_at=datetime.now(UTC),
+        )
+        # Same body shape as `delivery.serialize_callback_payload`; the retry
+        # loop splices the attempt number in when it sends it.
+        await self.schedule_callback_retry(
+            job_id,
+            body=payload.model_dump_json(exclude_none=True, exclude={"attempt"}),
+            delay_seconds=0,
+        )
+
+    async def schedule_processing_retry(
+        self,
+        job: QueuedJob,
+        *,
+        error: str,
+        delay_seconds: float,
+    ) -> bool:
+        """Queue a failed job again after `delay_seconds`, from its stored upload.
+
+        Returns False when the job or its upload has expired in the meantime.
+        """
+        if not job.file_b64 and not (
+            job.file_sha256 and await self._blob_store.touch(job.file_sha256)
+        ):
+            return False
+        await self.initialize()
+        assert self._scheduler is not None
+
+        if not await self.update_job(
+            job.job_id,
+            status="accepted",
+            processing_attempts=job.processing_attempts + 1,
+            last_error=error,
+        ):
+            return False
+        await self._scheduler.enqueue_later(
+            job.job_kind,
+            job.user_id,
+            job.job_id,
+            due_at=datetime.now(UTC).timestamp() + delay_seconds,
+        )
+        return True
+
+    async def promote_due_processing_retries(self, *, limit: int) -> int:
+        await self.initialize()
+        assert self._scheduler is not None
+        return await self._scheduler.promote_due(
+            now=datetime.now(UTC).timestamp(),
+            limit=limit,
+        )
+
+    async def schedule_callback_retry(
+        self,
+        job_id: str,
+        *,
+        body: str,
+        delay_seconds: float,
+    ) -> bool:
+        """Persist the serialized callback body and queue it for delivery after `delay_seconds`."""
+        if not await self._patch_fields(job_id, {"callback_body": body}):
+            return False
         assert self._redis is not None
-        await self._redis.set(
-            self._job_key(job.job_id),
-            job.model_dump_json(),
-            ex=settings.job_ttl_seconds,
+        due_at = datetime.now(UTC).timestamp() + delay_seconds
+        await self._redis.zadd(settings.callback_retry_key, {job_id: due_at})
+        return True
+
+    async def claim_due_callback_retries(self, *, limit: int) -> list[str]:
+        await self.initialize()
+        assert self._claim_retries_script is not None
+
+        now = datetime.now(UTC).timestamp()
+        lease_until = now + settings.webhook_callback_timeout_seconds * 3
+        return list(
+            await self._claim_retries_script(
+                keys=[settings.callback_retry_key],
+                args=[now, lease_until, limit],
+            )
         )
 
-    async def _insert_to_postgres(self, job: QueuedJob) -> None:
-        if self._db_pool is None:
-            return
+    async def complete_callback_retry(self, job_id: str) -> None:
+        await self.initialize()
+        assert self._redis is not None
+        await self._redis.zrem(settings.callback_retry_key, job_id)
+
+    async def _patch_fields(
+        self,
+        job_id: str,
+        changes: dict[str, object],
+        *,
+        clear_last_error: bool = False,
+    ) -> bool:
+        await self.initialize()
+        assert self._update_fields_script is not None
 
+        args: list[object] = [settings.job_ttl_seconds, "1" if clear_last_error else "0"]
+        fields = {"updated_at": datetime.now(UTC).isoformat(), **changes}
+        for field, value in fields.items():
+            args.extend([field, json.dumps(value)])
+
+        key = self._job_key(job_id)
         try:
-            job_type = "MCQ"
-            if job.job_kind == "lkpd":
-                job_type = "LKPD"
-            else:
-                gt = job.request_payload.get("generate_types", [])
-                if gt:
-                    t = gt[0].lower()
-                    if t == "mcq": job_type = "MCQ"
-                    elif t == "essay": job_type = "ESSAY"
-                    elif t == "summary": job_type = "SUMMARY"
-
-            # Parse UUIDs and convert to strings for asyncpg/Postgres varchar
-            jid = str(self._parse_uuid(job.job_id))
-            mid = str(self._parse_uuid(job.material_id))
-            uid = str(self._parse_uuid(job.user_id))
-            rid = str(self._parse_uuid(job.requested_by_id))
-
-            params_json = json.dumps(job.request_payload)
-
-            async with self._db_pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO "AIJob" (
-                        "id", "materialId", "requestedById", "type", "status",
-                        "externalJobId", "createdAt", "updatedAt", "attempts", "parameters"
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                    ON CONFLICT ("id") DO NOTHING
-                    """,
-                    jid, mid, rid, job_type, "accepted", 
-                    job.job_id, job.created_at, job.updated_at, 0, params_json
-                )
-                logger.info("Job %s inserted into Postgres successfully", job.job_id)
+            updated = await self._update_fields_script(keys=[key], args=args)
+        except ResponseError as exc:
+            if not _is_wrong_type_error(exc):
+                raise
+            if await self._get_legacy_job(job_id) is None:
+                return False
+            updated = await self._update_fields_script(keys=[key], args=args)
+        return bool(updated)
+
+    async def checkpoints(self, job_id: str) -> JobCheckpoints:
+        await self.initialize()
+        assert self._redis is not None
+        return JobCheckpoints(self._redis, job_id)
+
+    async def clear_checkpoints(self, job_id: str) -> None:
+        checkpoints = await self.checkpoints(job_id)
+        try:
+            await checkpoints.clear()
         except Exception as exc:
-            logger.error("Failed to insert Job into Postgres: %s", exc)
+            logger.warning("Failed to clear checkpoints of job %s: %s", job_id, exc)
 
-    @staticmethod
-    def _parse_uuid(val: str | None) -> UUID | None:
-        if val is None: return None
+    async def get_cached_result(
+        self,
+        job: QueuedJob,
+        request: MaterialUploadRequest,
+    ) -> MaterialGenerateResponse | None:
+        """Look up a previous result for the same upload content and parameters."""
+        if not settings.result_cache_enabled or not job.file_sha256:
+            return None
+        await self.initialize()
+        assert self._result_cache is not None
         try:
-            return UUID(val)
-        except (ValueError, TypeError):
-            return uuid4()
+            return await self._result_cache.get(job.file_sha256, request)
+        except Exception as exc:
+            logger.warning("Result cache lookup failed for job %s: %s", job.job_id, exc)
+            return None
 
-    @staticmethod
-    def _queue_key(job_kind: JobKind) -> str:
-        if job_kind == "material":
-            return settings.job_queue_key
-        return settings.lkpd_job_queue_key
+    async def cache_result(
+        self,
+        job: QueuedJob,
+        request: MaterialUploadRequest,
+        result: MaterialGenerateResponse,
+    ) -> None:
+        if not settings.result_cache_enabled or not job.file_sha256:
+            return
+        await self.initialize()
+        assert self._result_cache is not None
+        try:
+            await self._result_cache.put(job.file_sha256, request, result)
+        except Exception as exc:
+            logger.warning("Failed to cache result of job %s: %s", job.job_id, exc)
+
+    async def result_cache_stats(self) -> dict[str, int]:
+        await self.initialize()
+        assert self._result_cache is not None
+        return await self._result_cache.stats()
+
+    @asynccontextmanager
+    async def spool_file(self, job: QueuedJob) -> AsyncIterator[Path]:
+        """The job's upload as a file on disk, for parsers to read or memory-map."""
+        if job.file_b64:
+            path = await asyncio.to_thread(new_spool_path)
+            try:
+                await asyncio.to_thread(
+                    path.write_bytes, base64.b64decode(job.file_b64.encode("ascii"))
+                )
+                yield path
+            finally:
+                path.unlink(missing_ok=True)
+            return
+
+        assert job.file_sha256 is not None
+        async with self._blob_store.spool(job.file_sha256) as path:
+            if path is None:
+                raise ValueError("Uploaded file is no longer available in blob storage.")
+            yield path
+
+    def cleanup_expired_blobs(self) -> int:
+        return self._blob_store.cleanup_expired_blobs() + cleanup_stale_spool_files()
+
+    async def _save_job(self, job: QueuedJob) -> None:
+        assert self._redis is not None
+        async with self._redis.pipeline(transaction=True) as pipe:
+            self._save_job_in(pipe, job)
+            await pipe.execute()
+
+    def _save_job_in(self, pipe: Pipeline, job: QueuedJob) -> None:
+        key = self._job_key(job.job_id)
+        pipe.delete(key)
+        pipe.hset(key, mapping=encode_job_fields(job))
+        pipe.expire(key, settings.job_ttl_seconds)
+
+    async def _get_legacy_job(self, job_id: str) -> QueuedJob | None:
+        # Records written before jobs became hashes are single JSON strings;
+        # convert them on first touch so field-level updates apply afterwards.
+        assert self._redis is not None
+        payload = await self._redis.get(self._job_key(job_id))
+        if not payload:
+            return None
+        job = QueuedJob.model_validate_json(payload)
+        await self._save_job(job)
+        return job
 
     @staticmethod
     def _job_key(job_id: str) -> str:
         return f"material_jobs:{job_id}"
+
+
+def encode_job_fields(job: QueuedJob) -> dict[str, str]:
+    """Serialize a job into Redis hash fields, one JSON value per field."""
+    return {
+        field: json.dumps(value)
+        for field, value in job.model_dump(mode="json").items()
+        if value is not None
+    }
+
+
+def decode_job_fields(fields: dict[str, str]) -> QueuedJob:
+    return QueuedJob.model_validate(
+        {field: json.loads(value) for field, value in fields.items()}
+    )
+
+
+def _callback_host(job: QueuedJob) -> str | None:
+    if job.callback_url is None:
+        return None
+    host = urlsplit(str(job.callback_url)).hostname
+    return host.lower() if host else None
+
+
+def _is_wrong_type_error(exc: ResponseError) -> bool:
+    return "WRONGTYPE" in str(exc)
@@ -1,52 +1,236 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import mmap
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
 
 from pypdf import PdfReader as _PdfReader
-from pptx import Presentation as _Presentation
+
+from src.agent.executors import run_blocking, run_cpu_bound
+from src.agent.extraction_cache import ExtractionCache, extraction_cache_key
+from src.agent.pptx_text import PptxTextReader
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Uploads arrive either in memory or as a spooled file on disk; a path is
+# also what crosses into the CPU pool, instead of pickling the whole file.
+MaterialSource = bytes | Path
 
 
 def _normalize_text(text: str) -> str:
     return " ".join(text.replace("\x00", " ").split())
 
 
-def extract_text_from_pdf(payload: bytes) -> str:
+@contextmanager
+def _open_pdf(payload: MaterialSource) -> Iterator[_PdfReader]:
+    """PDF reader over the upload; files are memory-mapped, not read into memory.
+
+    pypdf reads objects lazily from its stream, so the mapping stays open
+    until the caller is done with the reader.
+    """
     if _PdfReader is None:
-        raise ValueError("PDF support is unavailable. Install pypdf.") 
+        raise ValueError("PDF support is unavailable. Install pypdf.")
 
+    if isinstance(payload, bytes):
+        yield _read_pdf(BytesIO(payload))
+        return
+
+    with payload.open("rb") as handle:
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            raise ValueError(f"Failed to read PDF file: {exc}") from exc
+        with mapped:
+            yield _read_pdf(mapped)
+
+
+def _read_pdf(stream) -> _PdfReader:
     try:
-        reader = _PdfReader(BytesIO(payload))
+        return _PdfReader(stream)
     except Exception as exc:
         raise ValueError(f"Failed to read PDF file: {exc}") from exc
 
+
+def count_pdf_pages(payload: MaterialSource) -> int:
+    with _open_pdf(payload) as reader:
+        return len(reader.pages)
+
+
+def extract_pdf_pages(payload: MaterialSource, start: int, stop: int) -> list[str]:
+    """Raw text of the non-blank pages in `[start, stop)`, in page order.
+
+    Opens its own reader so page ranges of one file can be extracted in
+    separate processes.
+    """
     chunks: list[str] = []
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        if text.strip():
-            chunks.append(text)
-    return _normalize_text("\n".join(chunks))
+    with _open_pdf(payload) as reader:
+        for index in range(start, min(stop, len(reader.pages))):
+            text = reader.pages[index].extract_text() or ""
+            if text.strip():
+                chunks.append(text)
+    return chunks
 
 
-def extract_text_from_pptx(payload: bytes) -> str:
-    if _Presentation is None:
-        raise ValueError("PPTX support is unavailable. Install python-pptx.")
+def spread_order(count: int) -> list[int]:
+    """Page indices ordered so that every prefix is spread over the document.
+
+    Bit-reversed counting visits 0, n/2, n/4, 3n/4, ...: the first `k` indices
+    leave no gap wider than about `2n/k`, so stopping anywhere keeps pages
+    from every part of the document.
+    """
+    bits = max(count - 1, 0).bit_length()
+    order: list[int] = []
+    for value in range(1 << bits):
+        index = int(f"{value:0{bits}b}"[::-1], 2) if bits else 0
+        if index < count:
+            order.append(index)
+    return order
 
-    try:
-        presentation = _Presentation(BytesIO(payload))
-    except Exception as exc:
-        raise ValueError(f"Failed to read PPTX file: {exc}") from exc
 
+def sample_pdf_pages(
+    payload: MaterialSource,
+    pages: list[int],
+    char_budget: int,
+) -> list[tuple[int, str]]:
+    """Extract `pages` in the given order until `char_budget` characters are collected.
+
+    Returns `(page_index, text)` for every visited page, blank ones included,
+    so callers can tell how far extraction got.
+    """
+    with _open_pdf(payload) as reader:
+        return _sample_units(
+            pages,
+            lambda index: reader.pages[index].extract_text() or "",
+            char_budget,
+        )
+
+
+def extract_text_from_pdf(payload: MaterialSource) -> str:
     chunks: list[str] = []
-    for slide in presentation.slides:
-        for shape in slide.shapes:
-            text = getattr(shape, "text", "")
-            if text and text.strip():
+    with _open_pdf(payload) as reader:
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            if text.strip():
                 chunks.append(text)
     return _normalize_text("\n".join(chunks))
 
 
-def extract_text_from_txt(payload: bytes) -> str:
+def extract_text_from_pdf_within_budget(
+    payload: MaterialSource,
+    char_budget: int,
+) -> tuple[str, list[str]]:
+    with _open_pdf(payload) as reader:
+        page_count = len(reader.pages)
+        visited = _sample_units(
+            spread_order(page_count),
+            lambda index: reader.pages[index].extract_text() or "",
+            char_budget,
+        )
+    return _join_sampled(visited, page_count, unit="pages")
+
+
+async def extract_text_from_pdf_parallel(payload: MaterialSource, page_count: int) -> str:
+    """Extract page ranges concurrently in the CPU pool and join them in order."""
+    parts = settings.cpu_executor_workers
+    bounds = [page_count * part // parts for part in range(parts + 1)]
+    ranges = await asyncio.gather(
+        *(
+            run_cpu_bound(extract_pdf_pages, payload, start, stop)
+            for start, stop in zip(bounds, bounds[1:])
+            if stop > start
+        )
+    )
+    return _normalize_text("\n".join(chunk for chunks in ranges for chunk in chunks))
+
+
+async def sample_pdf_pages_parallel(
+    payload: MaterialSource,
+    page_count: int,
+    char_budget: int,
+) -> tuple[str, list[str]]:
+    """Budgeted extraction with the spread order dealt round-robin to the pool.
+
+    Each worker gets an equal share of the budget; every share is itself
+    spread over the whole document.
+    """
+    parts = settings.cpu_executor_workers
+    order = spread_order(page_count)
+    share = -(-char_budget // parts)
+    visited = await asyncio.gather(
+        *(
+            run_cpu_bound(sample_pdf_pages, payload, order[part::parts], share)
+            for part in range(min(parts, page_count))
+        )
+    )
+    return _join_sampled(
+        [page for pages in visited for page in pages],
+        page_count,
+        unit="pages",
+    )
+
+
+def extract_text_from_pptx(payload: MaterialSource) -> str:
+    with PptxTextReader(payload) as reader:
+        return _normalize_text(
+            "\n".join(reader.slide_text(index) for index in range(reader.slide_count))
+        )
+
+
+def extract_text_from_pptx_within_budget(
+    payload: MaterialSource,
+    char_budget: int,
+) -> tuple[str, list[str]]:
+    with PptxTextReader(payload) as reader:
+        visited = _sample_units(
+            spread_order(reader.slide_count),
+            reader.slide_text,
+            char_budget,
+        )
+        return _join_sampled(visited, reader.slide_count, unit="slides")
+
+
+def _sample_units(
+    order: list[int],
+    extract: Callable[[int], str],
+    char_budget: int,
+) -> list[tuple[int, str]]:
+    visited: list[tuple[int, str]] = []
+    collected = 0
+    for index in order:
+        if collected >= char_budget:
+            break
+        text = extract(index)
+        visited.append((index, text))
+        collected += len(_normalize_text(text))
+    return visited
+
+
+def _join_sampled(
+    visited: list[tuple[int, str]],
+    total: int,
+    *,
+    unit: str,
+) -> tuple[str, list[str]]:
+    warnings: list[str] = []
+    if len(visited) < total:
+        warnings.append(
+            f"Document exceeds EXTRACTION_CHAR_BUDGET; extracted {len(visited)} of "
+            f"{total} {unit} sampled across the document."
+        )
+    text = _normalize_text(
+        "\n".join(text for _, text in sorted(visited) if text.strip())
+    )
+    return text, warnings
+
+
+def extract_text_from_txt(payload: MaterialSource) -> str:
+    if isinstance(payload, Path):
+        payload = payload.read_bytes()
     try:
         text = payload.decode("utf-8-sig")
     except UnicodeDecodeError:
@@ -58,17 +242,24 @@ def extract_material_text(
     *,
     filename: str,
     content_type: str | None,
-    payload: bytes,
+    payload: MaterialSource,
 ) -> tuple[str, str, list[str]]:
     warnings: list[str] = []
     ext = Path(filename).suffix.lower()
+    char_budget = settings.extraction_char_budget
 
     if ext == ".pdf":
         file_type = "pdf"
-        text = extract_text_from_pdf(payload)
+        if char_budget > 0:
+            text, warnings = extract_text_from_pdf_within_budget(payload, char_budget)
+        else:
+            text = extract_text_from_pdf(payload)
     elif ext == ".pptx":
         file_type = "pptx"
-        text = extract_text_from_pptx(payload)
+        if char_budget > 0:
+            text, warnings = extract_text_from_pptx_within_budget(payload, char_budget)
+        else:
+            text = extract_text_from_pptx(payload)
     elif ext == ".txt":
         file_type = "txt"
         text = extract_text_from_txt(payload)
@@ -77,6 +268,86 @@ def extract_material_text(
             "Unsupported file type. Allowed extensions: .pdf, .pptx, .txt"
         )
 
+    return _checked_result(text, file_type, content_type, warnings)
+
+
+async def extract_material_text_async(
+    *,
+    filename: str,
+    content_type: str | None,
+    payload: MaterialSource,
+    file_sha256: str | None = None,
+) -> tuple[str, str, list[str]]:
+    """`extract_material_text` off the event loop, fronted by the on-disk cache.
+
+    Re-submitting the same file reuses the text extracted the first time;
+    `EXTRACTION_CACHE_MAX_MB=0` disables the cache. `file_sha256` is the
+    payload's digest when the caller already has it.
+    """
+    if settings.extraction_cache_max_mb <= 0:
+        return await _extract_uncached(
+            filename=filename, content_type=content_type, payload=payload
+        )
+
+    cache = ExtractionCache()
+    if file_sha256:
+        key = extraction_cache_key(payload, filename, file_sha256=file_sha256)
+    else:
+        key = await run_blocking(extraction_cache_key, payload, filename)
+    result = await run_blocking(cache.get, key)
+    if result is None:
+        # Cached without the content-type check, which depends on the request.
+        result = await _extract_uncached(filename=filename, content_type=None, payload=payload)
+        try:
+            await run_blocking(cache.put, key, result)
+        except OSError:
+            logger.warning("Failed to store extraction cache entry.", exc_info=True)
+    text, file_type, warnings = result
+    return _checked_result(text, file_type, content_type, list(warnings))
+
+
+async def _extract_uncached(
+    *,
+    filename: str,
+    content_type: str | None,
+    payload: MaterialSource,
+) -> tuple[str, str, list[str]]:
+    """PDFs with at least `PDF_PARALLEL_MIN_PAGES` pages are split into one page
+    range per CPU pool worker (or one share of the sampled pages when
+    `EXTRACTION_CHAR_BUDGET` is set); everything else runs as a single pool
+    task.
+    """
+    min_pages = settings.pdf_parallel_min_pages
+    if (
+        Path(filename).suffix.lower() == ".pdf"
+        and min_pages > 0
+        and settings.cpu_executor_workers > 1
+    ):
+        page_count = await run_cpu_bound(count_pdf_pages, payload)
+        if page_count >= min_pages:
+            char_budget = settings.extraction_char_budget
+            if char_budget > 0:
+                text, warnings = await sample_pdf_pages_parallel(
+                    payload, page_count, char_budget
+                )
+                return _checked_result(text, "pdf", content_type, warnings)
+            text = await extract_text_from_pdf_parallel(payload, page_count)
+            return _checked_result(text, "pdf", content_type, [])
+
+    return await run_cpu_bound(
+        extract_material_text,
+        filename=filename,
+        content_type=content_type,
+        payload=payload,
+    )
+
+
+def _checked_result(
+    text: str,
+    file_type: str,
+    content_type: str | None,
+    warnings: list[str],
+) -> tuple[str, str, list[str]]:
     if not text.strip():
         raise ValueError("Extracted text is empty.")
 
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from collections.abc import Iterator
+from io import BytesIO
+from pathlib import Path
+from typing import IO
+from xml.etree.ElementTree import Element, ParseError, fromstring, iterparse
+
+_NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_A_P = f"{{{_NS_A}}}p"
+_A_T = f"{{{_NS_A}}}t"
+_A_BR = f"{{{_NS_A}}}br"
+_P_SP = f"{{{_NS_P}}}sp"
+_P_PH = f"{{{_NS_P}}}nvSpPr/{{{_NS_P}}}nvPr/{{{_NS_P}}}ph"
+_P_SLD_ID = f"{{{_NS_P}}}sldIdLst/{{{_NS_P}}}sldId"
+_R_ID = f"{{{_NS_R}}}id"
+_REL = f"{{{_NS_REL}}}Relationship"
+
+_PRESENTATION_PART = "ppt/presentation.xml"
+_NOTES_REL_TYPE = "/notesSlide"
+_SLIDE_PART = re.compile(r"ppt/slides/slide(\d+)\.xml")
+
+
+class PptxTextReader:
+    """Text of a .pptx read straight from its slide XML, one slide at a time.
+
+    Slides are stream-parsed paragraph by paragraph, which covers text boxes,
+    tables and grouped shapes alike; speaker notes contribute their body
+    placeholder. Nothing beyond the current slide's paragraph is kept in
+    memory, unlike the python-pptx object model.
+    """
+
+    def __init__(self, source: bytes | Path) -> None:
+        try:
+            self._zip = zipfile.ZipFile(BytesIO(source) if isinstance(source, bytes) else source)
+            self._slides = self._slide_parts()
+        except (OSError, KeyError, ParseError, zipfile.BadZipFile) as exc:
+            raise ValueError(f"Failed to read PPTX file: {exc}") from exc
+
+    def __enter__(self) -> PptxTextReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._zip.close()
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._slides)
+
+    def slide_text(self, index: int) -> str:
+        part = self._slides[index]
+        try:
+            with self._zip.open(part) as stream:
+                paragraphs = list(_paragraphs(stream))
+            notes = self._notes_part(part)
+            if notes is not None:
+                with self._zip.open(notes) as stream:
+                    paragraphs.extend(_notes_paragraphs(stream))
+        except (KeyError, ParseError, zipfile.BadZipFile) as exc:
+            raise ValueError(f"Failed to read PPTX file: {exc}") from exc
+        return "\n".join(paragraphs)
+
+    def _slide_parts(self) -> list[str]:
+        """Slide part names in presentation order (file-name order as a fallback)."""
+        names = set(self._zip.namelist())
+        if _PRESENTATION_PART in names:
+            targets = self._relationship_targets(_PRESENTATION_PART)
+            presentation = fromstring(self._zip.read(_PRESENTATION_PART))
+            ordered = [
+                targets.get(slide_id.get(_R_ID, ""))
+                for slide_id in presentation.iterfind(_P_SLD_ID)
+            ]
+            parts = [part for part in ordered if part in names]
+            if parts:
+                return parts
+
+        numbered = [
+            (int(match.group(1)), name)
+            for name in names
+            if (match := _SLIDE_PART.fullmatch(name))
+        ]
+        return [name for _, name in sorted(numbered)]
+
+    def _notes_part(self, slide_part: str) -> str | None:
+        for rel_type, target in self._relationships(slide_part):
+            if rel_type.endswith(_NOTES_REL_TYPE):
+                return target
+        return None
+
+    def _relationship_targets(self, part: str) -> dict[str, str]:
+        rels = self._read_rels(part)
+        if rels is None:
+            return {}
+        return {
+            rel.get("Id", ""): _resolve(part, rel.get("Target", ""))
+            for rel in rels.iter(_REL)
+        }
+
+    def _relationships(self, part: str) -> list[tuple[str, str]]:
+        rels = self._read_rels(part)
+        if rels is None:
+            return []
+        return [
+            (rel.get("Type", ""), _resolve(part, rel.get("Target", "")))
+            for rel in rels.iter(_REL)
+        ]
+
+    def _read_rels(self, part: str) -> Element | None:
+        directory, name = posixpath.split(part)
+        rels_part = posixpath.join(directory, "_rels", f"{name}.rels")
+        try:
+            return fromstring(self._zip.read(rels_part))
+        except KeyError:
+            return None
+
+
+def _resolve(part: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+
+def _paragraphs(stream: IO[bytes]) -> Iterator[str]:
+    for _, element in iterparse(stream, events=("end",)):
+        if element.tag == _A_P:
+            text = _paragraph_text(element)
+            element.clear()
+            if text.strip():
+                yield text
+
+
+def _notes_paragraphs(stream: IO[bytes]) -> Iterator[str]:
+    """Paragraphs of the notes body; slide image, number and header placeholders are skipped."""
+    for _, element in iterparse(stream, events=("end",)):
+        if element.tag != _P_SP:
+            continue
+        placeholder = element.find(_P_PH)
+        if placeholder is not None and placeholder.get("type") == "body":
+            for paragraph in element.iter(_A_P):
+                text = _paragraph_text(paragraph)
+                if text.strip():
+                    yield text
+        element.clear()
+
+
+def _paragraph_text(paragraph: Element) -> str:
+    parts: list[str] = []
+    for node in paragraph.iter():
+        if node.tag == _A_T and node.text:
+            parts.append(node.text)
+        elif node.tag == _A_BR:
+            parts.append("\n")
+    return "".join(parts)
@@ -1,4 +1,11 @@
 from src.agent.prompts.lkpd_generation import build_lkpd_generation_prompt
-from src.agent.prompts.material_generation import build_material_generation_prompt
+from src.agent.prompts.material_generation import (
+    MATERIAL_PROMPT_VERSION,
+    build_material_generation_prompt,
+)
 
-__all__ = ["build_material_generation_prompt", "build_lkpd_generation_prompt"]
+__all__ = [
+    "MATERIAL_PROMPT_VERSION",
+    "build_material_generation_prompt",
+    "build_lkpd_generation_prompt",
+]
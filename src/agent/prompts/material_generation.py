@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from src.agent.types import GenerateType
 
+# Bump whenever the prompt or output contract changes, so cached generation
+# results produced by the previous wording are not reused.
+MATERIAL_PROMPT_VERSION = "1"
+
 
 def _build_schema_lines(generate_types: list[GenerateType]) -> list[str]:
     lines: list[str] = []
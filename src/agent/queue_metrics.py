@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from src.agent.job_scheduler import JOB_KINDS
+from src.agent.jobs import MaterialJobStore
+from src.config import settings
+from src.core.metrics import (
+    JOB_OLDEST_AGE_SECONDS,
+    JOB_QUEUE_LENGTH,
+    JOB_QUEUE_PENDING,
+    JOBS_SCHEDULED,
+    RESULT_CACHE_ENTRIES,
+    RESULT_CACHE_EVICTIONS,
+    RESULT_CACHE_LOOKUPS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueueMetricsExporter:
+    """Refreshes the queue and result cache gauges from Redis every `METRICS_QUEUE_REFRESH_SECONDS`.
+
+    Queue state is shared by all processes, so only processes that serve
+    metrics run one; scrapes then never wait on Redis.
+    """
+
+    def __init__(self, job_store: MaterialJobStore) -> None:
+        self._job_store = job_store
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="queue-metrics")
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def refresh(self) -> None:
+        stats = await self._job_store.queue_stats()
+        for stream_key, stream in stats["streams"].items():
+            JOB_QUEUE_LENGTH.labels(queue=stream_key).set(stream["length"])
+            JOB_QUEUE_PENDING.labels(queue=stream_key).set(stream["pending"])
+        for job_kind in JOB_KINDS:
+            JOBS_SCHEDULED.labels(job_kind=job_kind).set(stats["scheduled"][job_kind]["depth"])
+            JOB_OLDEST_AGE_SECONDS.labels(job_kind=job_kind).set(
+                await self._job_store.oldest_waiting_job_age(job_kind)
+            )
+        if settings.result_cache_enabled:
+            cache = await self._job_store.result_cache_stats()
+            RESULT_CACHE_LOOKUPS.labels(outcome="hit").set(cache["hits"])
+            RESULT_CACHE_LOOKUPS.labels(outcome="miss").set(cache["misses"])
+            RESULT_CACHE_EVICTIONS.set(cache["evictions"])
+            RESULT_CACHE_ENTRIES.set(cache["entries"])
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh queue metrics.")
+            await asyncio.sleep(settings.metrics_queue_refresh_seconds)
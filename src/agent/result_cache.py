@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import UTC, datetime
+
+from redis.asyncio import Redis as _Redis
+
+from src.agent.extraction_cache import EXTRACTOR_VERSION
+from src.agent.prompts import MATERIAL_PROMPT_VERSION
+from src.agent.types import MaterialGenerateResponse, MaterialUploadRequest
+from src.config import settings
+
+# Stores one entry and evicts the least recently used ones beyond the size
+# bound. KEYS: entry key, LRU sorted set. ARGV: payload, ttl, now, max_entries.
+_STORE_RESULT_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], KEYS[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', tonumber(ARGV[3]) - tonumber(ARGV[2]))
+local overflow = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4])
+if overflow <= 0 then
+    return 0
+end
+local evicted = redis.call('ZPOPMIN', KEYS[2], overflow)
+for i = 1, #evicted, 2 do
+    redis.call('DEL', evicted[i])
+end
+return overflow
+"""
+
+
+class GenerationResultCache:
+    """Content-addressed cache of material generation results.
+
+    Entries are keyed by the upload's SHA-256, the request fields that shape
+    the output, and the model/prompt configuration, so the same deck uploaded
+    by another teacher with the same options reuses the first result. Entries
+    expire after `RESULT_CACHE_TTL_SECONDS`; a sorted set of last-use times
+    keeps at most `RESULT_CACHE_MAX_ENTRIES` of them.
+    """
+
+    def __init__(self, redis: _Redis) -> None:
+        self._redis = redis
+        self._store_script = redis.register_script(_STORE_RESULT_LUA)
+
+    async def get(
+        self,
+        file_sha256: str,
+        request: MaterialUploadRequest,
+    ) -> MaterialGenerateResponse | None:
+        key = self._entry_key(result_cache_key(file_sha256, request))
+        payload = await self._redis.get(key)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            if payload is None:
+                pipe.hincrby(self._stats_key(), "misses", 1)
+            else:
+                pipe.hincrby(self._stats_key(), "hits", 1)
+                pipe.zadd(self._lru_key(), {key: _now()}, xx=True)
+                pipe.expire(key, settings.result_cache_ttl_seconds)
+            await pipe.execute()
+        if payload is None:
+            return None
+        return MaterialGenerateResponse.model_validate_json(payload)
+
+    async def put(
+        self,
+        file_sha256: str,
+        request: MaterialUploadRequest,
+        result: MaterialGenerateResponse,
+    ) -> None:
+        key = self._entry_key(result_cache_key(file_sha256, request))
+        # Ids and MCP calls belong to the original job and are rebuilt on reuse.
+        payload = result.model_dump_json(exclude={"tool_calls"})
+        evicted = await self._store_script(
+            keys=[key, self._lru_key()],
+            args=[
+                payload,
+                settings.result_cache_ttl_seconds,
+                _now(),
+                settings.result_cache_max_entries,
+            ],
+        )
+        if evicted:
+            await self._redis.hincrby(self._stats_key(), "evictions", int(evicted))
+
+    async def stats(self) -> dict[str, int]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._stats_key())
+            pipe.zcard(self._lru_key())
+            counters, entries = await pipe.execute()
+        return {
+            "hits": int(counters.get("hits", 0)),
+            "misses": int(counters.get("misses", 0)),
+            "evictions": int(counters.get("evictions", 0)),
+            "entries": int(entries),
+        }
+
+    @staticmethod
+    def _entry_key(digest: str) -> str:
+        return f"{settings.result_cache_prefix}{digest}"
+
+    @staticmethod
+    def _lru_key() -> str:
+        return f"{settings.result_cache_prefix}lru"
+
+    @staticmethod
+    def _stats_key() -> str:
+        return f"{settings.result_cache_prefix}stats"
+
+
+def result_cache_key(file_sha256: str, request: MaterialUploadRequest) -> str:
+    """Digest of everything that determines a generation result.
+
+    `user_id` and `mcp_enabled` only affect what happens to a result, and
+    counts of types that were not requested do not change the output.
+    """
+    types = sorted(request.generate_types)
+    fingerprint = {
+        "file_sha256": file_sha256,
+        "generate_types": types,
+        "mcq_count": request.mcq_count if "mcq" in types else None,
+        "essay_count": request.essay_count if "essay" in types else None,
+        "summary_max_words": request.summary_max_words if "summary" in types else None,
+        "prompt_version": MATERIAL_PROMPT_VERSION,
+        "model": settings.groq_model,
+        "temperature": settings.groq_temperature,
+        # The budget decides which pages of a long document the model sees.
+        "extraction": [EXTRACTOR_VERSION, settings.extraction_char_budget],
+        "rag": [
+            settings.rag_chunk_size,
+            settings.rag_chunk_overlap,
+            settings.rag_top_k,
+            settings.rag_fetch_k,
+            settings.rag_mmr_lambda,
+        ],
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _now() -> float:
+    return datetime.now(UTC).timestamp()
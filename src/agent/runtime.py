@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 from typing import Any
 
+from pydantic import BaseModel
+
+from src.agent.checkpoints import (
+    CheckpointStage,
+    ExtractionCheckpoint,
+    JobCheckpoints,
+    LkpdGenerationCheckpoint,
+    MaterialGenerationCheckpoint,
+    RagCheckpoint,
+    TCheckpoint,
+)
+from src.agent.executors import run_blocking
 from src.agent.infra.mcp_registry import MCPToolRegistry
 from src.agent.infra.memory_store import LongTermMemoryStore
-from src.agent.material_extractor import extract_material_text
+from src.agent.material_extractor import extract_material_text_async
 from src.agent.rag import MaterialRAGStore
 from src.agent.runtime_helpers.agent_factory import create_generation_agent
 from src.agent.runtime_helpers.contracts import (
@@ -37,6 +50,7 @@ from src.agent.runtime_helpers.rag_context import (
 )
 from src.agent.types import (
     GenerateType,
+    JobKind,
     LkpdGenerateRuntimeResult,
     LkpdGeneratedPayload,
     LkpdUploadRequest,
@@ -52,6 +66,7 @@ from src.agent.prompts import (
     build_material_generation_prompt,
 )
 from src.config import settings
+from src.core.metrics import observe_stage, record_validation_failures
 
 
 logger = logging.getLogger(__name__)
@@ -86,41 +101,96 @@ class AgentRuntime:
         self,
         *,
         request: MaterialUploadRequest,
-        file_bytes: bytes,
+        file_path: Path,
         filename: str,
         content_type: str | None,
+        file_sha256: str | None = None,
         document_id: str | None = None,
         job_id: str | None = None,
         requested_by_id: str | None = None,
+        checkpoints: JobCheckpoints | None = None,
     ) -> MaterialGenerateResponse:
         await self.initialize()
 
         max_bytes = settings.material_max_file_mb * 1024 * 1024
-        if len(file_bytes) > max_bytes:
+        if file_path.stat().st_size > max_bytes:
             raise MaterialTooLargeError(
                 f"File exceeds maximum size of {settings.material_max_file_mb} MB."
             )
 
-        warnings: list[str] = list(self._startup_warnings)
-
-        extracted_text, file_type, extract_warnings = extract_material_text(
-            filename=filename,
-            content_type=content_type,
-            payload=file_bytes,
+        doc_id = document_id or self._rag_store.new_document_id()
+        generated = await _load_checkpoint(
+            checkpoints, "generation", MaterialGenerationCheckpoint
         )
-        warnings.extend(extract_warnings)
+        if generated is None:
+            generated = await self._generate_material(
+                request=request,
+                file_path=file_path,
+                filename=filename,
+                content_type=content_type,
+                file_sha256=file_sha256,
+                doc_id=doc_id,
+                job_id=job_id,
+                checkpoints=checkpoints,
+            )
 
-        doc_id = document_id or self._rag_store.new_document_id()
-        rag_context, rag_sources, rag_warnings = self._build_rag_context(
-            user_id=request.user_id,
+        return await self._finish_material_upload(
+            request=request,
+            payload=generated.payload,
+            material=generated.material,
+            sources=generated.sources,
+            warnings=list(generated.warnings),
             document_id=doc_id,
-            filename=filename,
-            file_type=file_type,
-            extracted_text=extracted_text,
-            generate_types=request.generate_types,
+            job_id=job_id,
+            requested_by_id=requested_by_id,
         )
-        warnings.extend(rag_warnings)
 
+    async def _generate_material(
+        self,
+        *,
+        request: MaterialUploadRequest,
+        file_path: Path,
+        filename: str,
+        content_type: str | None,
+        file_sha256: str | None = None,
+        doc_id: str,
+        job_id: str | None,
+        checkpoints: JobCheckpoints | None,
+    ) -> MaterialGenerationCheckpoint:
+        rag = await _load_checkpoint(checkpoints, "rag", RagCheckpoint)
+        if rag is None:
+            extraction = await self._extract_stage(
+                job_kind="material",
+                file_path=file_path,
+                filename=filename,
+                content_type=content_type,
+                file_sha256=file_sha256,
+                checkpoints=checkpoints,
+            )
+            # Chroma and its ONNX embedder are process-local, so indexing runs in a
+            # thread (ONNX releases the GIL) rather than in the process pool.
+            rag_context, rag_sources, rag_warnings = await run_blocking(
+                self._build_rag_context,
+                user_id=request.user_id,
+                document_id=doc_id,
+                filename=filename,
+                file_type=extraction.file_type,
+                extracted_text=extraction.text,
+                generate_types=request.generate_types,
+            )
+            rag = RagCheckpoint(
+                material=MaterialInfo(
+                    filename=filename,
+                    file_type=extraction.file_type,
+                    extracted_chars=len(extraction.text),
+                ),
+                context=rag_context,
+                sources=rag_sources,
+                warnings=[*extraction.warnings, *rag_warnings],
+            )
+            await _save_checkpoint(checkpoints, "rag", rag)
+
+        warnings = list(rag.warnings)
         mcp_tools = await self._mcp_registry.load_tools()
         if request.mcp_enabled and self._mcp_registry.has_config and not mcp_tools:
             warnings.append("MCP is enabled, but no MCP tools are currently available.")
@@ -140,7 +210,7 @@ class AgentRuntime:
         # generation step is JSON-only; MCP tools are invoked programmatically afterward.
         agent = self._get_agent(tools=[])
         prompt = build_material_generation_prompt(
-            material_text=rag_context,
+            material_text=rag.context,
             generate_types=request.generate_types,
             mcq_count=request.mcq_count,
             essay_count=request.essay_count,
@@ -153,7 +223,8 @@ class AgentRuntime:
         }
         payload = {"messages": [{"role": "user", "content": prompt}]}
 
-        result = await agent.ainvoke(payload, config=config)
+        with observe_stage("material", "llm"):
+            result = await agent.ainvoke(payload, config=config)
         reply = self._extract_reply(result)
 
         parsed = self._try_parse_generated_payload(reply)
@@ -169,10 +240,11 @@ class AgentRuntime:
                 "Your previous answer was invalid. Return only valid JSON that matches the required schema.\n\n"
                 f"Invalid answer to repair:\n{reply}"
             )
-            retry_result = await agent.ainvoke(
-                {"messages": [{"role": "user", "content": retry_prompt}]},
-                config=config,
-            )
+            with observe_stage("material", "llm"):
+                retry_result = await agent.ainvoke(
+                    {"messages": [{"role": "user", "content": retry_prompt}]},
+                    config=config,
+                )
             retry_reply = self._extract_reply(retry_result)
             parsed = self._try_parse_generated_payload(retry_reply)
 
@@ -182,6 +254,9 @@ class AgentRuntime:
                 request.user_id,
                 self._preview_text(retry_reply if "retry_reply" in locals() else reply),
             )
+            record_validation_failures(
+                "material", [*warnings, "model_output_validation_failed:repair_parse"]
+            )
             raise MaterialValidationError(
                 "Model failed to produce valid JSON output after one retry."
             )
@@ -194,13 +269,102 @@ class AgentRuntime:
             summary_max_words=request.summary_max_words,
             warnings=warnings,
         )
+        record_validation_failures("material", warnings)
+        generated = MaterialGenerationCheckpoint(
+            material=rag.material,
+            payload=payload_out,
+            sources=rag.sources,
+            warnings=warnings,
+        )
+        await _save_checkpoint(checkpoints, "generation", generated)
+        return generated
+
+    async def _extract_stage(
+        self,
+        *,
+        job_kind: JobKind,
+        file_path: Path,
+        filename: str,
+        content_type: str | None,
+        file_sha256: str | None = None,
+        checkpoints: JobCheckpoints | None,
+    ) -> ExtractionCheckpoint:
+        extraction = await _load_checkpoint(checkpoints, "extraction", ExtractionCheckpoint)
+        if extraction is not None:
+            return extraction
+
+        with observe_stage(job_kind, "extraction"):
+            extracted_text, file_type, extract_warnings = await extract_material_text_async(
+                filename=filename,
+                content_type=content_type,
+                payload=file_path,
+                file_sha256=file_sha256,
+            )
+        extraction = ExtractionCheckpoint(
+            text=extracted_text,
+            file_type=file_type,
+            warnings=[*self._startup_warnings, *extract_warnings],
+        )
+        await _save_checkpoint(checkpoints, "extraction", extraction)
+        return extraction
+
+    async def invoke_cached_material_upload(
+        self,
+        *,
+        request: MaterialUploadRequest,
+        cached: MaterialGenerateResponse,
+        filename: str,
+        document_id: str | None = None,
+        job_id: str | None = None,
+        requested_by_id: str | None = None,
+    ) -> MaterialGenerateResponse:
+        """Reuse a previous result for identical content and parameters.
+
+        Extraction, indexing and generation are skipped; the MCP insert and
+        summary memory still run for this request's ids and user.
+        """
+        await self.initialize()
+
+        warnings = [
+            warning
+            for warning in cached.warnings
+            if not warning.startswith("mcp_insert_failed")
+        ]
+        warnings.append("result_cache_hit")
+        return await self._finish_material_upload(
+            request=request,
+            payload=MaterialGeneratedPayload(
+                mcq_quiz=cached.mcq_quiz,
+                essay_quiz=cached.essay_quiz,
+                summary=cached.summary,
+            ),
+            material=cached.material.model_copy(update={"filename": filename}),
+            sources=cached.sources,
+            warnings=warnings,
+            document_id=document_id or self._rag_store.new_document_id(),
+            job_id=job_id,
+            requested_by_id=requested_by_id,
+        )
+
+    async def _finish_material_upload(
+        self,
+        *,
+        request: MaterialUploadRequest,
+        payload: MaterialGeneratedPayload,
+        material: MaterialInfo,
+        sources: list[SourceRef],
+        warnings: list[str],
+        document_id: str,
+        job_id: str | None,
+        requested_by_id: str | None,
+    ) -> MaterialGenerateResponse:
         tool_calls: list[ToolCallLog] = []
 
         if request.mcp_enabled:
             missing_identifiers: list[str] = []
             if not job_id:
                 missing_identifiers.append("job_id")
-            if not doc_id:
+            if not document_id:
                 missing_identifiers.append("material_id")
             if not requested_by_id:
                 missing_identifiers.append("requested_by_id")
@@ -211,37 +375,35 @@ class AgentRuntime:
                     + ",".join(missing_identifiers)
                 )
             else:
-                mcp_tool_calls, mcp_warnings = await self._insert_material_payload_via_mcp(
-                    job_id=job_id,
-                    material_id=doc_id,
-                    requested_by_id=requested_by_id,
-                    payload=payload_out,
-                    requested_types=request.generate_types,
-                )
+                with observe_stage("material", "mcp_insert"):
+                    mcp_tool_calls, mcp_warnings = await self._insert_material_payload_via_mcp(
+                        job_id=job_id,
+                        material_id=document_id,
+                        requested_by_id=requested_by_id,
+                        payload=payload,
+                        requested_types=request.generate_types,
+                    )
                 tool_calls.extend(mcp_tool_calls)
                 warnings.extend(mcp_warnings)
 
-        if "summary" in request.generate_types and payload_out.summary is not None:
-            self._memory_store.remember_fact(
+        if "summary" in request.generate_types and payload.summary is not None:
+            await run_blocking(
+                self._memory_store.remember_fact,
                 user_id=request.user_id,
-                fact=payload_out.summary.overview,
+                fact=payload.summary.overview,
                 memory_type="material_summary",
                 source="uploaded_material",
-                extra_metadata={"filename": filename, "document_id": doc_id},
+                extra_metadata={"filename": material.filename, "document_id": document_id},
             )
 
         return MaterialGenerateResponse(
             user_id=request.user_id,
-            document_id=doc_id,
-            material=MaterialInfo(
-                filename=filename,
-                file_type=file_type,
-                extracted_chars=len(extracted_text),
-            ),
-            mcq_quiz=payload_out.mcq_quiz,
-            essay_quiz=payload_out.essay_quiz,
-            summary=payload_out.summary,
-            sources=rag_sources,
+            document_id=document_id,
+            material=material,
+            mcq_quiz=payload.mcq_quiz,
+            essay_quiz=payload.essay_quiz,
+            summary=payload.summary,
+            sources=sources,
             tool_calls=tool_calls,
             warnings=self._dedupe_warnings(warnings),
         )
@@ -250,42 +412,89 @@ class AgentRuntime:
         self,
         *,
         request: LkpdUploadRequest,
-        file_bytes: bytes,
+        file_path: Path,
         filename: str,
         content_type: str | None,
+        file_sha256: str | None = None,
         document_id: str | None = None,
         job_id: str | None = None,
+        checkpoints: JobCheckpoints | None = None,
     ) -> LkpdGenerateRuntimeResult:
         await self.initialize()
 
         max_bytes = settings.material_max_file_mb * 1024 * 1024
-        if len(file_bytes) > max_bytes:
+        if file_path.stat().st_size > max_bytes:
             raise MaterialTooLargeError(
                 f"File exceeds maximum size of {settings.material_max_file_mb} MB."
             )
 
-        warnings: list[str] = list(self._startup_warnings)
-        extracted_text, file_type, extract_warnings = extract_material_text(
-            filename=filename,
-            content_type=content_type,
-            payload=file_bytes,
-        )
-        warnings.extend(extract_warnings)
-
         doc_id = document_id or self._rag_store.new_document_id()
-        rag_context, rag_sources, rag_warnings = self._build_lkpd_rag_context(
-            user_id=request.user_id,
+        generated = await _load_checkpoint(checkpoints, "generation", LkpdGenerationCheckpoint)
+        if generated is None:
+            generated = await self._generate_lkpd(
+                request=request,
+                file_path=file_path,
+                filename=filename,
+                content_type=content_type,
+                file_sha256=file_sha256,
+                doc_id=doc_id,
+                checkpoints=checkpoints,
+            )
+
+        return LkpdGenerateRuntimeResult(
             document_id=doc_id,
-            filename=filename,
-            file_type=file_type,
-            extracted_text=extracted_text,
+            material=generated.material,
+            lkpd=generated.lkpd,
+            sources=generated.sources,
+            warnings=self._dedupe_warnings(generated.warnings),
         )
-        warnings.extend(rag_warnings)
 
+    async def _generate_lkpd(
+        self,
+        *,
+        request: LkpdUploadRequest,
+        file_path: Path,
+        filename: str,
+        content_type: str | None,
+        file_sha256: str | None = None,
+        doc_id: str,
+        checkpoints: JobCheckpoints | None,
+    ) -> LkpdGenerationCheckpoint:
+        rag = await _load_checkpoint(checkpoints, "rag", RagCheckpoint)
+        if rag is None:
+            extraction = await self._extract_stage(
+                job_kind="lkpd",
+                file_path=file_path,
+                filename=filename,
+                content_type=content_type,
+                file_sha256=file_sha256,
+                checkpoints=checkpoints,
+            )
+            rag_context, rag_sources, rag_warnings = await run_blocking(
+                self._build_lkpd_rag_context,
+                user_id=request.user_id,
+                document_id=doc_id,
+                filename=filename,
+                file_type=extraction.file_type,
+                extracted_text=extraction.text,
+            )
+            rag = RagCheckpoint(
+                material=MaterialInfo(
+                    filename=filename,
+                    file_type=extraction.file_type,
+                    extracted_chars=len(extraction.text),
+                ),
+                context=rag_context,
+                sources=rag_sources,
+                warnings=[*extraction.warnings, *rag_warnings],
+            )
+            await _save_checkpoint(checkpoints, "rag", rag)
+
+        warnings = list(rag.warnings)
         # LKPD upload flow is JSON generation-only; do not attach tool-calling tools.
         agent = self._get_agent(tools=[])
         prompt = build_lkpd_generation_prompt(
-            material_text=rag_context,
+            material_text=rag.context,
             activity_count=request.activity_count,
             context="",
         )
@@ -295,23 +504,27 @@ class AgentRuntime:
         }
         payload = {"messages": [{"role": "user", "content": prompt}]}
 
-        result = await agent.ainvoke(payload, config=config)
+        with observe_stage("lkpd", "llm"):
+            result = await agent.ainvoke(payload, config=config)
         reply = self._extract_reply(result)
 
         parsed = self._try_parse_lkpd_payload(reply)
         if parsed is None:
+            record_validation_failures("lkpd", ["model_output_validation_failed:initial_parse"])
             retry_prompt = (
                 f"{prompt}\n\n"
                 "Your previous answer was invalid. Return only valid JSON that matches the required schema."
             )
-            retry_result = await agent.ainvoke(
-                {"messages": [{"role": "user", "content": retry_prompt}]},
-                config=config,
-            )
+            with observe_stage("lkpd", "llm"):
+                retry_result = await agent.ainvoke(
+                    {"messages": [{"role": "user", "content": retry_prompt}]},
+                    config=config,
+                )
             retry_reply = self._extract_reply(retry_result)
             parsed = self._try_parse_lkpd_payload(retry_reply)
 
         if parsed is None:
+            record_validation_failures("lkpd", ["model_output_validation_failed:repair_parse"])
             raise LkpdValidationError(
                 "Model failed to produce valid LKPD JSON output after one retry."
             )
@@ -322,17 +535,15 @@ class AgentRuntime:
             warnings=warnings,
         )
 
-        return LkpdGenerateRuntimeResult(
-            document_id=doc_id,
-            material=MaterialInfo(
-                filename=filename,
-                file_type=file_type,
-                extracted_chars=len(extracted_text),
-            ),
+        record_validation_failures("lkpd", warnings)
+        generated = LkpdGenerationCheckpoint(
+            material=rag.material,
             lkpd=payload_out.lkpd,
-            sources=rag_sources,
-            warnings=self._dedupe_warnings(warnings),
+            sources=rag.sources,
+            warnings=warnings,
         )
+        await _save_checkpoint(checkpoints, "generation", generated)
+        return generated
 
     def _build_rag_context(
         self,
@@ -502,3 +713,21 @@ __all__ = [
     "MaterialTooLargeError",
 ]
 
+
+async def _load_checkpoint(
+    checkpoints: JobCheckpoints | None,
+    stage: CheckpointStage,
+    model_type: type[TCheckpoint],
+) -> TCheckpoint | None:
+    if checkpoints is None:
+        return None
+    return await checkpoints.load(stage, model_type)
+
+
+async def _save_checkpoint(
+    checkpoints: JobCheckpoints | None,
+    stage: CheckpointStage,
+    checkpoint: BaseModel,
+) -> None:
+    if checkpoints is not None:
+        await checkpoints.save(stage, checkpoint)
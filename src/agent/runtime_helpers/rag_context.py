@@ -3,7 +3,8 @@ from __future__ import annotations
 from typing import Any
 
 from src.agent.rag import MaterialRAGStore
-from src.agent.types import GenerateType, SourceRef
+from src.agent.types import GenerateType, JobKind, SourceRef
+from src.core.metrics import observe_stage
 
 
 def build_rag_context(
@@ -17,6 +18,7 @@ def build_rag_context(
     generate_types: list[GenerateType],
 ) -> tuple[str, list[SourceRef], list[str]]:
     return _build_context_from_queries(
+        job_kind="material",
         rag_store=rag_store,
         user_id=user_id,
         document_id=document_id,
@@ -40,6 +42,7 @@ def build_lkpd_rag_context(
     extracted_text: str,
 ) -> tuple[str, list[SourceRef], list[str]]:
     return _build_context_from_queries(
+        job_kind="lkpd",
         rag_store=rag_store,
         user_id=user_id,
         document_id=document_id,
@@ -79,6 +82,7 @@ def build_lkpd_rag_queries(extracted_text: str) -> list[str]:
 
 def _build_context_from_queries(
     *,
+    job_kind: JobKind,
     rag_store: MaterialRAGStore,
     user_id: str,
     document_id: str,
@@ -90,13 +94,14 @@ def _build_context_from_queries(
     warnings: list[str] = []
 
     try:
-        chunk_count, index_warnings = rag_store.index_material(
-            user_id=user_id,
-            document_id=document_id,
-            filename=filename,
-            file_type=file_type,
-            text=extracted_text,
-        )
+        with observe_stage(job_kind, "embedding"):
+            chunk_count, index_warnings = rag_store.index_material(
+                user_id=user_id,
+                document_id=document_id,
+                filename=filename,
+                file_type=file_type,
+                text=extracted_text,
+            )
         warnings.extend(index_warnings)
         if chunk_count <= 0:
             warnings.append(
@@ -107,11 +112,12 @@ def _build_context_from_queries(
         warnings.append(f"RAG indexing failed; using extracted text fallback: {exc}")
         return extracted_text, [], warnings
 
-    docs, retrieval_warnings = rag_store.retrieve_for_generation(
-        user_id=user_id,
-        document_id=document_id,
-        queries=queries,
-    )
+    with observe_stage(job_kind, "retrieval"):
+        docs, retrieval_warnings = rag_store.retrieve_for_generation(
+            user_id=user_id,
+            document_id=document_id,
+            queries=queries,
+        )
     warnings.extend(retrieval_warnings)
 
     if not docs:
@@ -72,16 +72,30 @@ class QueuedJob(BaseModel):
     user_id: str = Field(min_length=1)
     material_id: str | None = None
     requested_by_id: str | None = None
+    # Token subject of the API client that queued the job; only it may read the status.
+    submitted_by: str | None = None
     callback_url: AnyHttpUrl | None = None
     request_payload: dict[str, Any] = Field(default_factory=dict)
     filename: str = Field(min_length=1)
     content_type: str | None = None
-    file_b64: str = Field(min_length=1)
+    file_b64: str | None = None
+    file_sha256: str | None = None
+    file_size: int | None = Field(default=None, ge=0)
+    processing_attempts: int = Field(default=0, ge=0)
     callback_attempts: int = Field(default=0, ge=0)
+    callback_body: str | None = None
     created_at: datetime
     updated_at: datetime
     last_error: str | None = None
 
+    @model_validator(mode="after")
+    def validate_file_reference(self) -> "QueuedJob":
+        # Jobs reference uploads in the blob store; inline base64 is kept only so
+        # records written before the blob store existed can still be processed.
+        if not self.file_sha256 and not self.file_b64:
+            raise ValueError("Either file_sha256 or file_b64 is required.")
+        return self
+
     def parse_material_request(self) -> MaterialUploadRequest:
         return MaterialUploadRequest.model_validate(self.request_payload)
 
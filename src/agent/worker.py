@@ -5,19 +5,28 @@ import logging
 from datetime import UTC, datetime
 
 from src.agent.callback import WebhookCallbackClient
+from src.agent.executors import run_blocking
 from src.agent.jobs import MaterialJobStore
 from src.agent.lkpd_storage import LkpdFileStorage
 from src.agent.runtime import AgentRuntime
 from src.agent.types import QueuedJob
-from src.agent.worker_helpers.delivery import deliver_with_retry
+from src.agent.worker_helpers.delivery import (
+    DeliveryOutcome,
+    deliver_due_retries,
+    deliver_with_retry,
+)
 from src.agent.worker_helpers.job_handlers import (
     process_lkpd_job,
     process_material_job,
 )
+from src.config import settings
+from src.core.metrics import JOBS_IN_FLIGHT, JOBS_PROCESSED
 
 
 logger = logging.getLogger(__name__)
 
+_PROCESSING_RETRY_BATCH = 100
+
 
 class MaterialJobWorker:
     def __init__(
@@ -34,13 +43,24 @@ class MaterialJobWorker:
         self._lkpd_storage = lkpd_storage
         self._stop_event = asyncio.Event()
         self._task: asyncio.Task | None = None
+        self._lease_task: asyncio.Task | None = None
+        self._retry_task: asyncio.Task | None = None
+        self._processing_retry_task: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
         self._last_cleanup_at = datetime.now(UTC)
 
+    @property
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
+
     def start(self) -> None:
         if self._task and not self._task.done():
             return
         self._stop_event.clear()
         self._task = asyncio.create_task(self._run_loop())
+        self._lease_task = asyncio.create_task(self._renew_leases_loop())
+        self._retry_task = asyncio.create_task(self._callback_retry_loop())
+        self._processing_retry_task = asyncio.create_task(self._processing_retry_loop())
 
     async def stop(self) -> None:
         self._stop_event.set()
@@ -48,36 +68,169 @@ class MaterialJobWorker:
             return
         await self._task
         self._task = None
+        background = [
+            task
+            for task in (self._lease_task, self._retry_task, self._processing_retry_task)
+            if task is not None
+        ]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        self._lease_task = None
+        self._retry_task = None
+        self._processing_retry_task = None
 
     async def _run_loop(self) -> None:
+        # Jobs spend nearly all of their time waiting on LLM/callback I/O, so keep
+        # up to `worker_concurrency` of them in flight instead of one at a time.
+        slots = asyncio.Semaphore(settings.worker_concurrency)
         while not self._stop_event.is_set():
-            self._run_periodic_cleanup()
+            await self._run_periodic_cleanup()
+            if not await self._acquire_slot(slots):
+                break
+
             try:
                 job = await self._job_store.pop_next_job(timeout_seconds=1)
             except Exception:
+                slots.release()
                 logger.exception("Failed to pop job from queue.")
                 await asyncio.sleep(1)
                 continue
 
             if job is None:
+                slots.release()
                 continue
 
+            task = asyncio.create_task(self._run_job(job, slots))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+        await self._drain_in_flight()
+
+    async def _acquire_slot(self, slots: asyncio.Semaphore) -> bool:
+        if not slots.locked():
+            await slots.acquire()
+            return True
+
+        # All slots are busy: wait for one to free up, but wake immediately on stop().
+        acquire = asyncio.ensure_future(slots.acquire())
+        stop = asyncio.ensure_future(self._stop_event.wait())
+        await asyncio.wait({acquire, stop}, return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        if not acquire.done():
+            acquire.cancel()
+            await asyncio.gather(acquire, return_exceptions=True)
+        if acquire.cancelled():
+            return False
+        if self._stop_event.is_set():
+            slots.release()
+            return False
+        return True
+
+    async def _run_job(self, job: QueuedJob, slots: asyncio.Semaphore) -> None:
+        in_flight = JOBS_IN_FLIGHT.labels(job_kind=job.job_kind)
+        in_flight.inc()
+        try:
+            await self._process_job(job)
+            await self._job_store.ack_job(job.job_id)
+        except asyncio.CancelledError:
+            logger.warning("Job %s was cancelled before completion; requeueing.", job.job_id)
+            try:
+                await self._job_store.requeue_job(job.job_id)
+            except Exception:
+                logger.exception("Failed to requeue cancelled job %s", job.job_id)
+            raise
+        except Exception:
+            logger.exception("Unexpected worker failure while processing job %s", job.job_id)
+            # Leave the entry pending; another consumer reclaims it after the
+            # visibility timeout, bounded by JOB_MAX_DELIVERIES.
+            self._job_store.abandon_job(job.job_id)
+        finally:
+            in_flight.dec()
+            slots.release()
+
+    async def _renew_leases_loop(self) -> None:
+        # Keeps long LLM jobs from looking abandoned to other consumers.
+        interval = max(1, settings.job_visibility_timeout_seconds // 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._job_store.renew_leases()
+            except Exception:
+                logger.exception("Failed to renew job leases.")
+
+    async def _callback_retry_loop(self) -> None:
+        # Due retries are claimed with a lease, so cancelling mid-delivery on
+        # stop() only delays them until another worker picks them up.
+        while True:
+            try:
+                attempted = await deliver_due_retries(
+                    callback_client=self._callback_client,
+                    job_store=self._job_store,
+                    logger=logger,
+                )
+            except Exception:
+                logger.exception("Failed to deliver scheduled callback retries.")
+                attempted = 0
+            if not attempted:
+                await asyncio.sleep(settings.callback_retry_poll_seconds)
+
+    async def _processing_retry_loop(self) -> None:
+        # Promotion is a single Redis script, so every worker can run it.
+        while True:
             try:
-                await self._process_job(job)
+                promoted = await self._job_store.promote_due_processing_retries(
+                    limit=_PROCESSING_RETRY_BATCH
+                )
             except Exception:
-                logger.exception("Unexpected worker failure while processing job %s", job.job_id)
+                logger.exception("Failed to requeue due processing retries.")
+                promoted = 0
+            if promoted:
+                logger.info("Requeued %s job(s) for a processing retry.", promoted)
+            if promoted < _PROCESSING_RETRY_BATCH:
+                await asyncio.sleep(settings.job_retry_poll_seconds)
+
+    async def _drain_in_flight(self) -> None:
+        if not self._in_flight:
+            return
+
+        pending = set(self._in_flight)
+        logger.info("Waiting for %s in-flight job(s) to finish.", len(pending))
+        _, not_done = await asyncio.wait(
+            pending,
+            timeout=settings.worker_drain_timeout_seconds,
+        )
+        if not not_done:
+            return
+
+        logger.warning(
+            "Cancelling %s job(s) still running after %ss drain timeout.",
+            len(not_done),
+            settings.worker_drain_timeout_seconds,
+        )
+        for task in not_done:
+            task.cancel()
+        await asyncio.gather(*not_done, return_exceptions=True)
 
-    def _run_periodic_cleanup(self) -> None:
+    async def _run_periodic_cleanup(self) -> None:
         now = datetime.now(UTC)
         if (now - self._last_cleanup_at).total_seconds() < 60:
             return
         self._last_cleanup_at = now
+        # Both sweeps glob and unlink on disk; keep them off the event loop so
+        # in-flight jobs keep renewing leases and streaming callbacks.
         try:
-            removed = self._lkpd_storage.cleanup_expired_files()
+            removed = await run_blocking(self._lkpd_storage.cleanup_expired_files)
             if removed:
                 logger.info("Cleaned up %s expired LKPD PDF file(s).", removed)
         except Exception:
             logger.exception("Failed to cleanup expired LKPD files.")
+        try:
+            removed = await run_blocking(self._job_store.cleanup_expired_blobs)
+            if removed:
+                logger.info("Cleaned up %s expired upload blob(s).", removed)
+        except Exception:
+            logger.exception("Failed to cleanup expired upload blobs.")
 
     async def _process_job(self, job: QueuedJob) -> None:
         if job.job_kind == "material":
@@ -94,12 +247,12 @@ class MaterialJobWorker:
             job_store=self._job_store,
             job=job,
         )
-        delivered = await self._deliver_with_retry(job=job, payload=callback_payload)
-        if not delivered:
-            await self._job_store.update_job(
-                job.job_id,
-                status="failed_delivery",
-            )
+        if callback_payload is None:
+            JOBS_PROCESSED.labels(job_kind=job.job_kind, status="retry_scheduled").inc()
+            return
+        JOBS_PROCESSED.labels(job_kind=job.job_kind, status=callback_payload.status).inc()
+        outcome = await self._deliver_with_retry(job=job, payload=callback_payload)
+        await self._clear_checkpoints(job, callback_payload.status, outcome)
 
     async def _process_lkpd_job(self, job: QueuedJob) -> None:
         callback_payload = await process_lkpd_job(
@@ -108,14 +261,24 @@ class MaterialJobWorker:
             lkpd_storage=self._lkpd_storage,
             job=job,
         )
-        delivered = await self._deliver_with_retry(job=job, payload=callback_payload)
-        if not delivered:
-            await self._job_store.update_job(
-                job.job_id,
-                status="failed_delivery",
-            )
-
-    async def _deliver_with_retry(self, *, job: QueuedJob, payload: object) -> bool:
+        if callback_payload is None:
+            JOBS_PROCESSED.labels(job_kind=job.job_kind, status="retry_scheduled").inc()
+            return
+        JOBS_PROCESSED.labels(job_kind=job.job_kind, status=callback_payload.status).inc()
+        outcome = await self._deliver_with_retry(job=job, payload=callback_payload)
+        await self._clear_checkpoints(job, callback_payload.status, outcome)
+
+    async def _clear_checkpoints(
+        self, job: QueuedJob, status: str, outcome: DeliveryOutcome
+    ) -> None:
+        # Keep them while the job may still be processed again: after a
+        # processing failure or while its callback can end up dead-lettered.
+        if status == "succeeded" and outcome in ("delivered", "skipped"):
+            await self._job_store.clear_checkpoints(job.job_id)
+
+    async def _deliver_with_retry(
+        self, *, job: QueuedJob, payload: object
+    ) -> DeliveryOutcome:
         return await deliver_with_retry(
             callback_client=self._callback_client,
             job_store=self._job_store,
@@ -3,14 +3,18 @@ from __future__ import annotations
 import asyncio
 import logging
 import random
-from typing import Any
+from typing import Any, Literal
 
 import httpx
 
 from src.agent.callback import WebhookCallbackClient
 from src.agent.jobs import MaterialJobStore
-from src.agent.types import QueuedJob
+from src.agent.types import JobKind, QueuedJob
 from src.config import settings
+from src.core.metrics import CALLBACK_DELIVERIES, observe_stage
+
+
+DeliveryOutcome = Literal["delivered", "skipped", "scheduled", "failed"]
 
 
 async def deliver_with_retry(
@@ -20,85 +24,234 @@ async def deliver_with_retry(
     job: QueuedJob,
     payload: Any,
     logger: logging.Logger,
-) -> bool:
+) -> DeliveryOutcome:
+    """Make the first delivery attempt; retries go through the scheduled retry queue.
+
+    A retryable failure is handed to `job_store.schedule_callback_retry` instead of
+    sleeping here, so the worker slot is released as soon as the job is processed.
+    A final failure marks the job `failed_delivery` with its callback body kept.
+    """
     if not job.callback_url:
         logger.info(
             "Skipping callback delivery for job %s because callback_url is empty.",
             job.job_id,
         )
-        return True
+        CALLBACK_DELIVERIES.labels(job_kind=job.job_kind, outcome="skipped").inc()
+        return "skipped"
 
-    max_retries = settings.webhook_callback_max_retries
-    backoffs = list(settings.webhook_callback_backoff_seconds)
-    total_attempts = max_retries + 1
+    return await attempt_delivery(
+        callback_client=callback_client,
+        job_store=job_store,
+        job_id=job.job_id,
+        job_kind=job.job_kind,
+        callback_url=str(job.callback_url),
+        body=serialize_callback_payload(payload),
+        attempt=1,
+        logger=logger,
+    )
 
-    for attempt in range(1, total_attempts + 1):
-        payload.attempt = attempt
-        try:
-            await callback_client.send_json(
-                callback_url=str(job.callback_url),
-                payload=payload.model_dump(mode="json", exclude_none=True),
-            )
-            await job_store.update_job(
-                job.job_id,
-                callback_attempts=attempt,
-                clear_last_error=True,
-            )
-            return True
-        except Exception as exc:
-            error_message = _format_delivery_error(exc)
-            error_type = exc.__class__.__name__
-            retryable = _is_retryable_delivery_error(exc)
-            await job_store.update_job(
-                job.job_id,
-                callback_attempts=attempt,
-                last_error=error_message,
+
+def serialize_callback_payload(payload: Any) -> bytes:
+    """Serialize a callback payload once, without `attempt`; see `with_attempt`."""
+    return payload.model_dump_json(exclude_none=True, exclude={"attempt"}).encode()
+
+
+def with_attempt(body: bytes, attempt: int) -> bytes:
+    # Splices the per-attempt counter in front of the cached body instead of
+    # re-serializing the whole result for every retry.
+    prefix = b'{"attempt":%d' % attempt
+    if body == b"{}":
+        return prefix + b"}"
+    return prefix + b"," + body[1:]
+
+
+async def deliver_due_retries(
+    *,
+    callback_client: WebhookCallbackClient,
+    job_store: MaterialJobStore,
+    logger: logging.Logger,
+) -> int:
+    """Deliver every callback whose retry is due; return how many were attempted."""
+    job_ids = await job_store.claim_due_callback_retries(
+        limit=settings.callback_retry_batch_size
+    )
+    if not job_ids:
+        return 0
+
+    await asyncio.gather(
+        *(
+            _deliver_scheduled_retry(
+                callback_client=callback_client,
+                job_store=job_store,
+                job_id=job_id,
+                logger=logger,
             )
-            if attempt >= total_attempts or not retryable:
-                logger.warning(
-                    (
-                        "Callback delivery attempt %s/%s failed for job %s (%s). "
-                        "retryable=%s, error_type=%s, error=%s"
-                    ),
-                    attempt,
-                    total_attempts,
-                    job.job_id,
-                    job.callback_url,
-                    retryable,
-                    error_type,
-                    error_message,
-                )
-            else:
-                delay = backoffs[min(attempt - 1, len(backoffs) - 1)]
-                jitter = random.uniform(0, 0.5)
-                sleep_seconds = delay + jitter
-                logger.warning(
-                    (
-                        "Callback delivery attempt %s/%s failed for job %s (%s). "
-                        "retryable=%s, error_type=%s, next_retry_in=%.2fs, error=%s"
-                    ),
-                    attempt,
-                    total_attempts,
-                    job.job_id,
-                    job.callback_url,
-                    retryable,
-                    error_type,
-                    sleep_seconds,
-                    error_message,
-                )
-                await asyncio.sleep(sleep_seconds)
-                continue
-
-            if not retryable:
-                return False
-            logger.warning(
-                "Callback delivery exhausted for job %s after %s attempt(s).",
-                job.job_id,
-                attempt,
+            for job_id in job_ids
+        )
+    )
+    return len(job_ids)
+
+
+async def attempt_delivery(
+    *,
+    callback_client: WebhookCallbackClient,
+    job_store: MaterialJobStore,
+    job_id: str,
+    job_kind: JobKind,
+    callback_url: str,
+    body: bytes,
+    attempt: int,
+    logger: logging.Logger,
+) -> DeliveryOutcome:
+    outcome = await _attempt_delivery(
+        callback_client=callback_client,
+        job_store=job_store,
+        job_id=job_id,
+        job_kind=job_kind,
+        callback_url=callback_url,
+        body=body,
+        attempt=attempt,
+        logger=logger,
+    )
+    CALLBACK_DELIVERIES.labels(job_kind=job_kind, outcome=outcome).inc()
+    return outcome
+
+
+async def _attempt_delivery(
+    *,
+    callback_client: WebhookCallbackClient,
+    job_store: MaterialJobStore,
+    job_id: str,
+    job_kind: JobKind,
+    callback_url: str,
+    body: bytes,
+    attempt: int,
+    logger: logging.Logger,
+) -> DeliveryOutcome:
+    total_attempts = settings.webhook_callback_max_retries + 1
+    try:
+        with observe_stage(job_kind, "callback"):
+            await callback_client.send_body(
+                callback_url=callback_url,
+                body=with_attempt(body, attempt),
             )
-            return False
+        await job_store.update_job(
+            job_id,
+            callback_attempts=attempt,
+            clear_last_error=True,
+        )
+        return "delivered"
+    except Exception as exc:
+        error_message = _format_delivery_error(exc)
+        error_type = exc.__class__.__name__
+        retryable = _is_retryable_delivery_error(exc)
+        await job_store.update_job(
+            job_id,
+            callback_attempts=attempt,
+            last_error=error_message,
+        )
+
+    if attempt < total_attempts and retryable:
+        delay_seconds = _retry_delay_seconds(attempt)
+        logger.warning(
+            (
+                "Callback delivery attempt %s/%s failed for job %s (%s). "
+                "retryable=%s, error_type=%s, next_retry_in=%.2fs, error=%s"
+            ),
+            attempt,
+            total_attempts,
+            job_id,
+            callback_url,
+            retryable,
+            error_type,
+            delay_seconds,
+            error_message,
+        )
+        scheduled = await job_store.schedule_callback_retry(
+            job_id,
+            body=body.decode(),
+            delay_seconds=delay_seconds,
+        )
+        if scheduled:
+            return "scheduled"
+        logger.warning("Cannot schedule callback retry for job %s: job expired.", job_id)
+        return "failed"
+
+    logger.warning(
+        (
+            "Callback delivery attempt %s/%s failed for job %s (%s). "
+            "retryable=%s, error_type=%s, error=%s"
+        ),
+        attempt,
+        total_attempts,
+        job_id,
+        callback_url,
+        retryable,
+        error_type,
+        error_message,
+    )
+    if retryable:
+        logger.warning(
+            "Callback delivery exhausted for job %s after %s attempt(s).",
+            job_id,
+            attempt,
+        )
+    await _mark_failed_delivery(job_store, job_id, body)
+    return "failed"
+
+
+async def _mark_failed_delivery(
+    job_store: MaterialJobStore,
+    job_id: str,
+    body: bytes,
+) -> None:
+    # Keeps the generated result so the job can be re-delivered from the
+    # dead-letter index without running the LLM again.
+    await job_store.update_job(
+        job_id,
+        status="failed_delivery",
+        callback_body=body.decode(),
+    )
+
+
+async def _deliver_scheduled_retry(
+    *,
+    callback_client: WebhookCallbackClient,
+    job_store: MaterialJobStore,
+    job_id: str,
+    logger: logging.Logger,
+) -> None:
+    try:
+        job = await job_store.get_job(job_id)
+        if job is None or not job.callback_url or job.callback_body is None:
+            logger.warning("Dropping callback retry for job %s: nothing to deliver.", job_id)
+            await job_store.complete_callback_retry(job_id)
+            return
+
+        outcome = await attempt_delivery(
+            callback_client=callback_client,
+            job_store=job_store,
+            job_id=job_id,
+            job_kind=job.job_kind,
+            callback_url=str(job.callback_url),
+            body=job.callback_body.encode(),
+            attempt=job.callback_attempts + 1,
+            logger=logger,
+        )
+        if outcome != "scheduled":
+            await job_store.complete_callback_retry(job_id)
+        if outcome == "delivered" and job.status == "succeeded":
+            # Delivered at last: the job will not be processed again.
+            await job_store.clear_checkpoints(job_id)
+    except Exception:
+        # The claim lease expires and the retry becomes due again.
+        logger.exception("Scheduled callback retry failed for job %s", job_id)
+
 
-    return False
+def _retry_delay_seconds(attempt: int) -> float:
+    backoffs = list(settings.webhook_callback_backoff_seconds) or [0]
+    delay = backoffs[min(attempt - 1, len(backoffs) - 1)]
+    return delay + random.uniform(0, 0.5)
 
 
 def _is_retryable_delivery_error(exc: Exception) -> bool:
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
 import logging
+import random
 from datetime import UTC, datetime
 
+import groq
+import httpx
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from src.agent.checkpoints import JobCheckpoints, LkpdPdfCheckpoint
+from src.agent.executors import run_blocking, run_cpu_bound
 from src.agent.jobs import MaterialJobStore
 from src.agent.lkpd_pdf import render_lkpd_pdf
 from src.agent.lkpd_storage import LkpdFileStorage
@@ -20,6 +28,7 @@ from src.agent.types import (
     QueuedJob,
 )
 from src.config import settings
+from src.core.metrics import observe_stage
 
 logger = logging.getLogger(__name__)
 
@@ -29,21 +38,38 @@ async def process_material_job(
     runtime: AgentRuntime,
     job_store: MaterialJobStore,
     job: QueuedJob,
-) -> MaterialWebhookResultPayload:
+) -> MaterialWebhookResultPayload | None:
+    """Run a material job; None when a transient failure was queued for retry."""
     await job_store.update_job(job.job_id, status="processing")
     finished_at = datetime.now(UTC)
 
     try:
         request = job.parse_material_request()
-        result = await runtime.invoke_material_upload(
-            request=request,
-            file_bytes=job_store.decode_file_bytes(job),
-            filename=job.filename,
-            content_type=job.content_type,
-            job_id=job.job_id,
-            document_id=job.material_id,
-            requested_by_id=job.requested_by_id,
-        )
+        cached = await job_store.get_cached_result(job, request)
+        if cached is not None:
+            logger.info("Reusing cached generation result for job %s", job.job_id)
+            result = await runtime.invoke_cached_material_upload(
+                request=request,
+                cached=cached,
+                filename=job.filename,
+                job_id=job.job_id,
+                document_id=job.material_id,
+                requested_by_id=job.requested_by_id,
+            )
+        else:
+            async with job_store.spool_file(job) as file_path:
+                result = await runtime.invoke_material_upload(
+                    request=request,
+                    file_path=file_path,
+                    filename=job.filename,
+                    file_sha256=job.file_sha256,
+                    content_type=job.content_type,
+                    job_id=job.job_id,
+                    document_id=job.material_id,
+                    requested_by_id=job.requested_by_id,
+                    checkpoints=await job_store.checkpoints(job.job_id),
+                )
+            await job_store.cache_result(job, request, result)
         callback_payload = MaterialWebhookResultPayload(
             job_id=job.job_id,
             status="succeeded",
@@ -59,6 +85,8 @@ async def process_material_job(
         )
         return callback_payload
     except Exception as exc:
+        if await _retry_later(job_store, job, exc):
+            return None
         logger.exception("Material processing failed for job %s", job.job_id)
         callback_payload = MaterialWebhookResultPayload(
             job_id=job.job_id,
@@ -85,26 +113,37 @@ async def process_lkpd_job(
     job_store: MaterialJobStore,
     lkpd_storage: LkpdFileStorage,
     job: QueuedJob,
-) -> LkpdWebhookResultPayload:
+) -> LkpdWebhookResultPayload | None:
+    """Run an LKPD job; None when a transient failure was queued for retry."""
     await job_store.update_job(job.job_id, status="processing")
     finished_at = datetime.now(UTC)
 
     try:
         request = job.parse_lkpd_request()
-        runtime_result = await runtime.invoke_lkpd_upload(
-            request=request,
-            file_bytes=job_store.decode_file_bytes(job),
-            filename=job.filename,
-            content_type=job.content_type,
-            job_id=job.job_id,
-            document_id=job.material_id,
-        )
-        pdf_bytes = render_lkpd_pdf(
-            lkpd=runtime_result.lkpd,
-            material=runtime_result.material,
-            document_id=runtime_result.document_id,
-        )
-        stored_file = lkpd_storage.save_pdf(pdf_bytes)
+        checkpoints = await job_store.checkpoints(job.job_id)
+        async with job_store.spool_file(job) as file_path:
+            runtime_result = await runtime.invoke_lkpd_upload(
+                request=request,
+                file_path=file_path,
+                filename=job.filename,
+                file_sha256=job.file_sha256,
+                content_type=job.content_type,
+                job_id=job.job_id,
+                document_id=job.material_id,
+                checkpoints=checkpoints,
+            )
+        stored_file = await _load_stored_pdf(checkpoints, lkpd_storage)
+        if stored_file is None:
+            with observe_stage("lkpd", "pdf_render"):
+                pdf_bytes = await run_cpu_bound(
+                    render_lkpd_pdf,
+                    lkpd=runtime_result.lkpd,
+                    material=runtime_result.material,
+                    document_id=runtime_result.document_id,
+                )
+            saved = await run_blocking(lkpd_storage.save_pdf, pdf_bytes)
+            stored_file = LkpdPdfCheckpoint(file_id=saved.file_id, expires_at=saved.expires_at)
+            await checkpoints.save("lkpd_pdf", stored_file)
         base_url = settings.app_public_base_url.rstrip("/")
         pdf_url = f"{base_url}/api/lkpd/files/{stored_file.file_id}"
         callback_result = LkpdGenerateResult(
@@ -132,6 +171,8 @@ async def process_lkpd_job(
         )
         return callback_payload
     except Exception as exc:
+        if await _retry_later(job_store, job, exc):
+            return None
         logger.exception("LKPD processing failed for job %s", job.job_id)
         callback_payload = LkpdWebhookResultPayload(
             job_id=job.job_id,
@@ -152,6 +193,95 @@ async def process_lkpd_job(
         return callback_payload
 
 
+async def _load_stored_pdf(
+    checkpoints: JobCheckpoints,
+    lkpd_storage: LkpdFileStorage,
+) -> LkpdPdfCheckpoint | None:
+    stored = await checkpoints.load("lkpd_pdf", LkpdPdfCheckpoint)
+    if stored is None:
+        return None
+    # The rendered file may have expired or been cleaned up since.
+    path = await run_blocking(lkpd_storage.get_pdf_path, stored.file_id)
+    return stored if path is not None else None
+
+
+async def _retry_later(job_store: MaterialJobStore, job: QueuedJob, exc: Exception) -> bool:
+    """Requeue a transient failure with backoff while the job has retries left."""
+    if not is_transient_error(exc) or job.processing_attempts >= settings.job_retry_max_attempts:
+        return False
+    retry_no = job.processing_attempts + 1
+    delay_seconds = processing_retry_delay_seconds(retry_no)
+    try:
+        scheduled = await job_store.schedule_processing_retry(
+            job,
+            error=str(exc),
+            delay_seconds=delay_seconds,
+        )
+    except Exception:
+        logger.exception("Failed to schedule processing retry for job %s", job.job_id)
+        return False
+    if scheduled:
+        logger.warning(
+            "Transient failure of job %s; retry %s/%s in %.1fs: %s",
+            job.job_id,
+            retry_no,
+            settings.job_retry_max_attempts,
+            delay_seconds,
+            exc,
+        )
+    return scheduled
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether running the job again later may succeed.
+
+    Timeouts, dropped connections, throttling and provider 5xx are transient;
+    invalid uploads, model output that failed its repair retry and other
+    4xx responses are not. Wrapped exceptions are judged by their cause.
+    """
+    return _is_transient_error(exc, set())
+
+
+def _is_transient_error(exc: BaseException, seen: set[int]) -> bool:
+    # Exception chains can loop (an error raised while handling itself), so
+    # every exception is judged at most once.
+    if id(exc) in seen:
+        return False
+    seen.add(id(exc))
+    if isinstance(exc, (MaterialTooLargeError, MaterialValidationError, LkpdValidationError)):
+        return False
+    if isinstance(exc, BaseExceptionGroup):
+        # MCP sessions run in task groups, which wrap the underlying error.
+        return any(_is_transient_error(inner, seen) for inner in exc.exceptions)
+    if isinstance(
+        exc,
+        (
+            TimeoutError,
+            ConnectionError,
+            httpx.TransportError,
+            groq.APIConnectionError,
+            RedisConnectionError,
+            RedisTimeoutError,
+        ),
+    ):
+        return True
+    if isinstance(exc, (groq.APIStatusError, httpx.HTTPStatusError)):
+        status_code = exc.response.status_code
+        return status_code in {408, 425, 429} or 500 <= status_code <= 599
+    cause = exc.__cause__ or exc.__context__
+    return cause is not None and _is_transient_error(cause, seen)
+
+
+def processing_retry_delay_seconds(retry_no: int) -> float:
+    # Exponential backoff; the jitter spreads out jobs that failed together
+    # during a provider incident.
+    delay = min(
+        settings.job_retry_backoff_max_seconds,
+        settings.job_retry_backoff_seconds * 2 ** (retry_no - 1),
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
 def map_error_code(exc: Exception) -> str:
     message = str(exc).lower()
     if "tool_use_failed" in message:
@@ -1,21 +1,26 @@
 from src.api.job_submission import (
     build_job_accepted_response,
     enqueue_uploaded_job,
-    read_and_validate_upload,
+    store_validated_upload,
     validate_submit_request,
 )
+from src.api.admin_routes import build_admin_router
+from src.api.job_routes import build_job_router
 from src.api.material_routes import build_material_router
 from src.api.lkpd_routes import build_lkpd_router
 from src.api.oauth_routes import build_oauth_router
-from src.api.schemas import JobAcceptedData, OAuthTokenData
+from src.api.schemas import JobAcceptedData, JobStatusData, OAuthTokenData
 
 __all__ = [
     "JobAcceptedData",
+    "JobStatusData",
     "OAuthTokenData",
     "build_job_accepted_response",
     "enqueue_uploaded_job",
-    "read_and_validate_upload",
+    "store_validated_upload",
     "validate_submit_request",
+    "build_admin_router",
+    "build_job_router",
     "build_material_router",
     "build_lkpd_router",
     "build_oauth_router",
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from src.agent.jobs import MaterialJobStore
+from src.agent.types import JobKind, QueuedJob
+from src.auth import require_jwt
+from src.config import DEFAULT_JWT_REQUIRED_SCOPES, settings
+from src.core.api_response import ApiSuccessResponse, build_success_payload
+from src.api.schemas import (
+    DeadLetterItem,
+    DeadLetterListData,
+    DeadLetterReplayData,
+    DeadLetterReplayRequest,
+    DeadLetterReplaySkip,
+    DeadLetterStatus,
+)
+
+
+def _to_item(job: QueuedJob, failed_at: datetime) -> DeadLetterItem:
+    return DeadLetterItem(
+        job_id=job.job_id,
+        job_kind=job.job_kind,
+        status=job.status,
+        user_id=job.user_id,
+        callback_url=str(job.callback_url) if job.callback_url else None,
+        last_error=job.last_error,
+        callback_attempts=job.callback_attempts,
+        failed_at=failed_at,
+        has_result=job.callback_body is not None,
+    )
+
+
+async def _select_jobs(
+    job_store: MaterialJobStore,
+    replay: DeadLetterReplayRequest,
+) -> tuple[list[QueuedJob], list[DeadLetterReplaySkip]]:
+    if not replay.job_ids:
+        matched = await job_store.list_dead_letters(
+            replay.status,
+            since=replay.since,
+            until=replay.until,
+            host=replay.host,
+            job_kind=replay.job_kind,
+            limit=replay.limit,
+        )
+        return [job for job, _ in matched], []
+
+    jobs: list[QueuedJob] = []
+    skipped: list[DeadLetterReplaySkip] = []
+    for job_id in replay.job_ids[: replay.limit]:
+        job = await job_store.get_job(job_id)
+        if job is None:
+            skipped.append(DeadLetterReplaySkip(job_id=job_id, reason="not_found"))
+        elif job.status != replay.status:
+            skipped.append(DeadLetterReplaySkip(job_id=job_id, reason=f"status_{job.status}"))
+        else:
+            jobs.append(job)
+    return jobs, skipped
+
+
+def build_admin_router(job_store: MaterialJobStore) -> APIRouter:
+    router = APIRouter(tags=["admin"])
+    # A custom JWT_REQUIRED_SCOPES without this route must not open it to every client.
+    dlq_scopes = list(
+        settings.jwt_required_scopes.get(
+            "/api/admin/dead-letters",
+            DEFAULT_JWT_REQUIRED_SCOPES["/api/admin/dead-letters"],
+        )
+    )
+
+    @router.get(
+        "/api/admin/dead-letters",
+        response_model=ApiSuccessResponse[DeadLetterListData],
+        response_model_exclude_none=True,
+        dependencies=[Depends(require_jwt(dlq_scopes))],
+    )
+    async def list_dead_letters(
+        http_request: Request,
+        status: DeadLetterStatus = Query(...),
+        host: str | None = Query(default=None, min_length=1),
+        job_kind: JobKind | None = Query(default=None),
+        since: datetime | None = Query(default=None),
+        until: datetime | None = Query(default=None),
+        limit: int = Query(default=100, ge=1, le=1000),
+    ) -> ApiSuccessResponse[DeadLetterListData]:
+        matched = await job_store.list_dead_letters(
+            status,
+            since=since,
+            until=until,
+            host=host,
+            job_kind=job_kind,
+            limit=limit,
+        )
+        return build_success_payload(
+            http_request,
+            data=DeadLetterListData(
+                items=[_to_item(job, failed_at) for job, failed_at in matched],
+                counts=await job_store.dead_letter_counts(),
+            ),
+            message="Dead-letter jobs listed.",
+        )
+
+    @router.post(
+        "/api/admin/dead-letters/replay",
+        response_model=ApiSuccessResponse[DeadLetterReplayData],
+        response_model_exclude_none=True,
+        status_code=202,
+        dependencies=[Depends(require_jwt(dlq_scopes))],
+    )
+    async def replay_dead_letters(
+        http_request: Request,
+        replay: DeadLetterReplayRequest,
+    ) -> ApiSuccessResponse[DeadLetterReplayData]:
+        jobs, skipped = await _select_jobs(job_store, replay)
+        replayed: list[str] = []
+        for job in jobs:
+            if await _replay(job_store, job, replay.action):
+                replayed.append(job.job_id)
+                continue
+            # Missing stored result/upload, or another replay claimed it first.
+            skipped.append(DeadLetterReplaySkip(job_id=job.job_id, reason="not_replayable"))
+
+        return build_success_payload(
+            http_request,
+            data=DeadLetterReplayData(
+                action=replay.action,
+                replayed=replayed,
+                skipped=skipped,
+            ),
+            message=f"{len(replayed)} dead-letter job(s) queued for {replay.action}.",
+        )
+
+    return router
+
+
+async def _replay(
+    job_store: MaterialJobStore,
+    job: QueuedJob,
+    action: Literal["redeliver", "reprocess"],
+) -> bool:
+    if action == "redeliver":
+        return await job_store.redeliver_dead_letter(job)
+    return await job_store.reprocess_dead_letter(job)
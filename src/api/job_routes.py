@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from src.agent.jobs import MaterialJobStore
+from src.agent.types import JobStatus, QueuedJob
+from src.auth import require_jwt
+from src.config import DEFAULT_JWT_REQUIRED_SCOPES, settings
+from src.core.api_response import ApiSuccessResponse, build_success_payload
+from src.core.exceptions import ServiceError
+from src.api.schemas import JobStatusData
+
+# Processing is over in these states; callback retries of a succeeded job only
+# show up as `callback_attempts` / `last_error` changes (or `failed_delivery`).
+FINAL_JOB_STATUSES: tuple[JobStatus, ...] = (
+    "succeeded",
+    "failed_processing",
+    "failed_delivery",
+)
+
+
+def _to_status(job: QueuedJob) -> JobStatusData:
+    return JobStatusData(
+        job_id=job.job_id,
+        job_kind=job.job_kind,
+        status=job.status,
+        processing_attempts=job.processing_attempts,
+        callback_attempts=job.callback_attempts,
+        last_error=job.last_error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+async def _wait_for_update(
+    job_store: MaterialJobStore,
+    job_id: str,
+    *,
+    since: datetime,
+    wait_seconds: float,
+) -> QueuedJob | None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_seconds
+    async with job_store.watch_job(job_id) as changed:
+        while True:
+            changed.clear()
+            job = await job_store.get_job(job_id)
+            remaining = deadline - loop.time()
+            if (
+                job is None
+                or job.updated_at > since
+                or job.status in FINAL_JOB_STATUSES
+                or remaining <= 0
+            ):
+                return job
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def _job_events(job_store: MaterialJobStore, job_id: str) -> AsyncIterator[str]:
+    last_seen: datetime | None = None
+    async with job_store.watch_job(job_id) as changed:
+        while True:
+            changed.clear()
+            job = await job_store.get_job(job_id)
+            if job is None:
+                yield "event: expired\ndata: {}\n\n"
+                return
+            if job.updated_at != last_seen:
+                last_seen = job.updated_at
+                yield f"event: status\ndata: {_to_status(job).model_dump_json()}\n\n"
+            if job.status in FINAL_JOB_STATUSES:
+                return
+            try:
+                await asyncio.wait_for(
+                    changed.wait(),
+                    timeout=settings.job_events_keepalive_seconds,
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+
+def build_job_router(job_store: MaterialJobStore) -> APIRouter:
+    router = APIRouter(tags=["jobs"])
+    # A custom JWT_REQUIRED_SCOPES without this route must not open it to every client.
+    job_scopes = list(
+        settings.jwt_required_scopes.get(
+            "/api/jobs/{job_id}", DEFAULT_JWT_REQUIRED_SCOPES["/api/jobs/{job_id}"]
+        )
+    )
+
+    async def load_job(job_id: str, claims: dict[str, Any]) -> QueuedJob:
+        job = await job_store.get_job(job_id)
+        # jobs:read is a default scope, so every client holds it; a job is only
+        # visible to the client that submitted it. Another client's job answers
+        # exactly like a missing one.
+        subject = claims.get("sub")
+        if job is None or (job.submitted_by and subject and job.submitted_by != subject):
+            raise ServiceError("Job not found or expired.", status_code=404)
+        return job
+
+    @router.get(
+        "/api/jobs/{job_id}",
+        response_model=ApiSuccessResponse[JobStatusData],
+        response_model_exclude_none=True,
+    )
+    async def get_job_status(
+        http_request: Request,
+        job_id: str,
+        claims: dict[str, Any] = Depends(require_jwt(job_scopes)),
+        wait: int = Query(default=0, ge=0),
+        since: datetime | None = Query(default=None),
+    ) -> ApiSuccessResponse[JobStatusData]:
+        job = await load_job(job_id, claims)
+        wait_seconds = min(wait, settings.job_status_max_wait_seconds)
+        if since is not None and wait_seconds > 0:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=UTC)
+            job = await _wait_for_update(
+                job_store,
+                job_id,
+                since=since,
+                wait_seconds=wait_seconds,
+            )
+            if job is None:
+                raise ServiceError("Job not found or expired.", status_code=404)
+        return build_success_payload(http_request, data=_to_status(job))
+
+    @router.get(
+        "/api/jobs/{job_id}/events",
+    )
+    async def stream_job_events(
+        job_id: str,
+        claims: dict[str, Any] = Depends(require_jwt(job_scopes)),
+    ) -> StreamingResponse:
+        await load_job(job_id, claims)
+        return StreamingResponse(
+            _job_events(job_store, job_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return router
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
+from collections.abc import AsyncIterator
 from typing import TypeVar
 
 from fastapi import Request, UploadFile
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
-from src.agent.jobs import MaterialJobStore
+from src.agent.blob_store import StoredBlob
+from src.agent.jobs import JobSubmission, MaterialJobStore
 from src.agent.types import JobKind
 from src.config import settings
 from src.core.api_response import ApiSuccessResponse, build_success_payload
@@ -18,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 TSubmitModel = TypeVar("TSubmitModel", bound=BaseModel)
 
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
 
 def validate_submit_request(model_type: type[TSubmitModel], **kwargs: object) -> TSubmitModel:
     try:
@@ -30,29 +35,101 @@ def validate_submit_request(model_type: type[TSubmitModel], **kwargs: object) ->
         ) from exc
 
 
-async def read_and_validate_upload(file: UploadFile) -> tuple[bytes, str]:
-    file_bytes = await file.read()
-    if len(file_bytes) == 0:
+def validate_submit_batch(
+    model_type: type[TSubmitModel],
+    raw_items: str,
+    *,
+    field_name: str = "items",
+) -> list[TSubmitModel]:
+    """Parse a JSON array form field into submit models, reporting errors per index."""
+    try:
+        return TypeAdapter(list[model_type]).validate_json(raw_items)
+    except ValidationError as exc:
+        details = [
+            {**error, "loc": ["body", field_name, *error.get("loc", ())]}
+            for error in exc.errors(include_url=False)
+        ]
+        raise ServiceError(
+            "Request validation failed.",
+            status_code=422,
+            details=details,
+        ) from exc
+
+
+async def store_validated_upload(
+    file: UploadFile,
+    *,
+    job_store: MaterialJobStore,
+    loc: list[str | int] | None = None,
+) -> tuple[StoredBlob, str]:
+    """Stream an upload into job storage, enforcing the size cap chunk by chunk."""
+    if file.size is not None and file.size > _max_upload_bytes():
+        raise _file_too_large_error()
+    blob = await job_store.store_upload(_iter_upload_chunks(file, loc=loc))
+    return blob, (file.filename or "uploaded_material")
+
+
+async def _iter_upload_chunks(
+    file: UploadFile,
+    *,
+    loc: list[str | int] | None,
+) -> AsyncIterator[bytes]:
+    max_bytes = _max_upload_bytes()
+    received = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        received += len(chunk)
+        if received > max_bytes:
+            raise _file_too_large_error()
+        yield chunk
+
+    if received == 0:
         raise ServiceError(
             "Request validation failed.",
             status_code=422,
             details=[
                 {
                     "type": "value_error",
-                    "loc": ["body", "file"],
+                    "loc": loc or ["body", "file"],
                     "msg": "Uploaded file must not be empty.",
                     "input": "",
                 }
             ],
         )
 
-    max_bytes = settings.material_max_file_mb * 1024 * 1024
-    if len(file_bytes) > max_bytes:
-        raise ServiceError(
-            f"File exceeds maximum size of {settings.material_max_file_mb} MB.",
-            status_code=413,
-        )
-    return file_bytes, (file.filename or "uploaded_material")
+
+def _max_upload_bytes() -> int:
+    return settings.material_max_file_mb * 1024 * 1024
+
+
+def _file_too_large_error() -> ServiceError:
+    return ServiceError(
+        f"File exceeds maximum size of {settings.material_max_file_mb} MB.",
+        status_code=413,
+    )
+
+
+async def ensure_admitted(
+    *,
+    job_store: MaterialJobStore,
+    job_kind: JobKind,
+    submit_requests: list[BaseModel],
+) -> None:
+    """Reject submissions the queue could not finish before their jobs expire."""
+    tenants = Counter(str(getattr(item, "user_id")) for item in submit_requests)
+    rejection = await job_store.check_admission(job_kind, dict(tenants))
+    if rejection is None:
+        return
+    raise ServiceError(
+        rejection.message,
+        # A single tenant over its share should back off; a saturated queue is
+        # a temporary outage for everyone.
+        status_code=429 if rejection.reason == "tenant_backlog" else 503,
+        details={
+            "reason": rejection.reason,
+            "retry_after_seconds": rejection.retry_after_seconds,
+        },
+        headers={"Retry-After": str(rejection.retry_after_seconds)},
+    )
 
 
 async def enqueue_uploaded_job(
@@ -63,16 +140,66 @@ async def enqueue_uploaded_job(
     file: UploadFile,
     failure_log_message: str,
     failure_public_message: str,
+    submitted_by: str | None = None,
 ) -> str:
-    file_bytes, filename = await read_and_validate_upload(file)
     try:
+        await ensure_admitted(
+            job_store=job_store,
+            job_kind=job_kind,
+            submit_requests=[submit_request],
+        )
+        blob, filename = await store_validated_upload(file, job_store=job_store)
         return await job_store.enqueue_job(
             job_kind=job_kind,
             request=submit_request,
-            file_bytes=file_bytes,
+            blob=blob,
             filename=filename,
             content_type=file.content_type,
+            submitted_by=submitted_by,
+        )
+    except ServiceError:
+        raise
+    except Exception as exc:
+        logger.exception(failure_log_message)
+        raise ServiceError(f"{failure_public_message}: {exc}", status_code=503) from exc
+
+
+async def enqueue_uploaded_jobs(
+    *,
+    job_store: MaterialJobStore,
+    job_kind: JobKind,
+    submit_requests: list[BaseModel],
+    files: list[UploadFile],
+    failure_log_message: str,
+    failure_public_message: str,
+    submitted_by: str | None = None,
+) -> list[str]:
+    try:
+        await ensure_admitted(
+            job_store=job_store,
+            job_kind=job_kind,
+            submit_requests=submit_requests,
         )
+        submissions: list[JobSubmission] = []
+        for index, (submit_request, file) in enumerate(zip(submit_requests, files)):
+            blob, filename = await store_validated_upload(
+                file,
+                job_store=job_store,
+                loc=["body", "files", index],
+            )
+            submissions.append(
+                JobSubmission(
+                    job_kind=job_kind,
+                    request=submit_request,
+                    blob=blob,
+                    filename=filename,
+                    content_type=file.content_type,
+                    submitted_by=submitted_by,
+                )
+            )
+        return await job_store.enqueue_jobs(submissions)
+    except ServiceError:
+        raise
     except Exception as exc:
         logger.exception(failure_log_message)
         raise ServiceError(f"{failure_public_message}: {exc}", status_code=503) from exc
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 from fastapi.responses import FileResponse
 
@@ -30,10 +32,10 @@ def build_lkpd_router(job_store: MaterialJobStore, lkpd_storage: LkpdFileStorage
         response_model=ApiSuccessResponse[JobAcceptedData],
         response_model_exclude_none=True,
         status_code=202,
-        dependencies=[Depends(require_jwt(lkpd_scopes))],
     )
     async def webhook_lkpd(
         http_request: Request,
+        claims: dict[str, Any] = Depends(require_jwt(lkpd_scopes)),
         user_id: str = Form(...),
         file: UploadFile = File(...),
         callback_url: str = Form(...),
@@ -52,6 +54,7 @@ def build_lkpd_router(job_store: MaterialJobStore, lkpd_storage: LkpdFileStorage
             file=file,
             failure_log_message="Failed to enqueue LKPD job",
             failure_public_message="Failed to enqueue LKPD job",
+            submitted_by=claims.get("sub"),
         )
         return build_job_accepted_response(
             request=http_request,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 
@@ -9,12 +9,15 @@ from src.agent.types import GenerateType, MaterialAsyncSubmitRequest
 from src.auth import require_jwt
 from src.config import settings
 from src.core.api_response import ApiSuccessResponse, build_success_payload
+from src.core.exceptions import ServiceError
 from src.api.job_submission import (
     build_job_accepted_response,
     enqueue_uploaded_job,
+    enqueue_uploaded_jobs,
+    validate_submit_batch,
     validate_submit_request,
 )
-from src.api.schemas import JobAcceptedData
+from src.api.schemas import JobAcceptedData, JobBatchAcceptedData
 
 
 GENERATION_MESSAGE: dict[GenerateType, str] = {
@@ -59,6 +62,7 @@ async def _enqueue_from_submit_request(
     submit_request: MaterialAsyncSubmitRequest,
     file: UploadFile,
     message: str,
+    submitted_by: str | None,
 ) -> ApiSuccessResponse[JobAcceptedData]:
     job_id = await enqueue_uploaded_job(
         job_store=job_store,
@@ -67,6 +71,7 @@ async def _enqueue_from_submit_request(
         file=file,
         failure_log_message="Failed to enqueue material job",
         failure_public_message="Failed to enqueue material job",
+        submitted_by=submitted_by,
     )
     return build_job_accepted_response(
         request=request,
@@ -90,6 +95,7 @@ async def enqueue_material_job(
     essay_count: int | None,
     summary_max_words: int | None,
     mcp_enabled: bool,
+    submitted_by: str | None,
 ) -> ApiSuccessResponse[JobAcceptedData]:
     submit_request = _build_submit_request(
         user_id=user_id,
@@ -113,15 +119,63 @@ async def enqueue_material_job(
         submit_request=submit_request,
         message=GENERATION_MESSAGE[generate_type],
         file=file,
+        submitted_by=submitted_by,
     )
 
 
+def _validate_batch_shape(
+    submit_requests: list[MaterialAsyncSubmitRequest],
+    files: list[UploadFile],
+) -> None:
+    problems: list[dict[str, object]] = []
+    if not submit_requests:
+        problems.append({"loc": ["body", "items"], "msg": "Batch must contain at least one item."})
+    if len(submit_requests) > settings.material_batch_max_items:
+        problems.append(
+            {
+                "loc": ["body", "items"],
+                "msg": f"Batch must not exceed {settings.material_batch_max_items} items.",
+            }
+        )
+    if len(files) != len(submit_requests):
+        problems.append(
+            {
+                "loc": ["body", "files"],
+                "msg": (
+                    f"Expected {len(submit_requests)} file(s) to match items, "
+                    f"got {len(files)}."
+                ),
+            }
+        )
+
+    seen: set[str] = set()
+    for index, submit_request in enumerate(submit_requests):
+        if submit_request.job_id in seen:
+            problems.append(
+                {
+                    "loc": ["body", "items", index, "job_id"],
+                    "msg": f"Duplicate job_id '{submit_request.job_id}' in batch.",
+                }
+            )
+        seen.add(submit_request.job_id)
+
+    if problems:
+        raise ServiceError(
+            "Request validation failed.",
+            status_code=422,
+            details=[{"type": "value_error", **problem} for problem in problems],
+        )
+
+
 def build_material_router(job_store: MaterialJobStore) -> APIRouter:
     router = APIRouter(tags=["material"])
     material_scopes = list(settings.jwt_required_scopes.get("/api/material", ()))
     mcq_scopes = list(settings.jwt_required_scopes.get("/api/mcq", material_scopes))
     essay_scopes = list(settings.jwt_required_scopes.get("/api/essay", material_scopes))
     summary_scopes = list(settings.jwt_required_scopes.get("/api/summary", material_scopes))
+    batch_scopes = list(
+        settings.jwt_required_scopes.get("/api/material/batch", material_scopes)
+    )
 
     @router.get("/")
     async def root_health_check(
@@ -138,10 +192,10 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
         response_model=ApiSuccessResponse[JobAcceptedData],
         response_model_exclude_none=True,
         status_code=202,
-        dependencies=[Depends(require_jwt(material_scopes))],
     )
     async def webhook_material(
         http_request: Request,
+        claims: dict[str, Any] = Depends(require_jwt(material_scopes)),
         user_id: str = Form(...),
         job_id: str = Form(...),
         material_id: str = Form(...),
@@ -172,6 +226,39 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
             submit_request=submit_request,
             file=file,
             message="Material queued for async processing.",
+            submitted_by=claims.get("sub"),
+        )
+
+    @router.post(
+        "/api/material/batch",
+        response_model=ApiSuccessResponse[JobBatchAcceptedData],
+        response_model_exclude_none=True,
+        status_code=202,
+    )
+    async def webhook_material_batch(
+        http_request: Request,
+        claims: dict[str, Any] = Depends(require_jwt(batch_scopes)),
+        items: str = Form(...),
+        files: list[UploadFile] = File(...),
+    ) -> ApiSuccessResponse[JobBatchAcceptedData]:
+        # `items` is a JSON array of /api/material form fields; items[i] describes files[i].
+        submit_requests = validate_submit_batch(MaterialAsyncSubmitRequest, items)
+        _validate_batch_shape(submit_requests, files)
+        job_ids = await enqueue_uploaded_jobs(
+            job_store=job_store,
+            job_kind="material",
+            submit_requests=submit_requests,
+            files=files,
+            failure_log_message="Failed to enqueue material batch",
+            failure_public_message="Failed to enqueue material batch",
+            submitted_by=claims.get("sub"),
+        )
+        return build_success_payload(
+            http_request,
+            data=JobBatchAcceptedData(
+                jobs=[JobAcceptedData(job_id=job_id) for job_id in job_ids]
+            ),
+            message=f"{len(job_ids)} material job(s) queued for async processing.",
         )
 
     @router.post(
@@ -179,10 +266,10 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
         response_model=ApiSuccessResponse[JobAcceptedData],
         response_model_exclude_none=True,
         status_code=202,
-        dependencies=[Depends(require_jwt(mcq_scopes))],
     )
     async def webhook_mcq(
         http_request: Request,
+        claims: dict[str, Any] = Depends(require_jwt(mcq_scopes)),
         user_id: str = Form(...),
         job_id: str = Form(...),
         material_id: str = Form(...),
@@ -206,6 +293,7 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
             essay_count=None,
             summary_max_words=None,
             mcp_enabled=mcp_enabled,
+            submitted_by=claims.get("sub"),
         )
 
     @router.post(
@@ -213,10 +301,10 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
         response_model=ApiSuccessResponse[JobAcceptedData],
         response_model_exclude_none=True,
         status_code=202,
-        dependencies=[Depends(require_jwt(essay_scopes))],
     )
     async def webhook_essay(
         http_request: Request,
+        claims: dict[str, Any] = Depends(require_jwt(essay_scopes)),
         user_id: str = Form(...),
         job_id: str = Form(...),
         material_id: str = Form(...),
@@ -240,6 +328,7 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
             essay_count=essay_count,
             summary_max_words=None,
             mcp_enabled=mcp_enabled,
+            submitted_by=claims.get("sub"),
         )
 
     @router.post(
@@ -247,10 +336,10 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
         response_model=ApiSuccessResponse[JobAcceptedData],
         response_model_exclude_none=True,
         status_code=202,
-        dependencies=[Depends(require_jwt(summary_scopes))],
     )
     async def webhook_summary(
         http_request: Request,
+        claims: dict[str, Any] = Depends(require_jwt(summary_scopes)),
         user_id: str = Form(...),
         job_id: str = Form(...),
         material_id: str = Form(...),
@@ -274,6 +363,7 @@ def build_material_router(job_store: MaterialJobStore) -> APIRouter:
             essay_count=None,
             summary_max_words=summary_max_words,
             mcp_enabled=mcp_enabled,
+            submitted_by=claims.get("sub"),
         )
 
     return router
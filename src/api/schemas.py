@@ -1,17 +1,77 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from src.agent.types import JobKind, JobStatus
+
 
 class JobAcceptedData(BaseModel):
     job_id: str = Field(min_length=1)
     status: Literal["accepted"] = "accepted"
 
 
+class JobBatchAcceptedData(BaseModel):
+    jobs: list[JobAcceptedData]
+
+
+class JobStatusData(BaseModel):
+    job_id: str
+    job_kind: JobKind
+    status: JobStatus
+    processing_attempts: int
+    callback_attempts: int
+    last_error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class OAuthTokenData(BaseModel):
     access_token: str = Field(min_length=1)
     token_type: str = "Bearer"
     expires_in: int = Field(ge=1)
     scope: str
+
+
+DeadLetterStatus = Literal["failed_processing", "failed_delivery"]
+
+
+class DeadLetterItem(BaseModel):
+    job_id: str
+    job_kind: JobKind
+    status: DeadLetterStatus
+    user_id: str
+    callback_url: str | None = None
+    last_error: str | None = None
+    callback_attempts: int
+    failed_at: datetime
+    has_result: bool
+
+
+class DeadLetterListData(BaseModel):
+    items: list[DeadLetterItem]
+    counts: dict[str, int]
+
+
+class DeadLetterReplayRequest(BaseModel):
+    status: DeadLetterStatus
+    action: Literal["redeliver", "reprocess"]
+    host: str | None = Field(default=None, min_length=1)
+    job_kind: JobKind | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    job_ids: list[str] | None = None
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class DeadLetterReplaySkip(BaseModel):
+    job_id: str
+    reason: str
+
+
+class DeadLetterReplayData(BaseModel):
+    action: Literal["redeliver", "reprocess"]
+    replayed: list[str]
+    skipped: list[DeadLetterReplaySkip]
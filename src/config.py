@@ -55,6 +55,29 @@ def _parse_csv_tuple(raw: str, default: Iterable[str]) -> tuple[str, ...]:
     return cleaned or tuple(default)
 
 
+def _parse_weight_map(raw: str, default: dict[str, int]) -> dict[str, int]:
+    out: dict[str, int] = dict(default)
+    for part in raw.split(","):
+        key, sep, value = part.partition("=")
+        if not sep or not key.strip():
+            continue
+        weight = int(value.strip())
+        if weight < 0:
+            raise ValueError("Weights must be zero or greater.")
+        out[key.strip()] = weight
+    return out
+
+
+def _parse_str_map(raw: str) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for part in raw.split(","):
+        key, sep, value = part.rpartition("=")
+        if not sep or not key.strip() or not value.strip():
+            continue
+        out[key.strip()] = value.strip()
+    return out
+
+
 def _parse_required_scopes(
     raw: str, default: dict[str, tuple[str, ...]]
 ) -> dict[str, tuple[str, ...]]:
@@ -91,11 +114,27 @@ DEFAULT_JWT_REQUIRED_SCOPES: dict[str, tuple[str, ...]] = {
     "/api/summary": ("material:write",),
     "/api/lkpd": ("lkpd:write",),
     "/api/lkpd/files/{file_id}": ("lkpd:read",),
+    "/api/jobs/{job_id}": ("jobs:read",),
+    "/api/admin/dead-letters": ("admin:dlq",),
 }
-DEFAULT_OAUTH_SCOPES: tuple[str, ...] = ("material:write", "lkpd:write", "lkpd:read")
+DEFAULT_OAUTH_SCOPES: tuple[str, ...] = (
+    "material:write",
+    "lkpd:write",
+    "lkpd:read",
+    "jobs:read",
+)
+DEFAULT_JOB_KIND_WEIGHTS: dict[str, int] = {"material": 3, "lkpd": 1}
+CALLBACK_ENCODINGS: tuple[str, ...] = ("identity", "gzip", "zstd")
+
+
+APP_ROLES: tuple[str, ...] = ("all", "api")
 
 
 class Settings(BaseModel):
+    app_role: str = "all"
+    metrics_enabled: bool = True
+    metrics_port: int = 0
+    metrics_queue_refresh_seconds: float = 15.0
     chroma_persist_dir: str = ".chroma"
     groq_api_key: str = ""
     groq_model: str = "llama-3.1-8b-instant"
@@ -111,6 +150,7 @@ class Settings(BaseModel):
     rag_fetch_k: int = 24
     rag_mmr_lambda: float = 0.5
     material_max_file_mb: int = 15
+    material_batch_max_items: int = 50
     default_mcq_count: int = 10
     default_essay_count: int = 3
     default_summary_max_words: int = 200
@@ -118,8 +158,60 @@ class Settings(BaseModel):
     webhook_callback_timeout_seconds: int = 10
     webhook_callback_max_retries: int = 3
     webhook_callback_backoff_seconds: tuple[int, ...] = (5, 15, 45)
+    webhook_callback_http2: bool = False
+    webhook_callback_max_connections_per_host: int = 10
+    webhook_callback_keepalive_seconds: float = 30.0
+    webhook_callback_max_in_flight_per_host: int = 8
+    webhook_callback_warmup_urls: tuple[str, ...] = ()
+    webhook_callback_content_encoding: str = "identity"
+    webhook_callback_encodings: dict[str, str] = {}
+    webhook_callback_compress_min_bytes: int = 1024
+    callback_retry_key: str = "callback_retries:due"
+    callback_retry_poll_seconds: float = 1.0
+    callback_retry_batch_size: int = 20
     job_ttl_seconds: int = 86400
     job_queue_key: str = "material_jobs:queue"
+    job_consumer_group: str = "job_workers"
+    job_consumer_name: str = ""
+    job_visibility_timeout_seconds: int = 300
+    job_reclaim_interval_seconds: int = 15
+    job_max_deliveries: int = 3
+    job_retry_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 5.0
+    job_retry_backoff_max_seconds: float = 300.0
+    job_retry_poll_seconds: float = 1.0
+    job_scheduler_prefix: str = "job_sched:"
+    job_dlq_prefix: str = "job_dlq:"
+    job_checkpoint_prefix: str = "job_checkpoints:"
+    job_checkpoint_ttl_seconds: int = 86400
+    admission_max_queue_depth: int = 5000
+    admission_max_tenant_depth: int = 200
+    admission_max_backlog_seconds: int = 43200
+    admission_throughput_window_seconds: int = 600
+    admission_default_retry_after_seconds: int = 30
+    admission_max_retry_after_seconds: int = 900
+    admission_key_prefix: str = "admission:done:"
+    job_events_channel_prefix: str = "job_events:"
+    result_cache_enabled: bool = True
+    result_cache_prefix: str = "material_results:"
+    result_cache_ttl_seconds: int = 604800
+    result_cache_max_entries: int = 10000
+    job_status_max_wait_seconds: int = 30
+    job_events_keepalive_seconds: float = 15.0
+    job_scheduler_wakeup_max: int = 1000
+    job_kind_weights: dict[str, int] = DEFAULT_JOB_KIND_WEIGHTS
+    worker_concurrency: int = 1
+    worker_drain_timeout_seconds: int = 60
+    cpu_executor_workers: int = 2
+    io_executor_workers: int = 8
+    pdf_parallel_min_pages: int = 40
+    extraction_char_budget: int = 200000
+    extraction_cache_dir: str = ".generated/extraction_cache"
+    extraction_cache_max_mb: int = 256
+    blob_store_backend: str = "redis"
+    blob_store_dir: str = ".generated/blobs"
+    blob_key_prefix: str = "material_blobs:"
+    spool_dir: str = ".generated/spool"
     lkpd_default_activity_count: int = 5
     lkpd_min_activity_count: int = 1
     lkpd_max_activity_count: int = 15
@@ -137,6 +229,9 @@ class Settings(BaseModel):
     db_user: str = "postgres"
     db_pass: str = ""
     db_name: str = "rtm_db"
+    db_mirror_flush_ms: int = 200
+    db_mirror_batch_size: int = 500
+    db_mirror_max_pending: int = 50000
     jwt_enabled: bool = True
     jwt_secret: str = ""
     jwt_issuer: str = "my-backend"
@@ -180,6 +275,7 @@ def get_settings() -> Settings:
     oauth_default_scopes = _parse_scope_string(
         os.getenv("OAUTH_DEFAULT_SCOPES", " ".join(DEFAULT_OAUTH_SCOPES))
     )
+    job_ttl_seconds = int(os.getenv("JOB_TTL_SECONDS", "86400"))
 
     if not oauth_allowed_scopes:
         oauth_allowed_scopes = DEFAULT_OAUTH_SCOPES
@@ -221,7 +317,32 @@ def get_settings() -> Settings:
             "CORS_ALLOW_ORIGINS cannot contain '*' when CORS_ALLOW_CREDENTIALS=true."
         )
 
+    app_role = os.getenv("APP_ROLE", "all").strip().lower() or "all"
+    if app_role not in APP_ROLES:
+        raise ValueError(f"APP_ROLE must be one of: {', '.join(APP_ROLES)}.")
+
+    callback_content_encoding = (
+        os.getenv("WEBHOOK_CALLBACK_CONTENT_ENCODING", "identity").strip().lower() or "identity"
+    )
+    callback_encodings = {
+        origin.rstrip("/").lower(): encoding.lower()
+        for origin, encoding in _parse_str_map(
+            os.getenv("WEBHOOK_CALLBACK_ENCODINGS", "")
+        ).items()
+    }
+    for encoding in (callback_content_encoding, *callback_encodings.values()):
+        if encoding not in CALLBACK_ENCODINGS:
+            raise ValueError(
+                f"Callback content encoding must be one of: {', '.join(CALLBACK_ENCODINGS)}."
+            )
+
     return Settings(
+        app_role=app_role,
+        metrics_enabled=_parse_bool(os.getenv("METRICS_ENABLED"), default=True),
+        metrics_port=max(0, int(os.getenv("METRICS_PORT", "0"))),
+        metrics_queue_refresh_seconds=max(
+            1.0, float(os.getenv("METRICS_QUEUE_REFRESH_SECONDS", "15"))
+        ),
         chroma_persist_dir=os.getenv("CHROMA_PERSIST_DIR", ".chroma"),
         groq_api_key=os.getenv("GROQ_API_KEY", ""),
         groq_model=os.getenv("GROQ_MODEL", "llama-3.1-8b-instant"),
@@ -237,6 +358,7 @@ def get_settings() -> Settings:
         rag_fetch_k=int(os.getenv("RAG_FETCH_K", "24")),
         rag_mmr_lambda=float(os.getenv("RAG_MMR_LAMBDA", "0.5")),
         material_max_file_mb=int(os.getenv("MATERIAL_MAX_FILE_MB", "15")),
+        material_batch_max_items=int(os.getenv("MATERIAL_BATCH_MAX_ITEMS", "50")),
         default_mcq_count=int(os.getenv("DEFAULT_MCQ_COUNT", "10")),
         default_essay_count=int(os.getenv("DEFAULT_ESSAY_COUNT", "3")),
         default_summary_max_words=int(os.getenv("DEFAULT_SUMMARY_MAX_WORDS", "200")),
@@ -251,8 +373,109 @@ def get_settings() -> Settings:
             os.getenv("WEBHOOK_CALLBACK_BACKOFF_SECONDS", "5,15,45"),
             default=(5, 15, 45),
         ),
-        job_ttl_seconds=int(os.getenv("JOB_TTL_SECONDS", "86400")),
+        webhook_callback_http2=_parse_bool(
+            os.getenv("WEBHOOK_CALLBACK_HTTP2"),
+            default=False,
+        ),
+        webhook_callback_max_connections_per_host=max(
+            1, int(os.getenv("WEBHOOK_CALLBACK_MAX_CONNECTIONS_PER_HOST", "10"))
+        ),
+        webhook_callback_keepalive_seconds=float(
+            os.getenv("WEBHOOK_CALLBACK_KEEPALIVE_SECONDS", "30")
+        ),
+        webhook_callback_max_in_flight_per_host=max(
+            1, int(os.getenv("WEBHOOK_CALLBACK_MAX_IN_FLIGHT_PER_HOST", "8"))
+        ),
+        webhook_callback_warmup_urls=_parse_csv_tuple(
+            os.getenv("WEBHOOK_CALLBACK_WARMUP_URLS", ""),
+            default=(),
+        ),
+        webhook_callback_content_encoding=callback_content_encoding,
+        webhook_callback_encodings=callback_encodings,
+        webhook_callback_compress_min_bytes=int(
+            os.getenv("WEBHOOK_CALLBACK_COMPRESS_MIN_BYTES", "1024")
+        ),
+        callback_retry_key=os.getenv("CALLBACK_RETRY_KEY", "callback_retries:due"),
+        callback_retry_poll_seconds=float(os.getenv("CALLBACK_RETRY_POLL_SECONDS", "1")),
+        callback_retry_batch_size=int(os.getenv("CALLBACK_RETRY_BATCH_SIZE", "20")),
+        job_ttl_seconds=job_ttl_seconds,
         job_queue_key=os.getenv("JOB_QUEUE_KEY", "material_jobs:queue"),
+        job_consumer_group=os.getenv("JOB_CONSUMER_GROUP", "job_workers"),
+        job_consumer_name=os.getenv("JOB_CONSUMER_NAME", ""),
+        job_visibility_timeout_seconds=int(
+            os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")
+        ),
+        job_reclaim_interval_seconds=int(os.getenv("JOB_RECLAIM_INTERVAL_SECONDS", "15")),
+        job_max_deliveries=int(os.getenv("JOB_MAX_DELIVERIES", "3")),
+        job_retry_max_attempts=max(0, int(os.getenv("JOB_RETRY_MAX_ATTEMPTS", "3"))),
+        job_retry_backoff_seconds=max(
+            0.0, float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+        ),
+        job_retry_backoff_max_seconds=max(
+            0.0, float(os.getenv("JOB_RETRY_BACKOFF_MAX_SECONDS", "300"))
+        ),
+        job_retry_poll_seconds=max(0.1, float(os.getenv("JOB_RETRY_POLL_SECONDS", "1"))),
+        job_scheduler_prefix=os.getenv("JOB_SCHEDULER_PREFIX", "job_sched:"),
+        job_dlq_prefix=os.getenv("JOB_DLQ_PREFIX", "job_dlq:"),
+        job_checkpoint_prefix=os.getenv("JOB_CHECKPOINT_PREFIX", "job_checkpoints:"),
+        job_checkpoint_ttl_seconds=max(
+            1, int(os.getenv("JOB_CHECKPOINT_TTL_SECONDS") or job_ttl_seconds)
+        ),
+        admission_max_queue_depth=max(
+            0, int(os.getenv("ADMISSION_MAX_QUEUE_DEPTH", "5000"))
+        ),
+        admission_max_tenant_depth=max(
+            0, int(os.getenv("ADMISSION_MAX_TENANT_DEPTH", "200"))
+        ),
+        # Jobs must be able to start before their state expires.
+        admission_max_backlog_seconds=max(
+            0,
+            int(os.getenv("ADMISSION_MAX_BACKLOG_SECONDS") or job_ttl_seconds // 2),
+        ),
+        admission_throughput_window_seconds=max(
+            60, int(os.getenv("ADMISSION_THROUGHPUT_WINDOW_SECONDS", "600"))
+        ),
+        admission_default_retry_after_seconds=max(
+            1, int(os.getenv("ADMISSION_DEFAULT_RETRY_AFTER_SECONDS", "30"))
+        ),
+        admission_max_retry_after_seconds=max(
+            1, int(os.getenv("ADMISSION_MAX_RETRY_AFTER_SECONDS", "900"))
+        ),
+        admission_key_prefix=os.getenv("ADMISSION_KEY_PREFIX", "admission:done:"),
+        job_events_channel_prefix=os.getenv("JOB_EVENTS_CHANNEL_PREFIX", "job_events:"),
+        result_cache_enabled=_parse_bool(os.getenv("RESULT_CACHE_ENABLED"), default=True),
+        result_cache_prefix=os.getenv("RESULT_CACHE_PREFIX", "material_results:"),
+        result_cache_ttl_seconds=max(
+            1, int(os.getenv("RESULT_CACHE_TTL_SECONDS", "604800"))
+        ),
+        result_cache_max_entries=max(
+            1, int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+        ),
+        job_status_max_wait_seconds=max(
+            0, int(os.getenv("JOB_STATUS_MAX_WAIT_SECONDS", "30"))
+        ),
+        job_events_keepalive_seconds=max(
+            1.0, float(os.getenv("JOB_EVENTS_KEEPALIVE_SECONDS", "15"))
+        ),
+        job_scheduler_wakeup_max=int(os.getenv("JOB_SCHEDULER_WAKEUP_MAX", "1000")),
+        job_kind_weights=_parse_weight_map(
+            os.getenv("JOB_KIND_WEIGHTS", ""),
+            default=DEFAULT_JOB_KIND_WEIGHTS,
+        ),
+        worker_concurrency=max(1, int(os.getenv("WORKER_CONCURRENCY", "1"))),
+        worker_drain_timeout_seconds=int(
+            os.getenv("WORKER_DRAIN_TIMEOUT_SECONDS", "60")
+        ),
+        cpu_executor_workers=int(os.getenv("CPU_EXECUTOR_WORKERS", "2")),
+        io_executor_workers=int(os.getenv("IO_EXECUTOR_WORKERS", "8")),
+        pdf_parallel_min_pages=max(0, int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))),
+        extraction_char_budget=max(0, int(os.getenv("EXTRACTION_CHAR_BUDGET", "200000"))),
+        extraction_cache_dir=os.getenv("EXTRACTION_CACHE_DIR", ".generated/extraction_cache"),
+        extraction_cache_max_mb=max(0, int(os.getenv("EXTRACTION_CACHE_MAX_MB", "256"))),
+        blob_store_backend=os.getenv("BLOB_STORE_BACKEND", "redis").strip().lower(),
+        blob_store_dir=os.getenv("BLOB_STORE_DIR", ".generated/blobs"),
+        blob_key_prefix=os.getenv("BLOB_KEY_PREFIX", "material_blobs:"),
+        spool_dir=os.getenv("SPOOL_DIR", ".generated/spool"),
         lkpd_default_activity_count=int(os.getenv("LKPD_DEFAULT_ACTIVITY_COUNT", "5")),
         lkpd_min_activity_count=int(os.getenv("LKPD_MIN_ACTIVITY_COUNT", "1")),
         lkpd_max_activity_count=int(os.getenv("LKPD_MAX_ACTIVITY_COUNT", "15")),
@@ -279,6 +502,9 @@ def get_settings() -> Settings:
         db_user=os.getenv("DB_USER", "postgres"),
         db_pass=os.getenv("DB_PASS", ""),
         db_name=os.getenv("DB_NAME", "rtm_db"),
+        db_mirror_flush_ms=max(10, int(os.getenv("DB_MIRROR_FLUSH_MS", "200"))),
+        db_mirror_batch_size=max(1, int(os.getenv("DB_MIRROR_BATCH_SIZE", "500"))),
+        db_mirror_max_pending=max(1, int(os.getenv("DB_MIRROR_MAX_PENDING", "50000"))),
         jwt_enabled=jwt_enabled,
         jwt_secret=jwt_secret,
         jwt_issuer=os.getenv("JWT_ISSUER", "my-backend"),
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.core.api_response import build_error_response
+
+# Room for the non-file multipart fields and part headers.
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+
+def max_request_body_bytes(path: str) -> int:
+    file_bytes = settings.material_max_file_mb * 1024 * 1024
+    files = settings.material_batch_max_items if path.endswith("/batch") else 1
+    return file_bytes * files + MULTIPART_OVERHEAD_BYTES
+
+
+class RequestBodyLimitMiddleware:
+    """Reject request bodies larger than the upload limits before they are buffered.
+
+    A declared `Content-Length` over the limit is refused without reading the body.
+    Chunked bodies are counted as they arrive and cut off once they pass the limit.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_request_body_bytes(scope["path"])
+        declared = _content_length(scope)
+        if declared is not None and declared > limit:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            # Body parsers turn our abort into their own 400; answer 413 instead.
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded:
+            await self._reject(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        response = build_error_response(
+            Request(scope),
+            status_code=413,
+            message=f"File exceeds maximum size of {settings.material_max_file_mb} MB.",
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+def _content_length(scope: Scope) -> int | None:
+    for name, value in scope.get("headers", ()):
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
@@ -21,11 +21,13 @@ class ServiceError(Exception):
         *,
         code: str | None = None,
         details: Any | None = None,
+        headers: dict[str, str] | None = None,
     ) -> None:
         self.message = message
         self.status_code = status_code
         self.code = code
         self.details = details
+        self.headers = headers
         super().__init__(message)
 
 
@@ -38,6 +40,7 @@ def register_exception_handlers(app: FastAPI) -> None:
             code=exc.code or error_code_from_status(exc.status_code),
             message=exc.message,
             details=exc.details,
+            headers=exc.headers,
         )
 
     @app.exception_handler(HTTPException)
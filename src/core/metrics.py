@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Stages range from milliseconds (retrieval) to minutes (LLM on large decks).
+_STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+_VALIDATION_FAILURE_PREFIX = "model_output_validation_failed:"
+
+JOB_QUEUE_LENGTH = Gauge(
+    "rtm_job_queue_length",
+    "Entries in a job stream.",
+    ["queue"],
+)
+JOB_QUEUE_PENDING = Gauge(
+    "rtm_job_queue_pending",
+    "Job stream entries read by a worker but not acknowledged yet.",
+    ["queue"],
+)
+JOBS_SCHEDULED = Gauge(
+    "rtm_jobs_scheduled",
+    "Jobs waiting in the per-tenant sub-queues.",
+    ["job_kind"],
+)
+JOB_OLDEST_AGE_SECONDS = Gauge(
+    "rtm_job_oldest_age_seconds",
+    "Age of the oldest job that is still waiting to start.",
+    ["job_kind"],
+)
+RESULT_CACHE_LOOKUPS = Gauge(
+    "rtm_result_cache_lookups",
+    "Generation result cache lookups by all workers, by outcome.",
+    ["outcome"],
+)
+RESULT_CACHE_EVICTIONS = Gauge(
+    "rtm_result_cache_evictions",
+    "Generation result cache entries evicted to stay under the size bound.",
+)
+RESULT_CACHE_ENTRIES = Gauge(
+    "rtm_result_cache_entries",
+    "Entries in the generation result cache.",
+)
+JOBS_IN_FLIGHT = Gauge(
+    "rtm_jobs_in_flight",
+    "Jobs currently processed by this process.",
+    ["job_kind"],
+)
+JOBS_PROCESSED = Counter(
+    "rtm_jobs_processed",
+    "Jobs processed by this process, by processing result.",
+    ["job_kind", "status"],
+)
+JOB_STAGE_SECONDS = Histogram(
+    "rtm_job_stage_seconds",
+    "Time spent in one pipeline stage of a job.",
+    ["job_kind", "stage"],
+    buckets=_STAGE_BUCKETS,
+)
+MODEL_OUTPUT_VALIDATION_FAILURES = Counter(
+    "rtm_model_output_validation_failures",
+    "Model outputs that failed parsing or the output contract, by reason.",
+    ["job_kind", "reason"],
+)
+CALLBACK_DELIVERIES = Counter(
+    "rtm_callback_deliveries",
+    "Callback delivery attempts, by outcome.",
+    ["job_kind", "outcome"],
+)
+
+
+@contextmanager
+def observe_stage(job_kind: str, stage: str) -> Iterator[None]:
+    """Record the duration of the enclosed block, also when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        JOB_STAGE_SECONDS.labels(job_kind=job_kind, stage=stage).observe(
+            time.perf_counter() - started
+        )
+
+
+def record_validation_failures(job_kind: str, warnings: Iterable[str]) -> None:
+    """Count `model_output_validation_failed:<reason>[:detail]` warnings by reason."""
+    for warning in warnings:
+        if warning.startswith(_VALIDATION_FAILURE_PREFIX):
+            reason = warning[len(_VALIDATION_FAILURE_PREFIX) :].split(":", 1)[0]
+            MODEL_OUTPUT_VALIDATION_FAILURES.labels(job_kind=job_kind, reason=reason).inc()
+
+
+async def metrics_endpoint(_: Request) -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve `/metrics` from a background thread, for processes without an HTTP app."""
+    start_http_server(port)
@@ -2,61 +2,81 @@ from __future__ import annotations
 
 from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import TYPE_CHECKING, AsyncIterator
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import Response
 
-from src.agent.callback import WebhookCallbackClient
 from src.agent.jobs import MaterialJobStore
 from src.agent.lkpd_storage import LkpdFileStorage
-from src.agent.runtime import AgentRuntime
-from src.agent.worker import MaterialJobWorker
-from src.api import build_lkpd_router, build_material_router, build_oauth_router
+from src.agent.queue_metrics import QueueMetricsExporter
+from src.api import (
+    build_admin_router,
+    build_job_router,
+    build_lkpd_router,
+    build_material_router,
+    build_oauth_router,
+)
 from src.auth.revocation import shutdown_token_denylist
 from src.config import settings
 from src.core.api_response import (
     attach_meta_to_json_response,
     build_request_id,
 )
+from src.core.body_limit import RequestBodyLimitMiddleware
 from src.core.constants import APP_NAME, APP_VERSION
 from src.core.exceptions import register_exception_handlers
 from src.core.logging import configure_logging
+from src.core.metrics import metrics_endpoint, start_metrics_server
+
+if TYPE_CHECKING:
+    from src.worker_main import WorkerProcess
 
 
 configure_logging()
 
-agent_runtime = AgentRuntime()
 job_store = MaterialJobStore()
-callback_client = WebhookCallbackClient()
 lkpd_storage = LkpdFileStorage()
-job_worker = MaterialJobWorker(
-    runtime=agent_runtime,
-    job_store=job_store,
-    callback_client=callback_client,
-    lkpd_storage=lkpd_storage,
-)
+
+
+def _build_embedded_worker() -> WorkerProcess | None:
+    # API-only nodes never import the agent runtime (embeddings, Chroma, MCP);
+    # jobs are then processed by `python cmd/worker.py` processes.
+    if settings.app_role == "api":
+        return None
+    from src.worker_main import WorkerProcess
+
+    return WorkerProcess(job_store=job_store, lkpd_storage=lkpd_storage)
+
+
+embedded_worker = _build_embedded_worker()
+queue_metrics = QueueMetricsExporter(job_store) if settings.metrics_enabled else None
 
 
 @asynccontextmanager
 async def app_lifespan(_: FastAPI) -> AsyncIterator[None]:
-    await agent_runtime.initialize()
     await job_store.initialize()
-    await callback_client.initialize()
     await lkpd_storage.initialize()
-    job_worker.start()
+    if embedded_worker is not None:
+        await embedded_worker.start()
+    if queue_metrics is not None:
+        if settings.metrics_port:
+            start_metrics_server(settings.metrics_port)
+        queue_metrics.start()
     try:
         yield
     finally:
-        await job_worker.stop()
-        await callback_client.shutdown()
+        if queue_metrics is not None:
+            await queue_metrics.close()
+        if embedded_worker is not None:
+            await embedded_worker.stop()
         await shutdown_token_denylist()
         await job_store.shutdown()
-        await agent_runtime.shutdown()
 
 
 app = FastAPI(title=APP_NAME, version=APP_VERSION, lifespan=app_lifespan)
+app.add_middleware(RequestBodyLimitMiddleware)
 
 if settings.cors_enabled:
     app.add_middleware(
@@ -70,7 +90,12 @@ if settings.cors_enabled:
 
 app.include_router(build_material_router(job_store))
 app.include_router(build_lkpd_router(job_store, lkpd_storage))
+app.include_router(build_job_router(job_store))
 app.include_router(build_oauth_router())
+app.include_router(build_admin_router(job_store))
+
+if settings.metrics_enabled and not settings.metrics_port:
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 
 @app.middleware("http")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from src.agent.callback import WebhookCallbackClient
+from src.agent.executors import shutdown_executors
+from src.agent.jobs import MaterialJobStore
+from src.agent.lkpd_storage import LkpdFileStorage
+from src.agent.queue_metrics import QueueMetricsExporter
+from src.agent.runtime import AgentRuntime
+from src.agent.worker import MaterialJobWorker
+from src.config import settings
+from src.core.logging import configure_logging
+from src.core.metrics import start_metrics_server
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerProcess:
+    """Job-processing side of the service: runtime, callback client and worker loop."""
+
+    def __init__(
+        self,
+        *,
+        job_store: MaterialJobStore,
+        lkpd_storage: LkpdFileStorage,
+    ) -> None:
+        self._job_store = job_store
+        self._lkpd_storage = lkpd_storage
+        self._runtime = AgentRuntime()
+        self._callback_client = WebhookCallbackClient()
+        self._worker = MaterialJobWorker(
+            runtime=self._runtime,
+            job_store=job_store,
+            callback_client=self._callback_client,
+            lkpd_storage=lkpd_storage,
+        )
+
+    async def start(self) -> None:
+        await self._runtime.initialize()
+        await self._job_store.initialize()
+        await self._callback_client.initialize()
+        await self._lkpd_storage.initialize()
+        self._worker.start()
+
+    async def stop(self) -> None:
+        await self._worker.stop()
+        await self._callback_client.shutdown()
+        await self._runtime.shutdown()
+        await asyncio.to_thread(shutdown_executors)
+
+
+async def run_worker() -> None:
+    job_store = MaterialJobStore()
+    process = WorkerProcess(job_store=job_store, lkpd_storage=LkpdFileStorage())
+    stop_event = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers; Ctrl+C still
+            # raises KeyboardInterrupt out of asyncio.run().
+            pass
+
+    await process.start()
+    logger.info("Job worker started.")
+    # Worker processes have no HTTP app, so they are only scraped on a port.
+    queue_metrics: QueueMetricsExporter | None = None
+    if settings.metrics_enabled and settings.metrics_port:
+        start_metrics_server(settings.metrics_port)
+        queue_metrics = QueueMetricsExporter(job_store)
+        queue_metrics.start()
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Stopping job worker.")
+        if queue_metrics is not None:
+            await queue_metrics.close()
+        await process.stop()
+        await job_store.shutdown()
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
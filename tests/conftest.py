@@ -3,7 +3,16 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
+
+from src.config import settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_extraction_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "extraction_cache_dir", str(tmp_path / "extraction_cache"))
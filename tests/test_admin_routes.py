@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.agent.types import QueuedJob
+from src.api.admin_routes import build_admin_router
+from src.config import DEFAULT_JWT_REQUIRED_SCOPES, _parse_required_scopes, settings
+from src.core.exceptions import register_exception_handlers
+
+
+def _build_job(job_id: str, status: str, host: str) -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id=job_id,
+        job_kind="material",
+        status=status,
+        user_id="user-1",
+        callback_url=f"https://{host}/hooks",
+        filename="material.txt",
+        file_sha256="0" * 64,
+        callback_body='{"status":"succeeded"}' if status == "failed_delivery" else None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class DummyJobStore:
+    def __init__(self, jobs: list[QueuedJob]) -> None:
+        self.jobs = {job.job_id: job for job in jobs}
+        self.list_calls: list[dict[str, Any]] = []
+        self.redelivered: list[str] = []
+        self.reprocessed: list[str] = []
+
+    async def list_dead_letters(
+        self, status: str, **filters: Any
+    ) -> list[tuple[QueuedJob, datetime]]:
+        self.list_calls.append({"status": status, **filters})
+        host = filters.get("host")
+        return [
+            (job, job.updated_at)
+            for job in self.jobs.values()
+            if job.status == status and (host is None or host in str(job.callback_url))
+        ]
+
+    async def dead_letter_counts(self) -> dict[str, int]:
+        return {"failed_processing": 0, "failed_delivery": len(self.jobs)}
+
+    async def get_job(self, job_id: str) -> QueuedJob | None:
+        return self.jobs.get(job_id)
+
+    async def redeliver_dead_letter(self, job: QueuedJob) -> bool:
+        self.redelivered.append(job.job_id)
+        return job.callback_body is not None
+
+    async def reprocess_dead_letter(self, job: QueuedJob) -> bool:
+        self.reprocessed.append(job.job_id)
+        return True
+
+
+@pytest.fixture
+def client_and_store(monkeypatch: pytest.MonkeyPatch) -> tuple[TestClient, DummyJobStore]:
+    monkeypatch.setattr(settings, "jwt_enabled", False)
+    store = DummyJobStore(
+        [
+            _build_job("job-a", "failed_delivery", "a.example.com"),
+            _build_job("job-b", "failed_delivery", "b.example.com"),
+            _build_job("job-c", "failed_processing", "a.example.com"),
+        ]
+    )
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(build_admin_router(store))
+    return TestClient(app), store
+
+
+def test_list_dead_letters_filters_by_status_and_host(
+    client_and_store: tuple[TestClient, DummyJobStore],
+) -> None:
+    client, store = client_and_store
+
+    response = client.get(
+        "/api/admin/dead-letters",
+        params={"status": "failed_delivery", "host": "a.example.com"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [item["job_id"] for item in data["items"]] == ["job-a"]
+    assert data["items"][0]["has_result"] is True
+    assert store.list_calls[0]["host"] == "a.example.com"
+
+
+def test_replay_redelivers_matching_jobs_without_reprocessing(
+    client_and_store: tuple[TestClient, DummyJobStore],
+) -> None:
+    client, store = client_and_store
+
+    response = client.post(
+        "/api/admin/dead-letters/replay",
+        json={
+            "status": "failed_delivery",
+            "action": "redeliver",
+            "since": "2020-01-01T00:00:00Z",
+        },
+    )
+
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert sorted(data["replayed"]) == ["job-a", "job-b"]
+    assert data["skipped"] == []
+    assert store.reprocessed == []
+
+
+def test_replay_by_job_ids_skips_jobs_in_other_states(
+    client_and_store: tuple[TestClient, DummyJobStore],
+) -> None:
+    client, store = client_and_store
+
+    response = client.post(
+        "/api/admin/dead-letters/replay",
+        json={
+            "status": "failed_processing",
+            "action": "reprocess",
+            "job_ids": ["job-c", "job-a", "job-missing"],
+        },
+    )
+
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["replayed"] == ["job-c"]
+    assert data["skipped"] == [
+        {"job_id": "job-a", "reason": "status_failed_delivery"},
+        {"job_id": "job-missing", "reason": "not_found"},
+    ]
+    assert store.reprocessed == ["job-c"]
+
+
+def _bearer(scope: str) -> dict[str, str]:
+    now = datetime.now(UTC)
+    token = jwt.encode(
+        {
+            "iss": settings.jwt_issuer,
+            "aud": settings.jwt_audience,
+            "sub": "client:backend",
+            "iat": int(now.timestamp()),
+            "exp": int((now + timedelta(minutes=5)).timestamp()),
+            "scope": scope,
+        },
+        settings.jwt_secret,
+        algorithm="HS256",
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_custom_scope_mapping_without_admin_entry_keeps_dlq_closed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "jwt_enabled", True)
+    monkeypatch.setattr(settings, "jwt_secret", "x" * 32)
+    monkeypatch.setattr(settings, "jwt_denylist_enabled", False)
+    monkeypatch.setattr(
+        settings,
+        "jwt_required_scopes",
+        _parse_required_scopes(
+            '{"/api/material":"material:write","/api/lkpd":"lkpd:write"}',
+            default=DEFAULT_JWT_REQUIRED_SCOPES,
+        ),
+    )
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(build_admin_router(DummyJobStore([])))
+    client = TestClient(app)
+    params = {"status": "failed_delivery"}
+
+    denied = client.get(
+        "/api/admin/dead-letters",
+        params=params,
+        headers=_bearer("material:write jobs:read"),
+    )
+    allowed = client.get(
+        "/api/admin/dead-letters", params=params, headers=_bearer("admin:dlq")
+    )
+
+    assert denied.status_code == 403
+    assert allowed.status_code == 200
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.agent.admission import AdmissionController
+from src.config import settings
+
+
+class DummyScheduler:
+    def __init__(self, depth: int, tenant_depths: dict[str, int] | None = None) -> None:
+        self._depth = depth
+        self._tenant_depths = tenant_depths or {}
+
+    async def depth(self, job_kind: str) -> int:
+        return self._depth
+
+    async def tenant_depth(self, job_kind: str, tenant: str) -> int:
+        return self._tenant_depths.get(tenant, 0)
+
+
+class DummyRedis:
+    def __init__(self, completed_per_bucket: int) -> None:
+        self._completed = completed_per_bucket
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return [str(self._completed) if self._completed else None for _ in keys]
+
+
+@pytest.fixture(autouse=True)
+def _limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "admission_max_queue_depth", 1000)
+    monkeypatch.setattr(settings, "admission_max_tenant_depth", 50)
+    monkeypatch.setattr(settings, "admission_max_backlog_seconds", 3600)
+    monkeypatch.setattr(settings, "admission_throughput_window_seconds", 600)
+    monkeypatch.setattr(settings, "admission_default_retry_after_seconds", 30)
+    monkeypatch.setattr(settings, "admission_max_retry_after_seconds", 900)
+
+
+def _check(controller: AdmissionController, tenants: dict[str, int]):
+    return asyncio.run(controller.check("material", tenants))
+
+
+def test_admits_when_backlog_drains_in_time() -> None:
+    # 60 jobs per minute -> 1/s; 500 waiting jobs drain in ~500s.
+    controller = AdmissionController(DummyRedis(60), DummyScheduler(depth=500))
+
+    assert _check(controller, {"user-1": 1}) is None
+
+
+def test_rejects_tenant_over_its_share_before_global_limits() -> None:
+    controller = AdmissionController(
+        DummyRedis(60),
+        DummyScheduler(depth=10, tenant_depths={"user-1": 50}),
+    )
+
+    rejection = _check(controller, {"user-1": 1})
+
+    assert rejection is not None
+    assert rejection.reason == "tenant_backlog"
+    assert rejection.retry_after_seconds == 1
+    assert _check(controller, {"user-2": 5}) is None
+
+
+def test_rejects_when_estimated_backlog_exceeds_limit() -> None:
+    # 6 jobs per minute -> 0.1/s; 400 waiting jobs take ~4000s.
+    controller = AdmissionController(DummyRedis(6), DummyScheduler(depth=400))
+
+    rejection = _check(controller, {"user-1": 1})
+
+    assert rejection is not None
+    assert rejection.reason == "backlog_too_long"
+    assert rejection.retry_after_seconds == 410
+
+
+def test_without_throughput_history_only_depth_limit_applies() -> None:
+    idle = AdmissionController(DummyRedis(0), DummyScheduler(depth=999))
+    full = AdmissionController(DummyRedis(0), DummyScheduler(depth=1000))
+
+    assert _check(idle, {"user-1": 1}) is None
+    rejection = _check(full, {"user-1": 1})
+    assert rejection is not None
+    assert rejection.reason == "queue_full"
+    assert rejection.retry_after_seconds == 30
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from src.agent import blob_store
+from src.agent.blob_store import LocalBlobStore, RedisBlobStore
+from src.agent.jobs import MaterialJobStore
+from src.agent.types import QueuedJob
+from src.config import settings
+
+
+def test_local_blob_store_is_content_addressed(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+    payload = b"materi pembelajaran"
+
+    async def scenario() -> tuple:
+        await store.initialize()
+        first = await store.put(payload)
+        second = await store.put(payload)
+        return first, second, await store.get(first.sha256)
+
+    first, second, loaded = asyncio.run(scenario())
+
+    assert first.sha256 == hashlib.sha256(payload).hexdigest()
+    assert first == second
+    assert first.size == len(payload)
+    assert loaded == payload
+    assert len(list(tmp_path.glob("*/*"))) == 1
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_local_blob_store_streams_chunks_into_content_address(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+
+    async def scenario() -> tuple:
+        await store.initialize()
+        streamed = await store.put_stream(_chunks(b"materi ", b"pembelajaran"))
+        whole = await store.put(b"materi pembelajaran")
+        return streamed, whole, await store.get(streamed.sha256)
+
+    streamed, whole, loaded = asyncio.run(scenario())
+
+    assert streamed == whole
+    assert loaded == b"materi pembelajaran"
+    assert [path.name for path in tmp_path.glob("*/*")] == [streamed.sha256]
+
+
+def test_local_blob_store_discards_interrupted_stream(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+
+    async def failing_chunks():
+        yield b"partial"
+        raise RuntimeError("client went away")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.put_stream(failing_chunks()))
+
+    assert list(tmp_path.glob("*/*")) == []
+
+
+def test_local_blob_store_missing_blob_returns_none(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+
+    assert asyncio.run(store.get("0" * 64)) is None
+
+
+def test_local_blob_store_cleanup_removes_expired_blobs(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "job_ttl_seconds", 60)
+    store = LocalBlobStore(str(tmp_path))
+    stale = asyncio.run(store.put(b"old upload"))
+    fresh = asyncio.run(store.put(b"new upload"))
+    stale_path = tmp_path / stale.sha256[:2] / stale.sha256
+    expired_at = time.time() - 120
+    os.utime(stale_path, (expired_at, expired_at))
+
+    removed = store.cleanup_expired_blobs()
+
+    assert removed == 1
+    assert asyncio.run(store.get(stale.sha256)) is None
+    assert asyncio.run(store.get(fresh.sha256)) == b"new upload"
+
+
+def test_queued_job_requires_file_reference() -> None:
+    now = datetime.now(UTC)
+    with pytest.raises(ValueError):
+        QueuedJob(
+            job_id="job-1",
+            job_kind="material",
+            user_id="user-1",
+            filename="material.txt",
+            created_at=now,
+            updated_at=now,
+        )
+
+
+def test_job_store_spools_legacy_inline_payload(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "spool_dir", str(tmp_path))
+    now = datetime.now(UTC)
+    job = QueuedJob(
+        job_id="job-1",
+        job_kind="material",
+        user_id="user-1",
+        filename="material.txt",
+        file_b64="aGVsbG8=",
+        created_at=now,
+        updated_at=now,
+    )
+
+    async def scenario() -> tuple[bytes, Path]:
+        async with MaterialJobStore().spool_file(job) as path:
+            return path.read_bytes(), path
+
+    content, path = asyncio.run(scenario())
+
+    assert content == b"hello"
+    assert not path.exists()
+
+
+def test_local_spool_hands_out_the_blob_itself(tmp_path) -> None:
+    store = LocalBlobStore(str(tmp_path))
+
+    async def scenario() -> tuple[Path | None, Path | None]:
+        await store.initialize()
+        blob = await store.put(b"materi")
+        async with store.spool(blob.sha256) as path:
+            pass
+        async with store.spool("0" * 64) as missing:
+            pass
+        return path, missing
+
+    path, missing = asyncio.run(scenario())
+
+    assert path is not None and path.read_bytes() == b"materi"
+    assert path.parent.parent == tmp_path
+    assert missing is None
+
+
+class SlicedRedis:
+    def __init__(self, values: dict[str, bytes]) -> None:
+        self.values = values
+        self.ranges: list[tuple[int, int]] = []
+
+    async def strlen(self, key: str) -> int:
+        return len(self.values.get(key, b""))
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.values)
+
+    async def getrange(self, key: str, start: int, end: int) -> bytes:
+        self.ranges.append((start, end))
+        return self.values.get(key, b"")[start : end + 1]
+
+
+def test_redis_spool_streams_blob_in_slices(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "spool_dir", str(tmp_path))
+    monkeypatch.setattr(blob_store, "_SPOOL_CHUNK_BYTES", 4)
+    payload = b"materi fotosintesis"
+    store = RedisBlobStore()
+    store._redis = SlicedRedis({f"{settings.blob_key_prefix}abc": payload})
+
+    async def scenario() -> tuple[bytes, Path | None, Path | None]:
+        async with store.spool("abc") as path:
+            assert path is not None
+            content = path.read_bytes()
+        async with store.spool("missing") as missing:
+            pass
+        return content, path, missing
+
+    content, path, missing = asyncio.run(scenario())
+
+    assert content == payload
+    assert len(store._redis.ranges) == 5
+    assert path is not None and not path.exists()
+    assert missing is None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+
+import httpx
+
+from src.agent.callback import WebhookCallbackClient
+from src.config import settings
+
+
+def _build_client(handler) -> WebhookCallbackClient:
+    client = WebhookCallbackClient()
+    client._build_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_callbacks_share_one_pool_per_origin_and_respect_in_flight_cap(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "webhook_callback_max_in_flight_per_host", 2)
+    monkeypatch.setattr(settings, "webhook_callback_warmup_urls", ())
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(204)
+
+    client = _build_client(handler)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            *(
+                client.send_body(callback_url=f"https://{host}/hooks/{i}", body=b"{}")
+                for host in ("a.example.com", "B.example.com")
+                for i in range(5)
+            )
+        )
+        await client.shutdown()
+
+    asyncio.run(scenario())
+
+    assert peak == {"a.example.com": 2, "b.example.com": 2}
+
+
+def test_initialize_warms_up_configured_destinations(monkeypatch) -> None:
+    monkeypatch.setattr(
+        settings,
+        "webhook_callback_warmup_urls",
+        ("https://a.example.com/health", "https://down.example.com/"),
+    )
+    seen: list[tuple[str, str]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, str(request.url)))
+        if request.url.host == "down.example.com":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    client = _build_client(handler)
+
+    async def scenario() -> int:
+        await client.initialize()
+        await client.send_body(callback_url="https://a.example.com/hooks", body=b"{}")
+        destinations = len(client._destinations)
+        await client.shutdown()
+        return destinations
+
+    destinations = asyncio.run(scenario())
+
+    assert ("HEAD", "https://a.example.com/health") in seen
+    assert ("POST", "https://a.example.com/hooks") in seen
+    assert destinations == 2
+
+
+def test_compressed_destination_falls_back_to_identity_on_415(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "webhook_callback_warmup_urls", ())
+    monkeypatch.setattr(settings, "webhook_callback_content_encoding", "identity")
+    monkeypatch.setattr(
+        settings, "webhook_callback_encodings", {"https://a.example.com": "gzip"}
+    )
+    monkeypatch.setattr(settings, "webhook_callback_compress_min_bytes", 16)
+    body = b'{"result":"' + b"x" * 64 + b'"}'
+    received: list[tuple[str | None, bytes]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        encoding = request.headers.get("content-encoding")
+        received.append((encoding, request.content))
+        if len(received) == 1:
+            return httpx.Response(415)
+        return httpx.Response(204)
+
+    client = _build_client(handler)
+
+    async def scenario() -> None:
+        await client.send_body(callback_url="https://a.example.com/hooks", body=body)
+        await client.send_body(callback_url="https://a.example.com/hooks", body=body)
+        await client.send_body(callback_url="https://b.example.com/hooks", body=body)
+        await client.shutdown()
+
+    asyncio.run(scenario())
+
+    assert received[0][0] == "gzip"
+    assert gzip.decompress(received[0][1]) == body
+    assert received[1:] == [(None, body)] * 3
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from datetime import UTC, datetime
 from typing import Any
 
 import httpx
 
-import src.agent.worker_helpers.delivery as delivery_module
 from src.agent.types import MaterialWebhookResultPayload, QueuedJob
-from src.agent.worker_helpers.delivery import deliver_with_retry
+from src.agent.worker_helpers.delivery import deliver_due_retries, deliver_with_retry
 from src.config import settings
 
 
@@ -17,9 +17,11 @@ class DummyCallbackClient:
     def __init__(self, outcomes: list[Exception | None]) -> None:
         self.outcomes = outcomes
         self.calls = 0
+        self.bodies: list[dict[str, Any]] = []
 
-    async def send_json(self, *, callback_url: str, payload: dict) -> None:
-        _ = callback_url, payload
+    async def send_body(self, *, callback_url: str, body: bytes) -> None:
+        _ = callback_url
+        self.bodies.append(json.loads(body))
         outcome = self.outcomes[self.calls]
         self.calls += 1
         if outcome is not None:
@@ -27,8 +29,41 @@ class DummyCallbackClient:
 
 
 class DummyJobStore:
-    def __init__(self) -> None:
+    def __init__(self, job: QueuedJob | None = None) -> None:
+        self.job = job
         self.updates: list[dict[str, Any]] = []
+        self.scheduled: list[dict[str, Any]] = []
+        self.due: list[str] = []
+        self.completed: list[str] = []
+        self.cleared: list[str] = []
+
+    async def get_job(self, job_id: str) -> QueuedJob | None:
+        if self.job is None or self.job.job_id != job_id:
+            return None
+        return self.job
+
+    async def schedule_callback_retry(
+        self,
+        job_id: str,
+        *,
+        body: str,
+        delay_seconds: float,
+    ) -> bool:
+        self.scheduled.append({"job_id": job_id, "body": body, "delay_seconds": delay_seconds})
+        if self.job is not None:
+            self.job.callback_body = body
+        self.due.append(job_id)
+        return True
+
+    async def claim_due_callback_retries(self, *, limit: int) -> list[str]:
+        claimed, self.due = self.due[:limit], self.due[limit:]
+        return claimed
+
+    async def complete_callback_retry(self, job_id: str) -> None:
+        self.completed.append(job_id)
+
+    async def clear_checkpoints(self, job_id: str) -> None:
+        self.cleared.append(job_id)
 
     async def update_job(
         self,
@@ -38,6 +73,7 @@ class DummyJobStore:
         callback_attempts: int | None = None,
         last_error: str | None = None,
         clear_last_error: bool = False,
+        callback_body: str | None = None,
     ) -> dict[str, Any]:
         update = {
             "job_id": job_id,
@@ -45,8 +81,11 @@ class DummyJobStore:
             "callback_attempts": callback_attempts,
             "last_error": last_error,
             "clear_last_error": clear_last_error,
+            "callback_body": callback_body,
         }
         self.updates.append(update)
+        if self.job is not None and callback_attempts is not None:
+            self.job.callback_attempts = callback_attempts
         return update
 
 
@@ -94,34 +133,115 @@ def _build_payload() -> MaterialWebhookResultPayload:
 
 
 def test_retry_then_success(monkeypatch) -> None:
-    async def no_sleep(_: float) -> None:
-        return None
-
-    monkeypatch.setattr(delivery_module.asyncio, "sleep", no_sleep)
     monkeypatch.setattr(settings, "webhook_callback_max_retries", 2)
-    monkeypatch.setattr(settings, "webhook_callback_backoff_seconds", (0,))
+    monkeypatch.setattr(settings, "webhook_callback_backoff_seconds", (5,))
 
     request = httpx.Request("POST", "https://example.com/callback")
     callback_client = DummyCallbackClient([httpx.ReadTimeout("", request=request), None])
-    job_store = DummyJobStore()
+    job = _build_job()
+    job_store = DummyJobStore(job)
     logger = logging.getLogger("test")
 
-    delivered = asyncio.run(
+    outcome = asyncio.run(
         deliver_with_retry(
             callback_client=callback_client,
             job_store=job_store,
-            job=_build_job(),
+            job=job,
             payload=_build_payload(),
             logger=logger,
         )
     )
 
-    assert delivered is True
+    assert outcome == "scheduled"
+    assert callback_client.calls == 1
+    assert 5 <= job_store.scheduled[0]["delay_seconds"] <= 5.5
+    assert "attempt" not in json.loads(job_store.scheduled[0]["body"])
+
+    attempted = asyncio.run(
+        deliver_due_retries(
+            callback_client=callback_client,
+            job_store=job_store,
+            logger=logger,
+        )
+    )
+
+    assert attempted == 1
     assert callback_client.calls == 2
+    assert [body["attempt"] for body in callback_client.bodies] == [1, 2]
+    assert callback_client.bodies[0]["job_id"] == "job-test-1"
+    assert callback_client.bodies[1] == callback_client.bodies[0] | {"attempt": 2}
     assert job_store.updates[0]["callback_attempts"] == 1
     assert job_store.updates[1]["callback_attempts"] == 2
     assert job_store.updates[1]["clear_last_error"] is True
+    assert job_store.completed == ["job-test-1"]
+
+
+def test_exhausted_scheduled_retry_marks_failed_delivery(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "webhook_callback_max_retries", 1)
+    monkeypatch.setattr(settings, "webhook_callback_backoff_seconds", (0,))
+
+    request = httpx.Request("POST", "https://example.com/callback")
+    callback_client = DummyCallbackClient(
+        [httpx.ConnectError("refused", request=request)] * 2
+    )
+    job = _build_job()
+    job_store = DummyJobStore(job)
+    logger = logging.getLogger("test")
+
+    async def scenario() -> None:
+        await deliver_with_retry(
+            callback_client=callback_client,
+            job_store=job_store,
+            job=job,
+            payload=_build_payload(),
+            logger=logger,
+        )
+        await deliver_due_retries(
+            callback_client=callback_client,
+            job_store=job_store,
+            logger=logger,
+        )
+
+    asyncio.run(scenario())
+
+    assert callback_client.calls == 2
+    assert len(job_store.scheduled) == 1
+    assert job_store.updates[-1]["status"] == "failed_delivery"
+    assert job_store.completed == ["job-test-1"]
+    assert job_store.cleared == []
+
+
+
+def test_successful_scheduled_retry_clears_checkpoints(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "webhook_callback_max_retries", 1)
+    monkeypatch.setattr(settings, "webhook_callback_backoff_seconds", (0,))
 
+    request = httpx.Request("POST", "https://example.com/callback")
+    callback_client = DummyCallbackClient([httpx.ConnectError("refused", request=request), None])
+    job = _build_job()
+    job.status = "succeeded"
+    job_store = DummyJobStore(job)
+    logger = logging.getLogger("test")
+
+    async def scenario() -> None:
+        await deliver_with_retry(
+            callback_client=callback_client,
+            job_store=job_store,
+            job=job,
+            payload=_build_payload(),
+            logger=logger,
+        )
+        assert job_store.cleared == []
+        await deliver_due_retries(
+            callback_client=callback_client,
+            job_store=job_store,
+            logger=logger,
+        )
+
+    asyncio.run(scenario())
+
+    assert callback_client.calls == 2
+    assert job_store.cleared == ["job-test-1"]
 
 def test_non_retryable_http_400_stops_immediately(monkeypatch) -> None:
     monkeypatch.setattr(settings, "webhook_callback_max_retries", 3)
@@ -144,9 +264,12 @@ def test_non_retryable_http_400_stops_immediately(monkeypatch) -> None:
         )
     )
 
-    assert delivered is False
+    assert delivered == "failed"
     assert callback_client.calls == 1
-    assert len(job_store.updates) == 1
+    assert len(job_store.updates) == 2
+    assert job_store.scheduled == []
+    assert job_store.updates[1]["status"] == "failed_delivery"
+    assert json.loads(job_store.updates[1]["callback_body"])["job_id"] == "job-test-1"
     assert "status=400" in (job_store.updates[0]["last_error"] or "")
 
 
@@ -169,7 +292,7 @@ def test_timeout_error_has_non_empty_last_error(monkeypatch) -> None:
         )
     )
 
-    assert delivered is False
+    assert delivered == "failed"
     assert "ReadTimeout" in (job_store.updates[0]["last_error"] or "")
 
 
@@ -188,6 +311,6 @@ def test_missing_callback_url_skips_delivery() -> None:
         )
     )
 
-    assert delivered is True
+    assert delivered == "skipped"
     assert callback_client.calls == 0
     assert job_store.updates == []
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.agent.checkpoints import ExtractionCheckpoint, JobCheckpoints, RagCheckpoint
+from src.agent.lkpd_storage import StoredLkpdPdf
+from src.agent.types import (
+    LkpdActivity,
+    LkpdContent,
+    LkpdGenerateRuntimeResult,
+    LkpdRubricItem,
+    MaterialInfo,
+    QueuedJob,
+)
+from src.agent.worker_helpers import job_handlers
+from src.agent.worker_helpers.job_handlers import process_lkpd_job
+from src.config import settings
+
+
+class DummyPipeline:
+    def __init__(self, redis: DummyRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def __aenter__(self) -> DummyPipeline:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def hset(self, key: str, field: str, value: str) -> None:
+        self._commands.append(("hset", (key, field, value)))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self._commands.append(("expire", (key, seconds)))
+
+    async def execute(self) -> list[object]:
+        for name, args in self._commands:
+            if name == "hset":
+                key, field, value = args
+                self._redis.hashes.setdefault(key, {})[field] = value
+            else:
+                self._redis.expirations[args[0]] = args[1]
+        return []
+
+
+class DummyRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.expirations: dict[str, int] = {}
+
+    def pipeline(self, *, transaction: bool = True) -> DummyPipeline:
+        return DummyPipeline(self)
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    async def delete(self, key: str) -> int:
+        return 1 if self.hashes.pop(key, None) is not None else 0
+
+
+class DummyJobStore:
+    def __init__(self, redis: DummyRedis) -> None:
+        self._redis = redis
+
+    async def update_job(self, job_id: str, **changes: Any) -> bool:
+        return True
+
+    async def checkpoints(self, job_id: str) -> JobCheckpoints:
+        return JobCheckpoints(self._redis, job_id)
+
+    @asynccontextmanager
+    async def spool_file(self, job: QueuedJob) -> AsyncIterator[Path]:
+        yield Path("deck.pdf")
+
+
+class DummyRuntime:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def invoke_lkpd_upload(self, **kwargs: Any) -> LkpdGenerateRuntimeResult:
+        self.calls += 1
+        return LkpdGenerateRuntimeResult(
+            document_id=kwargs["document_id"],
+            material=MaterialInfo(filename="deck.pdf", file_type="pdf", extracted_chars=900),
+            lkpd=_build_lkpd(),
+        )
+
+
+class DummyLkpdStorage:
+    def __init__(self, base_dir: Path) -> None:
+        self._base_dir = base_dir
+        self.saved: list[str] = []
+
+    def save_pdf(self, payload: bytes) -> StoredLkpdPdf:
+        file_id = f"lkpd-{len(self.saved) + 1}"
+        path = self._base_dir / f"{file_id}.pdf"
+        path.write_bytes(payload)
+        self.saved.append(file_id)
+        return StoredLkpdPdf(
+            file_id=file_id,
+            path=path,
+            expires_at=datetime.now(UTC) + timedelta(hours=1),
+        )
+
+    def get_pdf_path(self, file_id: str) -> Path | None:
+        path = self._base_dir / f"{file_id}.pdf"
+        return path if path.exists() else None
+
+
+def _build_lkpd() -> LkpdContent:
+    return LkpdContent(
+        title="LKPD Fotosintesis",
+        learning_objectives=["Menjelaskan proses fotosintesis"],
+        instructions=["Baca materi", "Kerjakan aktivitas"],
+        activities=[
+            LkpdActivity(
+                activity_no=1,
+                task="Amati daun",
+                expected_output="Catatan pengamatan",
+                assessment_hint="Ketelitian",
+            )
+        ],
+        worksheet_template="Nama: ...",
+        assessment_rubric=[
+            LkpdRubricItem(
+                aspect="Pemahaman",
+                criteria="Menjelaskan dengan benar",
+                score_range="1-4",
+            )
+        ],
+    )
+
+
+def _build_job() -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id="job-1",
+        job_kind="lkpd",
+        user_id="user-1",
+        material_id="material-1",
+        request_payload={"user_id": "user-1"},
+        filename="deck.pdf",
+        file_sha256="a" * 64,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _run_lkpd_job(
+    runtime: DummyRuntime,
+    redis: DummyRedis,
+    storage: DummyLkpdStorage,
+    monkeypatch,
+) -> Any:
+    monkeypatch.setattr(settings, "cpu_executor_workers", 0)
+    monkeypatch.setattr(job_handlers, "render_lkpd_pdf", lambda **_: b"%PDF-rendered")
+    return asyncio.run(
+        process_lkpd_job(
+            runtime=runtime,
+            job_store=DummyJobStore(redis),
+            lkpd_storage=storage,
+            job=_build_job(),
+        )
+    )
+
+
+def test_checkpoints_round_trip_and_ignore_unreadable_payloads() -> None:
+    redis = DummyRedis()
+    checkpoints = JobCheckpoints(redis, "job-1")
+    extraction = ExtractionCheckpoint(text="isi materi", file_type="pdf", warnings=["w1"])
+
+    asyncio.run(checkpoints.save("extraction", extraction))
+
+    assert asyncio.run(checkpoints.load("extraction", ExtractionCheckpoint)) == extraction
+    assert asyncio.run(checkpoints.load("rag", RagCheckpoint)) is None
+    assert redis.expirations
+    # A payload of another shape is treated as missing, so the stage reruns.
+    assert asyncio.run(checkpoints.load("extraction", RagCheckpoint)) is None
+
+    asyncio.run(checkpoints.clear())
+    assert asyncio.run(checkpoints.load("extraction", ExtractionCheckpoint)) is None
+
+
+def test_rerun_reuses_the_rendered_lkpd_pdf(tmp_path, monkeypatch) -> None:
+    redis = DummyRedis()
+    storage = DummyLkpdStorage(tmp_path)
+
+    first = _run_lkpd_job(DummyRuntime(), redis, storage, monkeypatch)
+    second = _run_lkpd_job(DummyRuntime(), redis, storage, monkeypatch)
+
+    assert first.status == second.status == "succeeded"
+    assert storage.saved == ["lkpd-1"]
+    assert second.result is not None
+    assert second.result.pdf_url.endswith("/api/lkpd/files/lkpd-1")
+
+
+def test_rerun_renders_again_when_the_pdf_is_gone(tmp_path, monkeypatch) -> None:
+    redis = DummyRedis()
+    storage = DummyLkpdStorage(tmp_path)
+
+    _run_lkpd_job(DummyRuntime(), redis, storage, monkeypatch)
+    (tmp_path / "lkpd-1.pdf").unlink()
+    payload = _run_lkpd_job(DummyRuntime(), redis, storage, monkeypatch)
+
+    assert storage.saved == ["lkpd-1", "lkpd-2"]
+    assert payload.result is not None
+    assert payload.result.pdf_url.endswith("/api/lkpd/files/lkpd-2")
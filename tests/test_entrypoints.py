@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src import worker_main
+from src.config import settings
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+class DummyService:
+    """Stands in for the job store, LKPD storage, runtime and callback client."""
+
+    def __init__(self, name: str, events: list[str]) -> None:
+        self._name = name
+        self._events = events
+
+    async def initialize(self) -> None:
+        self._events.append(f"{self._name}.initialize")
+
+    async def shutdown(self) -> None:
+        self._events.append(f"{self._name}.shutdown")
+
+
+class DummyWorker:
+    def __init__(self, events: list[str], **kwargs: Any) -> None:
+        self._events = events
+
+    def start(self) -> None:
+        self._events.append("worker.start")
+
+    async def stop(self) -> None:
+        self._events.append("worker.stop")
+
+
+def test_api_role_serves_without_building_the_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    from src import main
+
+    class ForbiddenWorkerProcess:
+        def __init__(self, **kwargs: Any) -> None:
+            raise AssertionError("APP_ROLE=api must not build a worker")
+
+    events: list[str] = []
+    monkeypatch.setattr(settings, "app_role", "api")
+    monkeypatch.setattr(worker_main, "WorkerProcess", ForbiddenWorkerProcess)
+    embedded_worker = main._build_embedded_worker()
+    monkeypatch.setattr(main, "embedded_worker", embedded_worker)
+    monkeypatch.setattr(main, "job_store", DummyService("job_store", events))
+    monkeypatch.setattr(main, "lkpd_storage", DummyService("lkpd_storage", events))
+    monkeypatch.setattr(main, "queue_metrics", None)
+
+    async def no_denylist() -> None:
+        return None
+
+    monkeypatch.setattr(main, "shutdown_token_denylist", no_denylist)
+
+    async def scenario() -> None:
+        async with main.app_lifespan(main.app):
+            events.append("serving")
+
+    asyncio.run(scenario())
+
+    assert embedded_worker is None
+    assert events == [
+        "job_store.initialize",
+        "lkpd_storage.initialize",
+        "serving",
+        "job_store.shutdown",
+    ]
+
+
+def test_api_role_does_not_import_the_agent_runtime() -> None:
+    script = (
+        "import sys\n"
+        "import src.main as main\n"
+        "assert main.embedded_worker is None\n"
+        "assert 'src.agent.runtime' not in sys.modules\n"
+    )
+    env = {**os.environ, "APP_ROLE": "api"}
+
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_worker_process_starts_and_stops_its_services(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[str] = []
+    monkeypatch.setattr(worker_main, "AgentRuntime", lambda: DummyService("runtime", events))
+    monkeypatch.setattr(
+        worker_main, "WebhookCallbackClient", lambda: DummyService("callback", events)
+    )
+    monkeypatch.setattr(
+        worker_main, "MaterialJobWorker", lambda **kwargs: DummyWorker(events, **kwargs)
+    )
+    monkeypatch.setattr(worker_main, "shutdown_executors", lambda: events.append("executors"))
+    process = worker_main.WorkerProcess(
+        job_store=DummyService("job_store", events),
+        lkpd_storage=DummyService("lkpd_storage", events),
+    )
+
+    async def scenario() -> None:
+        await process.start()
+        await process.stop()
+
+    asyncio.run(scenario())
+
+    assert events == [
+        "runtime.initialize",
+        "job_store.initialize",
+        "callback.initialize",
+        "lkpd_storage.initialize",
+        "worker.start",
+        "worker.stop",
+        "callback.shutdown",
+        "runtime.shutdown",
+        "executors",
+    ]
+
+
+def test_run_worker_stops_on_sigterm(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[str] = []
+
+    class DummyWorkerProcess:
+        def __init__(self, **kwargs: Any) -> None:
+            pass
+
+        async def start(self) -> None:
+            events.append("process.start")
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        async def stop(self) -> None:
+            events.append("process.stop")
+
+    monkeypatch.setattr(settings, "metrics_enabled", False)
+    monkeypatch.setattr(worker_main, "MaterialJobStore", lambda: DummyService("job_store", events))
+    monkeypatch.setattr(worker_main, "LkpdFileStorage", lambda: DummyService("lkpd", events))
+    monkeypatch.setattr(worker_main, "WorkerProcess", DummyWorkerProcess)
+
+    asyncio.run(asyncio.wait_for(worker_main.run_worker(), timeout=5))
+
+    assert events == ["process.start", "process.stop", "job_store.shutdown"]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from src.agent import executors
+from src.agent.material_extractor import extract_material_text
+from src.config import settings
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    executors.shutdown_executors()
+    yield
+    executors.shutdown_executors()
+
+
+def test_run_cpu_bound_uses_process_pool(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cpu_executor_workers", 1)
+
+    text, file_type, warnings = asyncio.run(
+        executors.run_cpu_bound(
+            extract_material_text,
+            filename="materi.txt",
+            content_type="text/plain",
+            payload=b"hello   world",
+        )
+    )
+    child_pid = asyncio.run(executors.run_cpu_bound(os.getpid))
+
+    assert (text, file_type, warnings) == ("hello world", "txt", [])
+    assert child_pid != os.getpid()
+
+
+def test_run_cpu_bound_falls_back_to_threads_when_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cpu_executor_workers", 0)
+
+    pid = asyncio.run(executors.run_cpu_bound(os.getpid))
+
+    assert pid == os.getpid()
+    assert executors._process_pool is None
+
+
+def test_run_blocking_forwards_keyword_arguments() -> None:
+    def join(left: str, *, right: str) -> str:
+        return f"{left}-{right}"
+
+    assert asyncio.run(executors.run_blocking(join, "a", right="b")) == "a-b"
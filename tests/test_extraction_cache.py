@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+
+from src.agent import material_extractor
+from src.agent.extraction_cache import ExtractionCache, extraction_cache_key
+from src.agent.material_extractor import extract_material_text_async
+from src.config import settings
+
+
+def _extract(payload: bytes, content_type: str | None = "text/plain"):
+    return asyncio.run(
+        extract_material_text_async(
+            filename="materi.txt", content_type=content_type, payload=payload
+        )
+    )
+
+
+def test_resubmitted_file_is_parsed_once(monkeypatch) -> None:
+    calls: list[str] = []
+
+    async def inline_run_cpu_bound(func, /, *args, **kwargs):
+        calls.append(func.__name__)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(material_extractor, "run_cpu_bound", inline_run_cpu_bound)
+    payload = b"Fotosintesis mengubah cahaya menjadi energi kimia."
+
+    first = _extract(payload)
+    second = _extract(payload)
+    unusual = _extract(payload, content_type="application/octet-stream")
+
+    assert calls == ["extract_material_text"]
+    assert first == second == (payload.decode(), "txt", [])
+    assert unusual[2] == ["Uploaded file extension is .txt but content-type is unusual."]
+
+
+def test_disabled_cache_parses_every_time(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "extraction_cache_max_mb", 0)
+    calls: list[str] = []
+
+    async def inline_run_cpu_bound(func, /, *args, **kwargs):
+        calls.append(func.__name__)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(material_extractor, "run_cpu_bound", inline_run_cpu_bound)
+
+    _extract(b"materi")
+    _extract(b"materi")
+
+    assert calls == ["extract_material_text", "extract_material_text"]
+    assert not os.path.exists(settings.extraction_cache_dir)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path) -> None:
+    cache = ExtractionCache(str(tmp_path), max_bytes=200)
+    cache.put("aa01", ("a" * 40, "txt", []))
+    cache.put("bb02", ("b" * 40, "txt", []))
+    os.utime(tmp_path / "aa" / "aa01.json", (1000, 1000))
+    os.utime(tmp_path / "bb" / "bb02.json", (2000, 2000))
+
+    assert cache.get("aa01") == ("a" * 40, "txt", [])
+    evicted = cache.put("cc03", ("c" * 40, "txt", ["sampled"]))
+
+    assert evicted == 1
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("cc03") == ("c" * 40, "txt", ["sampled"])
+
+
+def test_key_changes_with_extraction_options(monkeypatch) -> None:
+    key = extraction_cache_key(b"deck", "deck.pdf")
+
+    assert extraction_cache_key(b"deck", "DECK.PDF") == key
+    assert extraction_cache_key(b"deck", "deck.pptx") != key
+    monkeypatch.setattr(settings, "extraction_char_budget", 1000)
+    assert extraction_cache_key(b"deck", "deck.pdf") != key
+
+
+def test_known_digest_is_not_recomputed(tmp_path) -> None:
+    digest = hashlib.sha256(b"deck").hexdigest()
+    # The file does not exist, so the key can only come from the given digest.
+    missing = tmp_path / "deck.pdf"
+
+    key = extraction_cache_key(missing, "deck.pdf", file_sha256=digest)
+
+    assert key == extraction_cache_key(b"deck", "deck.pdf")
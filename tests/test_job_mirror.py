@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+
+from src.agent.job_mirror import PostgresJobMirror
+from src.agent.types import QueuedJob
+from src.config import settings
+
+
+class DummyTransaction:
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class DummyConnection:
+    def __init__(self, pool: DummyPool) -> None:
+        self._pool = pool
+
+    def transaction(self) -> DummyTransaction:
+        return DummyTransaction()
+
+    async def executemany(self, sql: str, rows: list[tuple[object, ...]]) -> None:
+        if self._pool.write_started is not None:
+            self._pool.write_started.set()
+            await asyncio.sleep(0.05)
+        if self._pool.fail:
+            raise OSError("connection refused")
+        if "INSERT" in sql:
+            self._pool.inserts.append(rows)
+            self._pool.existing.update(str(row[5]) for row in rows)
+        else:
+            self._pool.updates.append(rows)
+
+    async def fetch(self, sql: str, job_ids: list[str]) -> list[dict[str, Any]]:
+        return [{"externalJobId": job_id} for job_id in job_ids if job_id in self._pool.existing]
+
+
+class DummyAcquire:
+    def __init__(self, pool: DummyPool) -> None:
+        self._pool = pool
+
+    async def __aenter__(self) -> DummyConnection:
+        return DummyConnection(self._pool)
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class DummyPool:
+    def __init__(self) -> None:
+        self.fail = False
+        self.inserts: list[list[tuple[object, ...]]] = []
+        self.updates: list[list[tuple[object, ...]]] = []
+        self.existing: set[str] = set()
+        self.write_started: asyncio.Event | None = None
+
+    def acquire(self) -> DummyAcquire:
+        return DummyAcquire(self)
+
+
+def _build_job(job_id: str) -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id=job_id,
+        job_kind="material",
+        user_id="user-1",
+        request_payload={"generate_types": ["essay"]},
+        filename="material.pdf",
+        file_sha256="a" * 64,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_flush_batches_inserts_and_collapses_updates_per_job() -> None:
+    pool = DummyPool()
+    mirror = PostgresJobMirror(pool)
+    now = datetime.now(UTC)
+
+    async def scenario() -> None:
+        mirror.record_inserts([_build_job("job-1"), _build_job("job-2")])
+        mirror.record_update("job-1", status="processing", attempts=None, updated_at=now)
+        mirror.record_update("job-1", status="succeeded", attempts=None, updated_at=now)
+        mirror.record_update("job-1", status=None, attempts=1, updated_at=now)
+        await mirror.flush()
+
+    asyncio.run(scenario())
+
+    assert len(pool.inserts) == 1
+    assert [(row[3], row[4], row[5]) for row in pool.inserts[0]] == [
+        ("ESSAY", "accepted", "job-1"),
+        ("ESSAY", "accepted", "job-2"),
+    ]
+    assert pool.updates == [[("job-1", "succeeded", 1, now)]]
+    assert mirror.pending == 0
+
+
+def test_failed_flush_keeps_rows_and_orphan_updates_wait_for_their_insert() -> None:
+    pool = DummyPool()
+    mirror = PostgresJobMirror(pool)
+    now = datetime.now(UTC)
+
+    async def scenario() -> None:
+        mirror.record_update("job-9", status="processing", attempts=None, updated_at=now)
+        await mirror.flush()
+        assert mirror.pending == 1
+
+        pool.fail = True
+        mirror.record_inserts([_build_job("job-9")])
+        await mirror.flush()
+        assert mirror.pending == 2
+
+        pool.fail = False
+        await mirror.flush()
+
+    asyncio.run(scenario())
+
+    assert [row[5] for row in pool.inserts[0]] == ["job-9"]
+    assert pool.updates[-1] == [("job-9", "processing", None, now)]
+    assert mirror.pending == 0
+
+
+def test_reaching_batch_size_wakes_the_flusher(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "db_mirror_flush_ms", 60_000)
+    monkeypatch.setattr(settings, "db_mirror_batch_size", 2)
+    pool = DummyPool()
+    mirror = PostgresJobMirror(pool)
+
+    async def scenario() -> int:
+        mirror.start()
+        mirror.record_inserts([_build_job("job-1"), _build_job("job-2")])
+        for _ in range(10):
+            await asyncio.sleep(0)
+        flushed = len(pool.inserts)
+        await mirror.close()
+        return flushed
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_close_lets_an_in_flight_flush_finish(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "db_mirror_flush_ms", 60_000)
+    monkeypatch.setattr(settings, "db_mirror_batch_size", 1)
+    pool = DummyPool()
+    mirror = PostgresJobMirror(pool)
+
+    async def scenario() -> None:
+        pool.write_started = asyncio.Event()
+        mirror.start()
+        mirror.record_inserts([_build_job("job-1")])
+        await pool.write_started.wait()
+        await mirror.close()
+
+    asyncio.run(scenario())
+
+    assert [row[5] for row in pool.inserts[0]] == ["job-1"]
+    assert mirror.pending == 0
+
+
+def test_rows_mirror_processing_attempts() -> None:
+    job = _build_job("job-1").model_copy(update={"processing_attempts": 2, "callback_attempts": 5})
+    pool = DummyPool()
+    mirror = PostgresJobMirror(pool)
+
+    mirror.record_inserts([job])
+    asyncio.run(mirror.flush())
+
+    assert pool.inserts[0][0][8] == 2
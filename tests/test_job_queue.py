@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from src.agent.job_queue import JobStreamQueue
+from src.agent.jobs import MaterialJobStore
+from src.agent.types import QueuedJob
+from src.config import settings
+
+
+class DummyPipeline:
+    def __init__(self, redis: DummyStreamRedis) -> None:
+        self._redis = redis
+
+    async def __aenter__(self) -> DummyPipeline:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def xack(self, stream_key: str, group: str, entry_id: str) -> None:
+        self._redis.acked.append(entry_id)
+
+    def xdel(self, stream_key: str, entry_id: str) -> None:
+        return None
+
+    async def execute(self) -> list[object]:
+        return []
+
+
+class DummyStreamRedis:
+    """One pending entry that has already been delivered `deliveries` times."""
+
+    def __init__(self, deliveries: int, new_entries: dict[str, str] | None = None) -> None:
+        self.deliveries = deliveries
+        self.new_entries = dict(new_entries or {})
+        self.acked: list[str] = []
+        self.read_streams: list[list[str]] = []
+
+    def pipeline(self, *, transaction: bool = True) -> DummyPipeline:
+        return DummyPipeline(self)
+
+    async def xautoclaim(self, stream_key: str, *args: Any, **kwargs: Any) -> list[Any]:
+        if not self.deliveries or stream_key != settings.job_queue_key or "1-0" in self.acked:
+            return ["0-0", [], []]
+        return ["0-0", [("1-0", {"job_id": "job-1"})], []]
+
+    async def xpending_range(self, *args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        return [{"message_id": "1-0", "times_delivered": self.deliveries}]
+
+    async def xreadgroup(
+        self, group: str, consumer: str, streams: dict[str, str], count: int
+    ) -> list[Any]:
+        self.read_streams.append(list(streams))
+        return [
+            (stream_key, [("2-0", {"job_id": self.new_entries.pop(stream_key)})])
+            for stream_key in streams
+            if stream_key in self.new_entries
+        ]
+
+
+class RecordingJobStore(MaterialJobStore):
+    def __init__(self, job: QueuedJob) -> None:
+        super().__init__()
+        self.job = job
+        self.callbacks: list[str] = []
+
+    async def get_job(self, job_id: str) -> QueuedJob | None:
+        return self.job if job_id == self.job.job_id else None
+
+    async def update_job(self, job_id: str, **changes: Any) -> bool:
+        self.job = self.job.model_copy(update=changes)
+        return True
+
+    async def schedule_callback_retry(
+        self, job_id: str, *, body: str, delay_seconds: float
+    ) -> bool:
+        self.callbacks.append(body)
+        return True
+
+
+def _build_job() -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id="job-1",
+        job_kind="material",
+        status="processing",
+        user_id="user-1",
+        callback_url="https://example.com/callback",
+        filename="material.pdf",
+        file_sha256="a" * 64,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _delivery_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "job_max_deliveries", 3)
+
+
+def test_entry_past_max_deliveries_fails_its_job() -> None:
+    redis = DummyStreamRedis(deliveries=4)
+    store = RecordingJobStore(_build_job())
+    queue = JobStreamQueue(redis, consumer_name="worker-1", on_exhausted=store.fail_exhausted_job)
+
+    entry = asyncio.run(queue.read())
+
+    assert entry is None
+    assert redis.acked == ["1-0"]
+    assert store.job.status == "failed_processing"
+    assert store.job.last_error == "Job exceeded max deliveries (4) without completing."
+    body = json.loads(store.callbacks[0])
+    assert body["status"] == "failed_processing"
+    assert body["error"]["code"] == "max_deliveries_exceeded"
+    assert "attempt" not in body
+
+
+def test_entry_within_max_deliveries_is_reclaimed() -> None:
+    redis = DummyStreamRedis(deliveries=2)
+    store = RecordingJobStore(_build_job())
+    queue = JobStreamQueue(redis, consumer_name="worker-1", on_exhausted=store.fail_exhausted_job)
+
+    entry = asyncio.run(queue.read())
+
+    assert entry is not None and entry.job_id == "job-1"
+    assert redis.acked == []
+    assert store.job.status == "processing"
+
+
+def test_failing_exhausted_hook_keeps_the_entry_pending() -> None:
+    redis = DummyStreamRedis(deliveries=4)
+
+    async def failing_hook(job_id: str, deliveries: int) -> None:
+        raise ConnectionError("redis unavailable")
+
+    queue = JobStreamQueue(redis, consumer_name="worker-1", on_exhausted=failing_hook)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(queue.read())
+    assert redis.acked == []
+
+
+def test_read_only_takes_entries_from_the_requested_streams() -> None:
+    redis = DummyStreamRedis(
+        deliveries=0,
+        new_entries={settings.job_queue_key: "material-1", settings.lkpd_job_queue_key: "lkpd-1"},
+    )
+    queue = JobStreamQueue(redis, consumer_name="worker-1")
+
+    entry = asyncio.run(queue.read([settings.lkpd_job_queue_key]))
+
+    assert entry is not None and entry.job_id == "lkpd-1"
+    assert redis.read_streams == [[settings.lkpd_job_queue_key]]
+    assert settings.job_queue_key in redis.new_entries
+
+
+class BatchReclaimRedis(DummyStreamRedis):
+    """Three stale entries on the material stream."""
+
+    def __init__(self) -> None:
+        super().__init__(deliveries=2, new_entries={settings.job_queue_key: "new-1"})
+        self.stale = [(f"1-{n}", {"job_id": f"stale-{n}"}) for n in range(3)]
+        self.claim_counts: list[int] = []
+        self.renewed: list[str] = []
+
+    async def xautoclaim(self, stream_key: str, *args: Any, count: int, **kwargs: Any) -> list[Any]:
+        self.claim_counts.append(count)
+        if stream_key != settings.job_queue_key:
+            return ["0-0", [], []]
+        claimed, self.stale = self.stale[:count], self.stale[count:]
+        return ["0-0", claimed, []]
+
+    async def xclaim(self, stream_key: str, group: str, consumer: str, **kwargs: Any) -> None:
+        self.renewed.extend(kwargs["message_ids"])
+
+
+def test_reclaim_claims_a_batch_and_hands_it_out_before_new_entries(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "worker_concurrency", 2)
+    redis = BatchReclaimRedis()
+    queue = JobStreamQueue(redis, consumer_name="worker-1")
+
+    async def scenario() -> list[str]:
+        first = await queue.read()
+        assert first is not None
+        await queue.renew([first])
+        second = await queue.read()
+        third = await queue.read()
+        return [entry.job_id for entry in (first, second, third) if entry is not None]
+
+    assert asyncio.run(scenario()) == ["stale-0", "stale-1", "new-1"]
+    assert redis.claim_counts == [2]
+    assert redis.renewed == ["1-0", "1-1"]
+    assert redis.read_streams == [[settings.job_queue_key]]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import jwt
+import pytest
+from fastapi import FastAPI
+
+from src.agent.types import JobStatus, QueuedJob
+from src.api.job_routes import build_job_router
+from src.config import DEFAULT_JWT_REQUIRED_SCOPES, _parse_required_scopes, settings
+from src.core.exceptions import register_exception_handlers
+
+
+class DummyJobStore:
+    def __init__(self, job: QueuedJob) -> None:
+        self.jobs = {job.job_id: job}
+        self.watchers: list[asyncio.Event] = []
+
+    async def get_job(self, job_id: str) -> QueuedJob | None:
+        return self.jobs.get(job_id)
+
+    @asynccontextmanager
+    async def watch_job(self, job_id: str) -> AsyncIterator[asyncio.Event]:
+        changed = asyncio.Event()
+        self.watchers.append(changed)
+        try:
+            yield changed
+        finally:
+            self.watchers.remove(changed)
+
+    async def set_status(self, job_id: str, status: JobStatus) -> None:
+        job = self.jobs[job_id]
+        self.jobs[job_id] = job.model_copy(
+            update={"status": status, "updated_at": job.updated_at + timedelta(seconds=1)}
+        )
+        for changed in self.watchers:
+            changed.set()
+
+
+def _build_job(submitted_by: str | None = None) -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id="job-1",
+        job_kind="material",
+        user_id="user-1",
+        submitted_by=submitted_by,
+        filename="material.pdf",
+        file_sha256="a" * 64,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _build_app(store: DummyJobStore) -> FastAPI:
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(build_job_router(store))
+    return app
+
+
+@pytest.fixture(autouse=True)
+def _disable_jwt(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "jwt_enabled", False)
+
+
+def test_get_job_status_returns_current_state_or_404() -> None:
+    store = DummyJobStore(_build_job())
+
+    async def scenario() -> tuple[httpx.Response, httpx.Response]:
+        transport = httpx.ASGITransport(app=_build_app(store))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            found = await client.get("/api/jobs/job-1")
+            missing = await client.get("/api/jobs/job-404")
+        return found, missing
+
+    found, missing = asyncio.run(scenario())
+
+    assert found.status_code == 200
+    assert found.json()["data"]["status"] == "accepted"
+    assert missing.status_code == 404
+
+
+def test_long_poll_returns_as_soon_as_the_job_changes() -> None:
+    job = _build_job()
+    store = DummyJobStore(job)
+
+    async def scenario() -> tuple[httpx.Response, float]:
+        transport = httpx.ASGITransport(app=_build_app(store))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            request = asyncio.create_task(
+                client.get(
+                    "/api/jobs/job-1",
+                    params={"wait": 20, "since": job.updated_at.isoformat()},
+                )
+            )
+            await asyncio.sleep(0.05)
+            await store.set_status("job-1", "processing")
+            response = await request
+        return response, loop.time() - started
+
+    response, elapsed = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json()["data"]["status"] == "processing"
+    assert elapsed < 5
+
+
+def test_event_stream_sends_each_change_and_ends_on_final_status() -> None:
+    store = DummyJobStore(_build_job())
+
+    async def scenario() -> httpx.Response:
+        async def progress() -> None:
+            await asyncio.sleep(0.05)
+            await store.set_status("job-1", "processing")
+            await asyncio.sleep(0.05)
+            await store.set_status("job-1", "succeeded")
+
+        transport = httpx.ASGITransport(app=_build_app(store))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            updates = asyncio.create_task(progress())
+            response = await client.get("/api/jobs/job-1/events")
+            await updates
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    statuses = [
+        json.loads(line.removeprefix("data: "))["status"]
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert statuses == ["accepted", "processing", "succeeded"]
+
+
+def _bearer(subject: str, scope: str) -> dict[str, str]:
+    now = datetime.now(UTC)
+    token = jwt.encode(
+        {
+            "iss": settings.jwt_issuer,
+            "aud": settings.jwt_audience,
+            "sub": subject,
+            "iat": int(now.timestamp()),
+            "exp": int((now + timedelta(minutes=5)).timestamp()),
+            "scope": scope,
+        },
+        settings.jwt_secret,
+        algorithm="HS256",
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _enable_jwt(monkeypatch: pytest.MonkeyPatch, required_scopes: str) -> None:
+    monkeypatch.setattr(settings, "jwt_enabled", True)
+    monkeypatch.setattr(settings, "jwt_secret", "x" * 32)
+    monkeypatch.setattr(settings, "jwt_denylist_enabled", False)
+    monkeypatch.setattr(
+        settings,
+        "jwt_required_scopes",
+        _parse_required_scopes(required_scopes, default=DEFAULT_JWT_REQUIRED_SCOPES),
+    )
+
+
+def test_custom_scope_mapping_without_jobs_entry_keeps_status_closed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _enable_jwt(monkeypatch, '{"/api/material":"material:write"}')
+
+    async def scenario() -> tuple[httpx.Response, httpx.Response]:
+        transport = httpx.ASGITransport(app=_build_app(DummyJobStore(_build_job())))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            denied = await client.get(
+                "/api/jobs/job-1", headers=_bearer("client:backend", "material:write")
+            )
+            allowed = await client.get(
+                "/api/jobs/job-1", headers=_bearer("client:backend", "jobs:read")
+            )
+        return denied, allowed
+
+    denied, allowed = asyncio.run(scenario())
+
+    assert denied.status_code == 403
+    assert allowed.status_code == 200
+
+
+def test_job_is_only_visible_to_the_client_that_submitted_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _enable_jwt(monkeypatch, "")
+    # A finished job, so the owner's event stream closes after one event.
+    job = _build_job(submitted_by="client:backend").model_copy(update={"status": "succeeded"})
+    store = DummyJobStore(job)
+
+    async def scenario() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=_build_app(store))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [
+                await client.get(path, headers=_bearer(subject, "jobs:read"))
+                for subject in ("client:backend", "client:other")
+                for path in ("/api/jobs/job-1", "/api/jobs/job-1/events")
+            ]
+
+    own_status, own_events, other_status, other_events = asyncio.run(scenario())
+
+    assert own_status.status_code == 200
+    assert own_events.status_code == 200
+    assert other_status.status_code == 404
+    assert other_events.status_code == 404
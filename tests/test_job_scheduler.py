@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from src.agent.job_scheduler import KindSelector
+from src.config import _parse_weight_map
+
+
+def _serve(selector: KindSelector, available: set[str], rounds: int) -> list[str]:
+    served: list[str] = []
+    for _ in range(rounds):
+        for kind in selector.order():
+            if kind in available:
+                selector.charge(kind)
+                served.append(kind)
+                break
+    return served
+
+
+def test_kind_selector_interleaves_by_weight() -> None:
+    selector = KindSelector({"material": 3, "lkpd": 1})
+
+    served = _serve(selector, {"material", "lkpd"}, rounds=8)
+
+    assert served.count("material") == 6
+    assert served.count("lkpd") == 2
+    assert served[:4].count("lkpd") == 1
+
+
+def test_kind_selector_serves_other_kind_when_one_is_empty() -> None:
+    selector = KindSelector({"material": 3, "lkpd": 1})
+
+    served = _serve(selector, {"lkpd"}, rounds=3)
+
+    assert served == ["lkpd", "lkpd", "lkpd"]
+
+
+def test_kind_selector_zero_weight_disables_kind() -> None:
+    selector = KindSelector({"material": 1, "lkpd": 0})
+
+    assert selector.order() == ["material"]
+
+
+def test_parse_weight_map_overrides_defaults() -> None:
+    weights = _parse_weight_map("lkpd=2, bogus", default={"material": 3, "lkpd": 1})
+
+    assert weights == {"material": 3, "lkpd": 2}
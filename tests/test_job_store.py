@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from typing import Any
+
+from src.agent.jobs import MaterialJobStore, decode_job_fields, encode_job_fields
+from src.agent.types import QueuedJob
+
+
+class DummyUpdateScript:
+    def __init__(self, result: int = 1) -> None:
+        self.result = result
+        self.calls: list[dict[str, Any]] = []
+
+    async def __call__(self, *, keys: list[str], args: list[object]) -> int:
+        self.calls.append({"keys": keys, "args": args})
+        return self.result
+
+
+def _build_job() -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id="job-1",
+        job_kind="material",
+        user_id="user-1",
+        callback_url="https://example.com/callback",
+        request_payload={"user_id": "user-1", "generate_types": ["mcq"]},
+        filename="material.pdf",
+        content_type="application/pdf",
+        file_sha256="a" * 64,
+        file_size=2048,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class DummyDeadLetterIndex:
+    """A failed_* sorted set as a newest-first list, shifting on removal like ZREM."""
+
+    def __init__(self, job_ids: list[str]) -> None:
+        self.job_ids = {"failed_processing": list(job_ids), "failed_delivery": []}
+        self.recorded: list[tuple[str, str]] = []
+
+    async def list(
+        self, status: str, *, since: Any, until: Any, offset: int, limit: int
+    ) -> list[tuple[str, datetime]]:
+        now = datetime.now(UTC)
+        return [(job_id, now) for job_id in self.job_ids[status][offset : offset + limit]]
+
+    async def remove(self, job_id: str, status: str) -> bool:
+        if job_id not in self.job_ids[status]:
+            return False
+        self.job_ids[status].remove(job_id)
+        return True
+
+    async def record(self, job_id: str, status: str) -> None:
+        self.recorded.append((job_id, status))
+
+
+def _build_store(script: DummyUpdateScript) -> MaterialJobStore:
+    store = MaterialJobStore()
+    store._redis = object()
+    store._update_fields_script = script
+    return store
+
+
+def test_job_fields_round_trip() -> None:
+    job = _build_job()
+
+    fields = encode_job_fields(job)
+
+    assert "last_error" not in fields
+    assert json.loads(fields["status"]) == "accepted"
+    assert decode_job_fields(fields) == job
+
+
+def test_update_job_patches_only_changed_fields() -> None:
+    script = DummyUpdateScript()
+    store = _build_store(script)
+
+    updated = asyncio.run(
+        store.update_job("job-1", status="processing", callback_attempts=2)
+    )
+
+    assert updated is True
+    call = script.calls[0]
+    assert call["keys"] == ["material_jobs:job-1"]
+    ttl, clear_flag, *pairs = call["args"]
+    fields = dict(zip(pairs[::2], pairs[1::2]))
+    assert clear_flag == "0"
+    assert set(fields) == {"updated_at", "status", "callback_attempts"}
+    assert json.loads(fields["status"]) == "processing"
+    assert json.loads(fields["callback_attempts"]) == 2
+
+
+def test_update_job_clear_last_error_wins_over_new_error() -> None:
+    script = DummyUpdateScript()
+    store = _build_store(script)
+
+    asyncio.run(store.update_job("job-1", last_error="boom", clear_last_error=True))
+
+    _, clear_flag, *pairs = script.calls[0]["args"]
+    assert clear_flag == "1"
+    assert "last_error" not in pairs[::2]
+
+
+def test_update_job_reports_missing_job() -> None:
+    store = _build_store(DummyUpdateScript(result=0))
+
+    assert asyncio.run(store.update_job("job-missing", status="processing")) is False
+
+
+def test_dead_letter_listing_does_not_skip_entries_after_expired_ones() -> None:
+    live = [f"job-{index}" for index in range(150)]
+    # Every other entry of the first page points at an expired job hash.
+    index = DummyDeadLetterIndex(
+        [job_id for pair in zip(live[:50], [f"gone-{i}" for i in range(50)]) for job_id in pair]
+        + live[50:]
+    )
+    store = _build_store(DummyUpdateScript())
+    store._dead_letters = index
+
+    async def get_job(job_id: str) -> QueuedJob | None:
+        if job_id.startswith("gone-"):
+            return None
+        return _build_job().model_copy(update={"job_id": job_id, "status": "failed_processing"})
+
+    store.get_job = get_job
+
+    listed = asyncio.run(store.list_dead_letters("failed_processing", limit=150))
+
+    assert [job.job_id for job, _ in listed] == live
+    assert index.job_ids["failed_processing"] == live
+
+
+def test_delivery_replay_does_not_relist_a_failed_processing_job() -> None:
+    script = DummyUpdateScript()
+    store = _build_store(script)
+    index = DummyDeadLetterIndex([])
+    index.job_ids["failed_delivery"].append("job-1")
+    store._dead_letters = index
+    scheduled: list[str] = []
+
+    async def schedule_callback_retry(job_id: str, *, body: str, delay_seconds: float) -> bool:
+        scheduled.append(body)
+        return True
+
+    store.schedule_callback_retry = schedule_callback_retry
+    body = json.dumps({"job_id": "job-1", "status": "failed_processing"})
+    job = _build_job().model_copy(update={"status": "failed_delivery", "callback_body": body})
+
+    assert asyncio.run(store.redeliver_dead_letter(job)) is True
+    assert scheduled == [body]
+    assert index.recorded == []
+    assert index.job_ids == {"failed_processing": [], "failed_delivery": []}
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from src.agent import executors, material_extractor
+from src.agent.material_extractor import (
+    extract_material_text,
+    extract_material_text_async,
+    extract_pdf_pages,
+    spread_order,
+)
+from src.config import settings
+
+
+def _build_pdf(pages: list[str]) -> bytes:
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    for text in pages:
+        if text:
+            pdf.drawString(40, 800, text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _build_pptx(slides: list[str]) -> bytes:
+    presentation = Presentation()
+    for text in slides:
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+        box.text_frame.text = text
+    buffer = BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    executors.shutdown_executors()
+    yield
+    executors.shutdown_executors()
+
+
+def test_page_range_skips_blank_pages_and_clamps_stop() -> None:
+    payload = _build_pdf(["satu", "", "tiga"])
+
+    assert [chunk.strip() for chunk in extract_pdf_pages(payload, 0, 10)] == ["satu", "tiga"]
+    assert [chunk.strip() for chunk in extract_pdf_pages(payload, 1, 2)] == []
+
+
+def test_large_pdf_is_split_across_workers_in_page_order(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cpu_executor_workers", 2)
+    monkeypatch.setattr(settings, "extraction_char_budget", 0)
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 5)
+    payload = _build_pdf([f"halaman {number}" for number in range(1, 8)])
+    ranges: list[tuple[int, int]] = []
+    original = material_extractor.run_cpu_bound
+
+    async def recording_run_cpu_bound(func, /, *args, **kwargs):
+        if func is extract_pdf_pages:
+            ranges.append(args[1:])
+        return await original(func, *args, **kwargs)
+
+    monkeypatch.setattr(material_extractor, "run_cpu_bound", recording_run_cpu_bound)
+
+    result = asyncio.run(
+        extract_material_text_async(filename="buku.pdf", content_type=None, payload=payload)
+    )
+
+    assert sorted(ranges) == [(0, 3), (3, 7)]
+    assert result == extract_material_text(filename="buku.pdf", content_type=None, payload=payload)
+    assert result[0] == " ".join(f"halaman {number}" for number in range(1, 8))
+
+
+def test_small_pdf_is_extracted_in_one_task(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cpu_executor_workers", 2)
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 5)
+    payload = _build_pdf(["satu", "dua"])
+    calls: list[str] = []
+
+    async def inline_run_cpu_bound(func, /, *args, **kwargs):
+        calls.append(func.__name__)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(material_extractor, "run_cpu_bound", inline_run_cpu_bound)
+
+    text, file_type, warnings = asyncio.run(
+        extract_material_text_async(filename="ringkas.pdf", content_type=None, payload=payload)
+    )
+
+    assert calls == ["count_pdf_pages", "extract_material_text"]
+    assert (text, file_type, warnings) == ("satu dua", "pdf", [])
+
+
+def test_spread_order_covers_the_document_progressively() -> None:
+    assert spread_order(8) == [0, 4, 2, 6, 1, 5, 3, 7]
+    assert spread_order(5) == [0, 4, 2, 1, 3]
+    assert spread_order(1) == [0]
+    assert spread_order(0) == []
+
+
+def test_pdf_over_budget_is_sampled_across_pages(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "extraction_char_budget", 25)
+    payload = _build_pdf([f"halaman {number}" for number in range(1, 9)])
+
+    text, file_type, warnings = extract_material_text(
+        filename="buku.pdf", content_type=None, payload=payload
+    )
+
+    assert (text, file_type) == ("halaman 1 halaman 3 halaman 5", "pdf")
+    assert warnings == [
+        "Document exceeds EXTRACTION_CHAR_BUDGET; extracted 3 of 8 pages "
+        "sampled across the document."
+    ]
+
+
+def test_pdf_within_budget_is_extracted_completely(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "extraction_char_budget", 1000)
+    payload = _build_pdf([f"halaman {number}" for number in range(1, 9)])
+
+    text, _, warnings = extract_material_text(
+        filename="buku.pdf", content_type=None, payload=payload
+    )
+
+    assert text == " ".join(f"halaman {number}" for number in range(1, 9))
+    assert warnings == []
+
+
+def test_parallel_sampling_splits_the_budget_between_workers(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cpu_executor_workers", 2)
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 5)
+    monkeypatch.setattr(settings, "extraction_char_budget", 18)
+    payload = _build_pdf([f"halaman {number}" for number in range(1, 9)])
+
+    text, _, warnings = asyncio.run(
+        extract_material_text_async(filename="buku.pdf", content_type=None, payload=payload)
+    )
+
+    assert text == "halaman 1 halaman 5"
+    assert "extracted 2 of 8 pages" in warnings[0]
+
+
+def test_pptx_over_budget_is_sampled_across_slides(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "extraction_char_budget", 15)
+    payload = _build_pptx([f"slide {number}" for number in range(1, 7)])
+
+    text, file_type, warnings = extract_material_text(
+        filename="deck.pptx", content_type=None, payload=payload
+    )
+
+    assert (text, file_type) == ("slide 1 slide 3 slide 5", "pptx")
+    assert "extracted 3 of 6 slides" in warnings[0]
+
+
+@pytest.mark.parametrize(
+    ("filename", "payload"),
+    [
+        ("buku.pdf", _build_pdf(["satu", "", "tiga"])),
+        ("deck.pptx", _build_pptx(["slide 1", "slide 2"])),
+        ("catatan.txt", "Fotosintesis — ringkas".encode()),
+    ],
+)
+def test_spooled_file_extracts_like_in_memory_payload(tmp_path, filename, payload) -> None:
+    path = tmp_path / filename
+    path.write_bytes(payload)
+
+    from_file = extract_material_text(filename=filename, content_type=None, payload=path)
+
+    assert from_file == extract_material_text(filename=filename, content_type=None, payload=payload)
+
+
+def test_empty_spooled_pdf_is_rejected(tmp_path) -> None:
+    path = tmp_path / "kosong.pdf"
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="Failed to read PDF file"):
+        extract_material_text(filename="kosong.pdf", content_type=None, payload=path)
+
+
+def test_pptx_covers_tables_groups_and_notes_in_presentation_order() -> None:
+    presentation = Presentation()
+    layout = presentation.slide_layouts[6]
+    first = presentation.slides.add_slide(layout)
+    first.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)).text_frame.text = "judul"
+    table = first.shapes.add_table(2, 2, Inches(1), Inches(2), Inches(4), Inches(1)).table
+    for (row, col), text in zip([(0, 0), (0, 1), (1, 0), (1, 1)], "abcd"):
+        table.cell(row, col).text = text
+    group = first.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(1), Inches(4), Inches(4), Inches(1)).text_frame.text = "dalam grup"
+    first.notes_slide.notes_text_frame.text = "catatan guru"
+    second = presentation.slides.add_slide(layout)
+    second.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)).text_frame.text = "kedua"
+    # Move the second slide to the front without renaming its part.
+    slide_ids = presentation.slides._sldIdLst
+    moved = list(slide_ids)[1]
+    slide_ids.remove(moved)
+    slide_ids.insert(0, moved)
+    buffer = BytesIO()
+    presentation.save(buffer)
+
+    text, file_type, _ = extract_material_text(
+        filename="deck.pptx", content_type=None, payload=buffer.getvalue()
+    )
+
+    assert (text, file_type) == ("kedua judul a b c d dalam grup catatan guru", "pptx")
+
+
+def test_corrupt_pptx_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Failed to read PPTX file"):
+        extract_material_text(filename="deck.pptx", content_type=None, payload=b"not a zip")
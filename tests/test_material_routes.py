@@ -1,40 +1,68 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from collections.abc import AsyncIterable
 from typing import Any
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from src.agent.admission import AdmissionRejection
+from src.agent.blob_store import StoredBlob
 from src.api.material_routes import build_material_router
 from src.config import settings
+from src.core.body_limit import RequestBodyLimitMiddleware
 from src.core.exceptions import register_exception_handlers
 
 
 class DummyMaterialJobStore:
     def __init__(self) -> None:
         self.calls: list[dict[str, Any]] = []
+        self.batches: list[list[Any]] = []
+        self.uploads: dict[str, bytes] = {}
+        self.rejection: AdmissionRejection | None = None
+        self.admission_checks: list[tuple[str, dict[str, int]]] = []
+
+    async def check_admission(
+        self, job_kind: str, tenants: dict[str, int]
+    ) -> AdmissionRejection | None:
+        self.admission_checks.append((job_kind, tenants))
+        return self.rejection
+
+    async def store_upload(self, chunks: AsyncIterable[bytes]) -> StoredBlob:
+        payload = b"".join([chunk async for chunk in chunks])
+        blob = StoredBlob(sha256=hashlib.sha256(payload).hexdigest(), size=len(payload))
+        self.uploads[blob.sha256] = payload
+        return blob
 
     async def enqueue_job(
         self,
         *,
         job_kind: str,
         request: Any,
-        file_bytes: bytes,
+        blob: StoredBlob,
         filename: str,
         content_type: str | None,
+        submitted_by: str | None = None,
     ) -> str:
         self.calls.append(
             {
                 "job_kind": job_kind,
                 "request": request,
-                "file_bytes": file_bytes,
+                "file_bytes": self.uploads[blob.sha256],
                 "filename": filename,
                 "content_type": content_type,
+                "submitted_by": submitted_by,
             }
         )
         return "job-test-123"
 
+    async def enqueue_jobs(self, submissions: list[Any]) -> list[str]:
+        self.batches.append(submissions)
+        return [submission.request.job_id for submission in submissions]
+
 
 @pytest.fixture
 def app_and_store(monkeypatch: pytest.MonkeyPatch) -> tuple[FastAPI, DummyMaterialJobStore]:
@@ -290,3 +318,181 @@ def test_material_endpoints_reject_empty_file_with_validation_error(
     assert body["error"]["details"][0]["loc"] == ["body", "file"]
     assert body["error"]["details"][0]["msg"] == "Uploaded file must not be empty."
     assert store.calls == []
+
+
+def test_material_batch_enqueues_all_items_in_one_call(
+    app_and_store: tuple[FastAPI, DummyMaterialJobStore],
+) -> None:
+    app, store = app_and_store
+    client = TestClient(app)
+    items = [
+        {
+            "user_id": "user-1",
+            "job_id": "job-a",
+            "material_id": "material-a",
+            "requested_by_id": "requester-1",
+            "generate_types": ["mcq", "essay"],
+        },
+        {
+            "user_id": "user-1",
+            "job_id": "job-b",
+            "material_id": "material-b",
+            "requested_by_id": "requester-1",
+            "callback_url": "https://example.com/hooks/material",
+            "generate_types": ["summary"],
+            "summary_max_words": 150,
+        },
+    ]
+    files = [
+        ("files", ("a.txt", b"first", "text/plain")),
+        ("files", ("b.txt", b"second", "text/plain")),
+    ]
+
+    response = client.post(
+        "/api/material/batch",
+        data={"items": json.dumps(items)},
+        files=files,
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert [job["job_id"] for job in body["data"]["jobs"]] == ["job-a", "job-b"]
+    assert store.calls == []
+    assert len(store.batches) == 1
+    batch = store.batches[0]
+    assert [item.filename for item in batch] == ["a.txt", "b.txt"]
+    assert [store.uploads[item.blob.sha256] for item in batch] == [b"first", b"second"]
+    assert batch[0].request.generate_types == ["mcq", "essay"]
+    assert batch[1].request.summary_max_words == 150
+
+
+def test_material_batch_rejects_item_file_count_mismatch(
+    app_and_store: tuple[FastAPI, DummyMaterialJobStore],
+) -> None:
+    app, store = app_and_store
+    client = TestClient(app)
+    items = [
+        {
+            "user_id": "user-1",
+            "job_id": "job-a",
+            "material_id": "material-a",
+            "requested_by_id": "requester-1",
+            "generate_types": ["mcq"],
+        },
+        {
+            "user_id": "user-1",
+            "job_id": "job-a",
+            "material_id": "material-b",
+            "requested_by_id": "requester-1",
+            "generate_types": ["mcq"],
+        },
+    ]
+
+    response = client.post(
+        "/api/material/batch",
+        data={"items": json.dumps(items)},
+        files=[("files", ("a.txt", b"first", "text/plain"))],
+    )
+
+    assert response.status_code == 422
+    locs = [error["loc"] for error in response.json()["error"]["details"]]
+    assert ["body", "files"] in locs
+    assert ["body", "items", 1, "job_id"] in locs
+    assert store.batches == []
+
+
+def test_material_batch_reports_invalid_item_index(
+    app_and_store: tuple[FastAPI, DummyMaterialJobStore],
+) -> None:
+    app, store = app_and_store
+    client = TestClient(app)
+    items = [{"user_id": "user-1", "job_id": "job-a", "generate_types": ["mcq"]}]
+
+    response = client.post(
+        "/api/material/batch",
+        data={"items": json.dumps(items)},
+        files=[("files", ("a.txt", b"first", "text/plain"))],
+    )
+
+    assert response.status_code == 422
+    locs = [error["loc"] for error in response.json()["error"]["details"]]
+    assert ["body", "items", 0, "material_id"] in locs
+    assert store.batches == []
+
+
+def test_oversized_upload_is_rejected_while_streaming(
+    app_and_store: tuple[FastAPI, DummyMaterialJobStore],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "material_max_file_mb", 1)
+    app, store = app_and_store
+    client = TestClient(app)
+    data = {
+        "user_id": "user-1",
+        "job_id": "job-backend-1",
+        "material_id": "material-1",
+        "requested_by_id": "requester-1",
+    }
+    files = {"file": ("big.txt", b"x" * (1024 * 1024 + 1), "text/plain")}
+
+    response = client.post("/api/mcq", data=data, files=files)
+
+    assert response.status_code == 413
+    assert store.calls == []
+
+
+def test_body_limit_middleware_rejects_declared_oversized_body(
+    app_and_store: tuple[FastAPI, DummyMaterialJobStore],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "material_max_file_mb", 1)
+    app, store = app_and_store
+    app.add_middleware(RequestBodyLimitMiddleware)
+    client = TestClient(app)
+    data = {
+        "user_id": "user-1",
+        "job_id": "job-backend-1",
+        "material_id": "material-1",
+        "requested_by_id": "requester-1",
+    }
+    files = {"file": ("big.txt", b"x" * (3 * 1024 * 1024), "text/plain")}
+
+    response = client.post("/api/mcq", data=data, files=files)
+
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == "payload_too_large"
+    assert store.uploads == {}
+
+
+@pytest.mark.parametrize(
+    ("reason", "expected_status"),
+    [("tenant_backlog", 429), ("backlog_too_long", 503)],
+)
+def test_submission_is_refused_with_retry_after_when_backlog_is_too_large(
+    app_and_store: tuple[FastAPI, DummyMaterialJobStore],
+    reason: str,
+    expected_status: int,
+) -> None:
+    app, store = app_and_store
+    store.rejection = AdmissionRejection(
+        reason=reason,
+        message="The queue is busy.",
+        retry_after_seconds=42,
+    )
+    client = TestClient(app)
+    data = {
+        "user_id": "user-1",
+        "job_id": "job-backend-1",
+        "material_id": "material-1",
+        "requested_by_id": "requester-1",
+    }
+    files = {"file": ("material.txt", b"hello", "text/plain")}
+
+    response = client.post("/api/summary", data=data, files=files)
+
+    assert response.status_code == expected_status
+    assert response.headers["retry-after"] == "42"
+    assert response.json()["error"]["details"]["reason"] == reason
+    assert store.admission_checks == [("material", {"user-1": 1})]
+    assert store.uploads == {}
+    assert store.calls == []
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.agent.queue_metrics import QueueMetricsExporter
+from src.core.metrics import metrics_endpoint, observe_stage, record_validation_failures
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class DummyJobStore:
+    async def queue_stats(self) -> dict[str, object]:
+        return {
+            "group": "job_workers",
+            "streams": {
+                "material_jobs:queue": {"length": 7, "pending": 2},
+                "lkpd_jobs:queue": {"length": 1, "pending": 0},
+            },
+            "scheduled": {
+                "material": {"depth": 40, "active_tenants": 3},
+                "lkpd": {"depth": 0, "active_tenants": 0},
+            },
+        }
+
+    async def oldest_waiting_job_age(self, job_kind: str) -> float:
+        return 95.5 if job_kind == "material" else 0.0
+
+    async def result_cache_stats(self) -> dict[str, int]:
+        return {"hits": 12, "misses": 30, "evictions": 4, "entries": 26}
+
+
+def test_queue_exporter_sets_gauges_from_queue_stats() -> None:
+    asyncio.run(QueueMetricsExporter(DummyJobStore()).refresh())
+
+    assert _sample("rtm_job_queue_length", queue="material_jobs:queue") == 7
+    assert _sample("rtm_job_queue_pending", queue="material_jobs:queue") == 2
+    assert _sample("rtm_jobs_scheduled", job_kind="material") == 40
+    assert _sample("rtm_job_oldest_age_seconds", job_kind="material") == 95.5
+    assert _sample("rtm_job_oldest_age_seconds", job_kind="lkpd") == 0
+    assert _sample("rtm_result_cache_lookups", outcome="hit") == 12
+    assert _sample("rtm_result_cache_lookups", outcome="miss") == 30
+    assert _sample("rtm_result_cache_evictions") == 4
+    assert _sample("rtm_result_cache_entries") == 26
+
+
+def test_stage_timer_records_failed_stages_too() -> None:
+    labels = {"job_kind": "lkpd", "stage": "extraction"}
+    before = _sample("rtm_job_stage_seconds_count", **labels)
+
+    with observe_stage("lkpd", "extraction"):
+        pass
+    with pytest.raises(ValueError):
+        with observe_stage("lkpd", "extraction"):
+            raise ValueError("unreadable file")
+
+    assert _sample("rtm_job_stage_seconds_count", **labels) == before + 2
+
+
+def test_validation_failures_are_counted_by_reason() -> None:
+    labels = {"job_kind": "material", "reason": "mcq_count_lt_requested"}
+    before = _sample("rtm_model_output_validation_failures_total", **labels)
+
+    record_validation_failures(
+        "material",
+        [
+            "model_output_validation_failed:mcq_count_lt_requested:3<10",
+            "MCP is enabled, but no MCP tools are currently available.",
+        ],
+    )
+
+    assert _sample("rtm_model_output_validation_failures_total", **labels) == before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text() -> None:
+    app = FastAPI()
+    app.add_route("/metrics", metrics_endpoint)
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "rtm_job_stage_seconds" in response.text
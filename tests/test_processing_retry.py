@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from src.agent.runtime import MaterialValidationError
+from src.agent.types import MaterialGenerateResponse, QueuedJob
+from src.agent.worker_helpers.job_handlers import (
+    is_transient_error,
+    process_material_job,
+    processing_retry_delay_seconds,
+)
+from src.config import settings
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("provider error", request=request, response=response)
+
+
+def _build_job(processing_attempts: int) -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id="job-1",
+        job_kind="material",
+        user_id="user-1",
+        request_payload={"user_id": "user-1", "generate_types": ["summary"]},
+        filename="deck.pdf",
+        file_sha256="a" * 64,
+        processing_attempts=processing_attempts,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class DummyJobStore:
+    def __init__(self) -> None:
+        self.statuses: list[str] = []
+        self.retries: list[tuple[str, float]] = []
+
+    async def update_job(self, job_id: str, **changes: Any) -> bool:
+        if changes.get("status"):
+            self.statuses.append(changes["status"])
+        return True
+
+    async def schedule_processing_retry(
+        self, job: QueuedJob, *, error: str, delay_seconds: float
+    ) -> bool:
+        self.retries.append((error, delay_seconds))
+        return True
+
+    async def get_cached_result(self, job: QueuedJob, request: Any) -> None:
+        return None
+
+    async def checkpoints(self, job_id: str) -> None:
+        return None
+
+    @asynccontextmanager
+    async def spool_file(self, job: QueuedJob) -> AsyncIterator[Path]:
+        yield Path("deck.pdf")
+
+
+class FailingRuntime:
+    def __init__(self, exc: Exception) -> None:
+        self._exc = exc
+
+    async def invoke_material_upload(self, **kwargs: Any) -> MaterialGenerateResponse:
+        raise self._exc
+
+
+@pytest.fixture(autouse=True)
+def _retry_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "job_retry_max_attempts", 2)
+    monkeypatch.setattr(settings, "job_retry_backoff_seconds", 4.0)
+    monkeypatch.setattr(settings, "job_retry_backoff_max_seconds", 10.0)
+
+
+def _run(exc: Exception, processing_attempts: int, store: DummyJobStore):
+    return asyncio.run(
+        process_material_job(
+            runtime=FailingRuntime(exc),
+            job_store=store,
+            job=_build_job(processing_attempts),
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ("exc", "transient"),
+    [
+        (TimeoutError("read timed out"), True),
+        (httpx.ConnectError("connection refused"), True),
+        (_status_error(429), True),
+        (_status_error(503), True),
+        (_status_error(400), False),
+        (MaterialValidationError("invalid JSON after one retry"), False),
+        (ValueError("Unsupported file type"), False),
+        (ExceptionGroup("mcp session", [httpx.ReadTimeout("timed out")]), True),
+    ],
+)
+def test_error_classification(exc: Exception, transient: bool) -> None:
+    assert is_transient_error(exc) is transient
+
+
+def test_wrapped_transient_error_is_transient() -> None:
+    try:
+        try:
+            raise _status_error(502)
+        except httpx.HTTPStatusError as inner:
+            raise RuntimeError("generation failed") from inner
+    except RuntimeError as exc:
+        assert is_transient_error(exc)
+
+
+
+def test_cyclic_exception_chain_is_not_transient() -> None:
+    outer = RuntimeError("generation failed")
+    inner = ValueError("bad output")
+    outer.__cause__ = inner
+    inner.__context__ = outer
+
+    assert is_transient_error(outer) is False
+
+def test_backoff_grows_exponentially_up_to_the_cap() -> None:
+    assert 2.0 <= processing_retry_delay_seconds(1) <= 4.0
+    assert 4.0 <= processing_retry_delay_seconds(2) <= 8.0
+    assert 5.0 <= processing_retry_delay_seconds(5) <= 10.0
+
+
+def test_transient_failure_is_requeued_without_callback() -> None:
+    store = DummyJobStore()
+
+    payload = _run(_status_error(429), processing_attempts=1, store=store)
+
+    assert payload is None
+    assert store.statuses == ["processing"]
+    assert len(store.retries) == 1
+
+
+def test_exhausted_budget_fails_processing() -> None:
+    store = DummyJobStore()
+
+    payload = _run(_status_error(429), processing_attempts=2, store=store)
+
+    assert payload is not None
+    assert payload.status == "failed_processing"
+    assert store.retries == []
+    assert store.statuses == ["processing", "failed_processing"]
+
+
+def test_permanent_failure_is_not_retried() -> None:
+    store = DummyJobStore()
+
+    payload = _run(MaterialValidationError("invalid"), processing_attempts=0, store=store)
+
+    assert payload is not None
+    assert payload.error is not None
+    assert payload.error.code == "material_validation_error"
+    assert store.retries == []
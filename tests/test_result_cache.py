@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.agent.result_cache import result_cache_key
+from src.agent.types import (
+    MaterialGenerateResponse,
+    MaterialInfo,
+    MaterialUploadRequest,
+    QueuedJob,
+    SummaryContent,
+)
+from src.agent.worker_helpers.job_handlers import process_material_job
+from src.config import settings
+
+
+def _build_result() -> MaterialGenerateResponse:
+    return MaterialGenerateResponse(
+        user_id="user-1",
+        document_id="material-1",
+        material=MaterialInfo(filename="deck.pdf", file_type="pdf", extracted_chars=1200),
+        summary=SummaryContent(
+            title="Ringkasan",
+            overview="Materi tentang fotosintesis.",
+            key_points=["cahaya", "klorofil"],
+        ),
+    )
+
+
+def _build_job(job_id: str) -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id=job_id,
+        job_kind="material",
+        user_id="user-2",
+        material_id=f"material-{job_id}",
+        requested_by_id="requester-2",
+        request_payload={"user_id": "user-2", "generate_types": ["summary"]},
+        filename="copy-of-deck.pdf",
+        file_sha256="a" * 64,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class DummyJobStore:
+    def __init__(self, cached: MaterialGenerateResponse | None) -> None:
+        self.cached = cached
+        self.stored: list[MaterialGenerateResponse] = []
+        self.statuses: list[str] = []
+
+    async def update_job(self, job_id: str, **changes: Any) -> bool:
+        if changes.get("status"):
+            self.statuses.append(changes["status"])
+        return True
+
+    async def get_cached_result(
+        self, job: QueuedJob, request: MaterialUploadRequest
+    ) -> MaterialGenerateResponse | None:
+        return self.cached
+
+    async def cache_result(
+        self, job: QueuedJob, request: MaterialUploadRequest, result: MaterialGenerateResponse
+    ) -> None:
+        self.stored.append(result)
+
+    async def checkpoints(self, job_id: str) -> None:
+        return None
+
+    @asynccontextmanager
+    async def spool_file(self, job: QueuedJob) -> AsyncIterator[Path]:
+        yield Path("deck.pdf")
+
+
+class DummyRuntime:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def invoke_material_upload(self, **kwargs: Any) -> MaterialGenerateResponse:
+        self.calls.append(("generate", kwargs))
+        return _build_result()
+
+    async def invoke_cached_material_upload(self, **kwargs: Any) -> MaterialGenerateResponse:
+        self.calls.append(("cached", kwargs))
+        return kwargs["cached"].model_copy(
+            update={"user_id": "user-2", "document_id": kwargs["document_id"]}
+        )
+
+
+def test_cache_key_ignores_fields_that_do_not_shape_the_result(monkeypatch) -> None:
+    base = MaterialUploadRequest(user_id="user-1", generate_types=["summary", "mcq"])
+    same = MaterialUploadRequest(
+        user_id="user-2",
+        generate_types=["mcq", "summary"],
+        essay_count=7,
+        mcp_enabled=False,
+    )
+    more_questions = MaterialUploadRequest(
+        user_id="user-1", generate_types=["summary", "mcq"], mcq_count=15
+    )
+
+    key = result_cache_key("a" * 64, base)
+
+    assert result_cache_key("a" * 64, same) == key
+    assert result_cache_key("a" * 64, more_questions) != key
+    assert result_cache_key("b" * 64, base) != key
+    budget = settings.extraction_char_budget
+    monkeypatch.setattr(settings, "extraction_char_budget", 1000)
+    assert result_cache_key("a" * 64, base) != key
+    monkeypatch.setattr(settings, "extraction_char_budget", budget)
+    monkeypatch.setattr(settings, "groq_model", "another-model")
+    assert result_cache_key("a" * 64, base) != key
+
+
+def test_cache_hit_skips_generation_and_uses_the_new_job_ids() -> None:
+    runtime = DummyRuntime()
+    store = DummyJobStore(cached=_build_result())
+
+    payload = asyncio.run(
+        process_material_job(runtime=runtime, job_store=store, job=_build_job("job-2"))
+    )
+
+    assert [name for name, _ in runtime.calls] == ["cached"]
+    kwargs = runtime.calls[0][1]
+    assert kwargs["job_id"] == "job-2"
+    assert kwargs["document_id"] == "material-job-2"
+    assert kwargs["filename"] == "copy-of-deck.pdf"
+    assert payload.status == "succeeded"
+    assert payload.result is not None and payload.result.document_id == "material-job-2"
+    assert store.stored == []
+
+
+def test_cache_miss_generates_and_stores_the_result() -> None:
+    runtime = DummyRuntime()
+    store = DummyJobStore(cached=None)
+
+    payload = asyncio.run(
+        process_material_job(runtime=runtime, job_store=store, job=_build_job("job-1"))
+    )
+
+    assert [name for name, _ in runtime.calls] == ["generate"]
+    assert payload.status == "succeeded"
+    assert len(store.stored) == 1
+    assert store.statuses == ["processing", "succeeded"]
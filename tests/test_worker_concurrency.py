@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import UTC, datetime
+
+from src.agent.types import QueuedJob
+from src.agent.worker import MaterialJobWorker
+from src.config import settings
+
+
+class DummyJobStore:
+    def __init__(self, job_ids: list[str]) -> None:
+        self.pending = list(job_ids)
+        self.acked: list[str] = []
+        self.requeued: list[str] = []
+        self.abandoned: list[str] = []
+
+    async def pop_next_job(self, *, timeout_seconds: int = 1) -> QueuedJob | None:
+        if not self.pending:
+            await asyncio.sleep(0.01)
+            return None
+        return _build_job(self.pending.pop(0))
+
+    async def ack_job(self, job_id: str) -> None:
+        self.acked.append(job_id)
+
+    async def requeue_job(self, job_id: str) -> None:
+        self.requeued.append(job_id)
+
+    def abandon_job(self, job_id: str) -> None:
+        self.abandoned.append(job_id)
+
+    async def renew_leases(self) -> None:
+        return None
+
+    def cleanup_expired_blobs(self) -> int:
+        return 0
+
+    async def claim_due_callback_retries(self, *, limit: int) -> list[str]:
+        return []
+
+
+class DummyLkpdStorage:
+    def cleanup_expired_files(self) -> int:
+        return 0
+
+
+def _build_job(job_id: str) -> QueuedJob:
+    now = datetime.now(UTC)
+    return QueuedJob(
+        job_id=job_id,
+        job_kind="material",
+        user_id="user-1",
+        filename="material.txt",
+        file_b64="aGVsbG8=",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _build_worker(job_store: DummyJobStore) -> MaterialJobWorker:
+    return MaterialJobWorker(
+        runtime=object(),
+        job_store=job_store,
+        callback_client=object(),
+        lkpd_storage=DummyLkpdStorage(),
+    )
+
+
+def test_worker_keeps_bounded_number_of_jobs_in_flight(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "worker_concurrency", 3)
+    worker = _build_worker(DummyJobStore([f"job-{i}" for i in range(7)]))
+    active = 0
+    peak = 0
+    finished: list[str] = []
+
+    async def fake_process(job: QueuedJob) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        finished.append(job.job_id)
+
+    monkeypatch.setattr(worker, "_process_job", fake_process)
+
+    async def scenario() -> None:
+        worker.start()
+        while len(finished) < 7:
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    assert peak == 3
+    assert sorted(finished) == sorted(f"job-{i}" for i in range(7))
+
+
+def test_failing_job_does_not_affect_other_jobs(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "worker_concurrency", 2)
+    job_store = DummyJobStore(["job-bad", "job-good"])
+    worker = _build_worker(job_store)
+    finished: list[str] = []
+
+    async def fake_process(job: QueuedJob) -> None:
+        if job.job_id == "job-bad":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+        finished.append(job.job_id)
+
+    monkeypatch.setattr(worker, "_process_job", fake_process)
+
+    async def scenario() -> None:
+        worker.start()
+        while not finished:
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    assert finished == ["job-good"]
+    assert worker.in_flight_count == 0
+    assert job_store.acked == ["job-good"]
+    assert job_store.abandoned == ["job-bad"]
+
+
+def test_stop_drains_in_flight_jobs(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "worker_concurrency", 2)
+    monkeypatch.setattr(settings, "worker_drain_timeout_seconds", 5)
+    worker = _build_worker(DummyJobStore(["job-1", "job-2"]))
+    started: list[str] = []
+    finished: list[str] = []
+
+    async def fake_process(job: QueuedJob) -> None:
+        started.append(job.job_id)
+        await asyncio.sleep(0.1)
+        finished.append(job.job_id)
+
+    monkeypatch.setattr(worker, "_process_job", fake_process)
+
+    async def scenario() -> None:
+        worker.start()
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    assert sorted(finished) == ["job-1", "job-2"]
+
+
+def test_stop_cancels_jobs_after_drain_timeout(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "worker_concurrency", 1)
+    monkeypatch.setattr(settings, "worker_drain_timeout_seconds", 0)
+    job_store = DummyJobStore(["job-slow"])
+    worker = _build_worker(job_store)
+    started: list[str] = []
+    finished: list[str] = []
+
+    async def fake_process(job: QueuedJob) -> None:
+        started.append(job.job_id)
+        await asyncio.sleep(10)
+        finished.append(job.job_id)
+
+    monkeypatch.setattr(worker, "_process_job", fake_process)
+
+    async def scenario() -> None:
+        worker.start()
+        while not started:
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    assert finished == []
+    assert worker.in_flight_count == 0
+    assert job_store.requeued == ["job-slow"]
+    assert job_store.acked == []
+
+
+def test_periodic_cleanup_runs_off_the_event_loop_thread() -> None:
+    cleanup_threads: list[int] = []
+
+    class RecordingJobStore(DummyJobStore):
+        def cleanup_expired_blobs(self) -> int:
+            cleanup_threads.append(threading.get_ident())
+            return 0
+
+    class RecordingLkpdStorage(DummyLkpdStorage):
+        def cleanup_expired_files(self) -> int:
+            cleanup_threads.append(threading.get_ident())
+            return 0
+
+    worker = MaterialJobWorker(
+        runtime=object(),
+        job_store=RecordingJobStore([]),
+        callback_client=object(),
+        lkpd_storage=RecordingLkpdStorage(),
+    )
+    worker._last_cleanup_at = datetime(2000, 1, 1, tzinfo=UTC)
+
+    asyncio.run(worker._run_periodic_cleanup())
+
+    assert len(cleanup_threads) == 2
+    assert threading.get_ident() not in cleanup_threads